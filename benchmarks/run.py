@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Time Graph operations on generated graphs and report the results as JSON.
+
+    python3 -m benchmarks.run --sizes 1000 100000 --output results.json
+    python3 -m benchmarks.run --compare results.json
+
+Each record gives the generator, the graph size, the operation, the
+number of operations timed, the operations per second and the peak
+memory allocated during the operation.  With --compare, the run is
+checked against an earlier output file, and the exit status is 1 if any
+operation got slower by more than the tolerance.
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from graphs.graph import Graph
+from graphs.generators import erdos_renyi_edges, barabasi_albert_edges, grid_edges
+
+
+def _shapes(num_edges, seed):
+    """Return a dict of generator name -> (sources, targets) with about
+    num_edges edges each.
+
+    """
+    side = max(2, int((num_edges / 2) ** 0.5))
+    return {
+        'erdos_renyi': erdos_renyi_edges(max(2, num_edges // 8), num_edges, seed),
+        'barabasi_albert': barabasi_albert_edges(max(5, num_edges // 4), 4, seed),
+        'grid': grid_edges(side, side),
+    }
+
+
+def _operations(sources, targets, samples):
+    """Return a list of (name, number of operations, setup, run), where
+    setup() returns the argument for run(argument), which does the
+    operations.
+
+    """
+    graph = Graph.from_arrays(sources, targets)
+    vertices = list(graph.iter_vertices())
+    step = max(1, len(vertices) // samples)
+    starts = vertices[::step][:samples]
+    edges = list(zip(range(len(sources)), sources, targets))
+
+    def add_edges(graph):
+        for key, source, target in edges:
+            graph.add_edge(key, source, target)
+
+    def remove_vertices(graph):
+        for v in starts:
+            graph.remove_vertex(v)
+
+    def bfs_directed(graph):
+        for v in starts:
+            for w in graph.bfs_directed(v):
+                pass
+
+    def dfs_undirected(graph):
+        for v in starts[:max(1, len(starts) // 10)]:
+            for w in graph.dfs_undirected(v):
+                pass
+
+    def copy(graph):
+        graph.copy().add_vertex("new")
+
+    def to_tuple_set_tuple(graph):
+        graph.to_tuple_set_tuple()
+
+    rebuild = lambda: Graph.from_arrays(sources, targets)
+    same = lambda: graph
+    return [
+        ('add_edge', len(edges), Graph, add_edges),
+        ('remove_vertex', len(starts), rebuild, remove_vertices),
+        ('bfs_directed', len(starts), same, bfs_directed),
+        ('dfs_undirected', max(1, len(starts) // 10), same, dfs_undirected),
+        ('copy', 1, same, copy),
+        ('to_tuple_set_tuple', 1, same, to_tuple_set_tuple),
+    ]
+
+
+def _measure(setup, run, repeat):
+    """Return (best seconds, peak bytes) for run(setup()).  Time is taken
+    without memory tracing, which slows allocation down, and the peak
+    with it.
+
+    """
+    best = None
+    for i in range(repeat):
+        argument = setup()
+        start = time.perf_counter()
+        run(argument)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    argument = setup()
+    tracemalloc.start()
+    try:
+        run(argument)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_benchmarks(sizes, generators=None, samples=100, repeat=3, seed=0):
+    """Return the list of benchmark records for graphs of about each of
+    the numbers of edges in sizes, from the named generators (default:
+    all).
+
+    """
+    records = []
+    for num_edges in sizes:
+        for name, (sources, targets) in _shapes(num_edges, seed).items():
+            if generators is not None and name not in generators:
+                continue
+            for operation, count, setup, run in _operations(sources, targets, samples):
+                seconds, peak = _measure(setup, run, repeat)
+                records.append({
+                    'generator': name,
+                    'edges': len(sources),
+                    'operation': operation,
+                    'operations': count,
+                    'seconds': seconds,
+                    'ops_per_sec': count / seconds if seconds else float('inf'),
+                    'peak_bytes': peak,
+                })
+    return records
+
+
+def compare(records, baseline, tolerance):
+    """Return the list of (record, baseline record) pairs for operations
+    whose operations per second dropped by more than the tolerance
+    fraction from the baseline.
+
+    """
+    key = lambda r: (r['generator'], r['edges'], r['operation'])
+    old = {key(r): r for r in baseline}
+    return [(r, old[key(r)]) for r in records
+            if key(r) in old and r['ops_per_sec'] < old[key(r)]['ops_per_sec'] * (1 - tolerance)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Graph operations")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="approximate numbers of edges (default: 1000 10000 100000)")
+    parser.add_argument('--generators', nargs='+', choices=['erdos_renyi', 'barabasi_albert', 'grid'])
+    parser.add_argument('--samples', type=int, default=100, help="start vertices per traversal benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark; the best counts")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="file for the JSON results (default: standard output)")
+    parser.add_argument('--compare', help="JSON results of an earlier run to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="fractional slowdown reported as a regression (default: 0.2)")
+    args = parser.parse_args(argv)
+    records = run_benchmarks(args.sizes, args.generators, args.samples, args.repeat, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(records, f, indent=2)
+    else:
+        json.dump(records, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(records, json.load(f), args.tolerance)
+        for new, old in regressions:
+            print("%s on %s with %d edges: %.1f ops/sec, was %.1f" % (
+                new['operation'], new['generator'], new['edges'], new['ops_per_sec'], old['ops_per_sec']),
+                file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,2 +1,22 @@
 from . import tree
 from . import graph
+from . import csr
+from . import traversal
+from . import paths
+from . import dag
+from . import view
+from . import centrality
+from . import parallel
+from . import compact
+from . import index
+from . import generators
+from . import edgelist
+from . import spanning
+from . import flow
+from . import reachability
+from . import khop
+from . import clustering
+from . import partitioned
+from . import sqlite
+from . import isomorphism
+from . import undirected
@@ -0,0 +1,156 @@
+from itertools import accumulate
+from math import sqrt
+from operator import mul, sub
+
+from graphs.csr import CSRGraph
+
+# Ranking by power iteration over the compressed-sparse-row arrays of a
+# CSRGraph.  Each iteration gathers values along all edges and sums them
+# per vertex with prefix sums, so the per-edge work runs in C inside map
+# and accumulate rather than in a Python loop.
+
+
+def _frozen(graph):
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_graph(graph)
+
+
+def _segment_sums(values, offsets):
+    """Return the list of sums of values[offsets[i]:offsets[i+1]]"""
+    prefix = list(accumulate(values, initial=0.0))
+    return list(map(sub, map(prefix.__getitem__, offsets[1:]), map(prefix.__getitem__, offsets[:-1])))
+
+
+def _pull(x, offsets, neighbors):
+    """Return, for each vertex, the sum of x over its neighbors in the CSR
+    arrays (offsets, neighbors).
+
+    """
+    return _segment_sums(list(map(x.__getitem__, neighbors)), offsets)
+
+
+def _vector(frozen, scores, default):
+    """Return the list of the scores of the vertices, in id order, from a
+    dict of scores by vertex key, normalized to sum to one.
+
+    """
+    x = [scores.get(key, default) for key in frozen.iter_vertices()]
+    total = sum(x)
+    if total <= 0:
+        raise ValueError("Scores must have a positive sum")
+    return [value / total for value in x]
+
+
+def _scores(frozen, x):
+    return dict(zip(frozen.iter_vertices(), x))
+
+
+def pagerank(graph, damping=0.85, personalization=None, tol=1e-6, max_iter=100, start=None):
+    """Return a dict of the PageRank of each vertex key.  Parallel edges
+    count as separate links.  If personalization, a dict of weights by
+    vertex key, is specified, random jumps (and moves from vertices
+    with no outgoing edges) go to vertices in proportion to their
+    weights, giving personalized PageRank.  start is a dict of initial
+    scores by vertex key, such as the result of an earlier run, to
+    warm-start the iteration.  An exception is raised if the scores
+    do not converge to within tol per vertex in max_iter iterations.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    if n == 0:
+        return dict()
+    if personalization is None:
+        jump = [1.0 / n] * n
+    else:
+        jump = _vector(frozen, personalization, 0.0)
+    x = [1.0 / n] * n if start is None else _vector(frozen, start, 1.0 / n)
+    offsets = frozen._out_offsets
+    outdegrees = list(map(sub, offsets[1:], offsets[:-1]))
+    inverse = [1.0 / d if d else 0.0 for d in outdegrees]
+    dangling = [v for v in range(n) if not outdegrees[v]]
+    for i in range(max_iter):
+        incoming = _pull(list(map(mul, x, inverse)), frozen._in_offsets, frozen._in_sources)
+        teleport = damping * sum(map(x.__getitem__, dangling)) + 1.0 - damping
+        new = [damping * a + teleport * b for a, b in zip(incoming, jump)]
+        error = sum(map(abs, map(sub, new, x)))
+        x = new
+        if error < n * tol:
+            return _scores(frozen, x)
+    raise Exception("PageRank did not converge in %d iterations" % max_iter)
+
+
+def degree_centrality(graph, direction='both'):
+    """Return a dict of the degree centrality of each vertex key: the
+    number of edges leaving ('out'), entering ('in') or touching
+    ('both') the vertex, divided by one less than the number of
+    vertices.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    scale = 1.0 / (n - 1) if n > 1 else 1.0
+    if direction == 'out':
+        degree = frozen.outdegree
+    elif direction == 'in':
+        degree = frozen.indegree
+    elif direction == 'both':
+        degree = lambda key: frozen.outdegree(key) + frozen.indegree(key)
+    else:
+        raise ValueError("direction must be 'out', 'in' or 'both'")
+    return {key: degree(key) * scale for key in frozen.iter_vertices()}
+
+
+def eigenvector_centrality(graph, tol=1e-6, max_iter=100, start=None):
+    """Return a dict of the eigenvector centrality of each vertex key,
+    where a vertex is central if vertices with edges into it are, with
+    Euclidean norm one.  start is a dict of initial scores by vertex
+    key to warm-start the iteration.  An exception is raised if the
+    scores do not converge to within tol per vertex in max_iter
+    iterations.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    if n == 0:
+        return dict()
+    x = [1.0 / n] * n if start is None else _vector(frozen, start, 1.0 / n)
+    for i in range(max_iter):
+        # iterating with A + I has the same eigenvectors, and converges on
+        # graphs, such as bipartite ones, where A alone oscillates
+        new = list(map(sum, zip(x, _pull(x, frozen._in_offsets, frozen._in_sources))))
+        norm = sqrt(sum(map(mul, new, new))) or 1.0
+        new = [value / norm for value in new]
+        error = sum(map(abs, map(sub, new, x)))
+        x = new
+        if error < n * tol:
+            return _scores(frozen, x)
+    raise Exception("Eigenvector centrality did not converge in %d iterations" % max_iter)
+
+
+def hits(graph, tol=1e-8, max_iter=100, start=None):
+    """Return (hubs, authorities), dicts of the HITS hub and authority
+    scores of each vertex key, each summing to one.  start is a dict of
+    initial hub scores by vertex key to warm-start the iteration.  An
+    exception is raised if the scores do not converge to within tol
+    per vertex in max_iter iterations.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    if n == 0:
+        return dict(), dict()
+    hubs = [1.0 / n] * n if start is None else _vector(frozen, start, 1.0 / n)
+    for i in range(max_iter):
+        authorities = _pull(hubs, frozen._in_offsets, frozen._in_sources)
+        total = sum(authorities) or 1.0
+        authorities = [value / total for value in authorities]
+        new = _pull(authorities, frozen._out_offsets, frozen._out_targets)
+        total = sum(new) or 1.0
+        new = [value / total for value in new]
+        error = sum(map(abs, map(sub, new, hubs)))
+        hubs = new
+        if error < n * tol:
+            return _scores(frozen, hubs), _scores(frozen, authorities)
+    raise Exception("HITS did not converge in %d iterations" % max_iter)
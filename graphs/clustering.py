@@ -0,0 +1,154 @@
+# Triangles, clustering coefficients and cores of the undirected simple
+# graph underlying a graph: direction, parallel edges and self-loops are
+# ignored.  Triangles are counted once each by orienting every edge
+# from the lower to the higher of its ends in (degree, id) order and
+# intersecting the higher-ordered neighbor sets of each edge's ends.
+# Every vertex then has few higher-ordered neighbors, so the work is
+# mostly in C set intersections rather than Python loops.
+
+
+def _adjacency(graph):
+    """Return (vertex keys, neighbor id sets) for the undirected simple
+    graph underlying the graph.
+
+    """
+    keys = list(graph.iter_vertices())
+    ids = {key: i for i, key in enumerate(keys)}
+    neighbors = []
+    for i, key in enumerate(keys):
+        adjacent = set(map(ids.__getitem__, graph.iter_neighbors(key)))
+        adjacent.discard(i)
+        neighbors.append(adjacent)
+    return keys, neighbors
+
+
+def _higher(neighbors):
+    """Return the list of sets of each vertex's neighbors that come after
+    it in (degree, id) order.
+
+    """
+    order = sorted(range(len(neighbors)), key=lambda i: len(neighbors[i]))
+    rank = [0] * len(neighbors)
+    for r, i in enumerate(order):
+        rank[i] = r
+    return [{w for w in adjacent if rank[w] > rank[v]} for v, adjacent in enumerate(neighbors)]
+
+
+def _triangle_counts(neighbors):
+    counts = [0] * len(neighbors)
+    higher = _higher(neighbors)
+    for u, above in enumerate(higher):
+        for v in above:
+            common = above & higher[v]
+            if common:
+                counts[u] += len(common)
+                counts[v] += len(common)
+                for w in common:
+                    counts[w] += 1
+    return counts
+
+
+def num_triangles(graph):
+    """Return the number of triangles in the graph"""
+    keys, neighbors = _adjacency(graph)
+    higher = _higher(neighbors)
+    return sum(len(above & higher[v]) for above in higher for v in above)
+
+
+def triangles(graph):
+    """Return a dict of vertex key -> the number of triangles the vertex
+    is in.
+
+    """
+    keys, neighbors = _adjacency(graph)
+    return dict(zip(keys, _triangle_counts(neighbors)))
+
+
+def clustering(graph):
+    """Return a dict of vertex key -> local clustering coefficient: the
+    fraction of the pairs of the vertex's neighbors that are adjacent,
+    or 0.0 for vertices with fewer than two neighbors.
+
+    """
+    keys, neighbors = _adjacency(graph)
+    counts = _triangle_counts(neighbors)
+    result = dict()
+    for key, adjacent, count in zip(keys, neighbors, counts):
+        d = len(adjacent)
+        result[key] = 2.0 * count / (d * (d - 1)) if d > 1 else 0.0
+    return result
+
+
+def average_clustering(graph):
+    """Return the mean of the local clustering coefficients of the
+    vertices, or 0.0 for a graph with no vertices.
+
+    """
+    coefficients = clustering(graph)
+    return sum(coefficients.values()) / len(coefficients) if coefficients else 0.0
+
+
+def transitivity(graph):
+    """Return the global clustering coefficient: three times the number of
+    triangles over the number of paths of two edges, or 0.0 if there
+    are no such paths.
+
+    """
+    keys, neighbors = _adjacency(graph)
+    higher = _higher(neighbors)
+    closed = sum(len(above & higher[v]) for above in higher for v in above)
+    paths = sum(len(adjacent) * (len(adjacent) - 1) // 2 for adjacent in neighbors)
+    return 3.0 * closed / paths if paths else 0.0
+
+
+def core_number(graph):
+    """Return a dict of vertex key -> core number: the largest k such that
+    the vertex is in a subgraph in which every vertex has at least k
+    neighbors.  Uses the bucket algorithm of Batagelj and Zaversnik,
+    which takes time linear in the size of the graph.
+
+    """
+    keys, neighbors = _adjacency(graph)
+    n = len(keys)
+    degree = [len(adjacent) for adjacent in neighbors]
+    max_degree = max(degree, default=0)
+    # vertices sorted by degree, with the position of each and the start
+    # of each degree's bucket
+    bins = [0] * (max_degree + 1)
+    for d in degree:
+        bins[d] += 1
+    start = 0
+    for d in range(max_degree + 1):
+        bins[d], start = start, start + bins[d]
+    order = [0] * n
+    position = [0] * n
+    for v in range(n):
+        position[v] = bins[degree[v]]
+        order[position[v]] = v
+        bins[degree[v]] += 1
+    for d in range(max_degree, 0, -1):
+        bins[d] = bins[d - 1]
+    bins[0] = 0
+    for i in range(n):
+        v = order[i]
+        for w in neighbors[v]:
+            if degree[w] > degree[v]:
+                # move w to the front of its bucket, then shrink the bucket
+                dw = degree[w]
+                pw = position[w]
+                ps = bins[dw]
+                s = order[ps]
+                if s != w:
+                    order[pw], order[ps] = s, w
+                    position[s], position[w] = pw, ps
+                bins[dw] += 1
+                degree[w] = dw - 1
+    return dict(zip(keys, degree))
+
+
+def k_core(graph, k):
+    """Return the set of the vertex keys of the k-core of the graph: the
+    largest subgraph in which every vertex has at least k neighbors.
+
+    """
+    return {key for key, core in core_number(graph).items() if core >= k}
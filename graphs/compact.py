@@ -0,0 +1,412 @@
+import gc
+from array import array
+
+from graphs import traversal
+from graphs.view import GraphView
+
+
+class CompactGraph:
+    """
+    CompactGraph() -> new directed graph with no vertices or edges
+
+    A Graph with the same API, storing the graph in far less memory.
+    Vertex and edge keys are interned to integer ids, the edge endpoints
+    are kept in parallel array('q') columns, and each vertex has an
+    array of the ids of its outgoing edges and one of its incoming
+    edges.  Neighbor and connection queries scan those arrays, so they
+    take time proportional to the degree rather than constant time.
+    """
+    __slots__ = ('_vertex_ids', '_vertex_keys', '_vertex_values', '_free_vertices',
+                 '_edge_ids', '_edge_keys', '_edge_values', '_free_edges',
+                 '_sources', '_targets', '_out', '_in')
+
+    def __init__(self):
+        self._vertex_ids = dict() #vertex_key -> vertex id
+        self._vertex_keys = [] #vertex id -> vertex_key
+        self._vertex_values = [] #vertex id -> vertex_data
+        self._free_vertices = [] #ids of removed vertices, for reuse
+        self._edge_ids = dict() #edge_key -> edge id
+        self._edge_keys = [] #edge id -> edge_key
+        self._edge_values = [] #edge id -> edge_data
+        self._free_edges = [] #ids of removed edges, for reuse
+        self._sources = array('q') #edge id -> source vertex id, -1 if removed
+        self._targets = array('q') #edge id -> target vertex id, -1 if removed
+        self._out = [] #vertex id -> array of outgoing edge ids
+        self._in = [] #vertex id -> array of incoming edge ids
+
+    def _vertex_id(self, key):
+        # the id of the vertex, adding it if necessary
+        v = self._vertex_ids.get(key)
+        if v is None:
+            if self._free_vertices:
+                v = self._free_vertices.pop()
+                self._vertex_keys[v] = key
+                self._vertex_values[v] = None
+            else:
+                v = len(self._vertex_keys)
+                self._vertex_keys.append(key)
+                self._vertex_values.append(None)
+                self._out.append(array('q'))
+                self._in.append(array('q'))
+            self._vertex_ids[key] = v
+        return v
+
+    def add_vertex(self, key, value=None):
+        """Add a new vertex, with an optional value, to the graph.  The key
+        must be of a hashable type.  If a vertex of the same key is
+        already in the graph and a value is specified, the new value
+        will replace the old value.
+        """
+        v = self._vertex_id(key)
+        if value is not None:
+            self._vertex_values[v] = value
+
+    def add_edge(self, key, source_key, target_key, value=None):
+        """Add a new edge, with an optional value, to the graph, connecting
+        the specified source vertex key to the specified target vertex
+        key.  The keys must be of hashable types.  If the vertices are
+        not already in the graph, they will be added with no value.
+        If the edge key is already in the graph with the same source
+        and target vertex keys and the value is specified, the new
+        value will overwrite the old value.  If the edge key is in the
+        graph with different source and vetex keys, an exception will
+        be raised.
+        """
+        e = self._edge_ids.get(key)
+        if e is not None:
+            if (self._vertex_keys[self._sources[e]] != source_key
+                or self._vertex_keys[self._targets[e]] != target_key):
+                raise Exception("Edge %s exists with different endpoints" % key)
+            if value is not None:
+                self._edge_values[e] = value
+            return
+        s = self._vertex_id(source_key)
+        t = self._vertex_id(target_key)
+        if self._free_edges:
+            e = self._free_edges.pop()
+            self._edge_keys[e] = key
+            self._edge_values[e] = value
+            self._sources[e] = s
+            self._targets[e] = t
+        else:
+            e = len(self._edge_keys)
+            self._edge_keys.append(key)
+            self._edge_values.append(value)
+            self._sources.append(s)
+            self._targets.append(t)
+        self._edge_ids[key] = e
+        self._out[s].append(e)
+        self._in[t].append(e)
+
+    def add_edges_from(self, edges):
+        """Add edges from an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key) or (edge_key, source_vertex_key,
+        target_vertex_key, edge_value), as add_edge would.
+
+        """
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for edge in edges:
+                self.add_edge(*edge)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def remove_edge(self, key):
+        """Remove the edge having the specified key, and return the value, if
+        any.
+
+        """
+        e = self._edge_ids.pop(key, None)
+        if e is None:
+            return None
+        value = self._edge_values[e]
+        self._out[self._sources[e]].remove(e)
+        self._in[self._targets[e]].remove(e)
+        self._edge_keys[e] = None
+        self._edge_values[e] = None
+        self._sources[e] = -1
+        self._targets[e] = -1
+        self._free_edges.append(e)
+        return value
+
+    def remove_vertex(self, key):
+        """Remove the vertex with the specified key and return the value, if
+        any.  Any edges incident with the vertex will be deleted.
+
+        """
+        v = self._vertex_ids.get(key)
+        if v is None:
+            return None
+        for e in set(self._out[v]) | set(self._in[v]):
+            self.remove_edge(self._edge_keys[e])
+        del self._vertex_ids[key]
+        value = self._vertex_values[v]
+        self._vertex_keys[v] = None
+        self._vertex_values[v] = None
+        self._free_vertices.append(v)
+        return value
+
+    def get_vertex(self, key):
+        """Get the value of the vertex having the specified key"""
+        return self._vertex_values[self._vertex_ids[key]]
+
+    def is_vertex(self, key):
+        """Return True if the key is of a vertex in the graph"""
+        return key in self._vertex_ids
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph"""
+        return len(self._vertex_ids)
+
+    def iter_vertices(self):
+        """Generate the vertex keys"""
+        return iter(self._vertex_ids)
+
+    def get_edge(self, key):
+        """Get the value of the edge having the specified key"""
+        return self._edge_values[self._edge_ids[key]]
+
+    def is_edge(self, key):
+        """Return True if the key is of an edge in the graph"""
+        return key in self._edge_ids
+
+    def num_edges(self):
+        """Return the number of edges in the graph"""
+        return len(self._edge_ids)
+
+    def iter_edges(self):
+        """Generate the edge keys"""
+        return iter(self._edge_ids)
+
+    def get_source(self, edge_key):
+        """Return the source vertex of the edge key"""
+        return self._vertex_keys[self._sources[self._edge_ids[edge_key]]]
+
+    def get_target(self, edge_key):
+        """Return the target vertex of the edge key"""
+        return self._vertex_keys[self._targets[self._edge_ids[edge_key]]]
+
+    def iter_outgoing_edges(self, vertex_key):
+        """Generate the edge keys coming out of the specified vertex key"""
+        return map(self._edge_keys.__getitem__, self._out[self._vertex_ids[vertex_key]])
+
+    def iter_target_vertices(self, vertex_key):
+        """Generate the target vertex keys of edges coming out of the
+specified vertex key
+
+        """
+        return map(self._vertex_keys.__getitem__, self._target_ids(self._vertex_ids[vertex_key]))
+
+    def _target_ids(self, v):
+        return map(self._targets.__getitem__, self._out[v])
+
+    def outdegree(self, vertex_key):
+        """Return the number of outgoing edges from the specified vertex key"""
+        return len(self._out[self._vertex_ids[vertex_key]])
+
+    def iter_incoming_edges(self, vertex_key):
+        """Generate the edge keys entering the specified vertex key"""
+        return map(self._edge_keys.__getitem__, self._in[self._vertex_ids[vertex_key]])
+
+    def iter_source_vertices(self, vertex_key):
+        """Generate the source vertex keys of edges entering the specified
+vertex key
+
+        """
+        return map(self._vertex_keys.__getitem__,
+                   map(self._sources.__getitem__, self._in[self._vertex_ids[vertex_key]]))
+
+    def indegree(self, vertex_key):
+        """Return the number of incoming edges to the specified vertex key"""
+        return len(self._in[self._vertex_ids[vertex_key]])
+
+    def _neighbor_ids(self, v):
+        neighbors = set(self._target_ids(v))
+        neighbors.update(map(self._sources.__getitem__, self._in[v]))
+        return neighbors
+
+    def iter_neighbors(self, vertex_key):
+        """Generate the vertex keys adjacent to the specified vertex key"""
+        return map(self._vertex_keys.__getitem__, self._neighbor_ids(self._vertex_ids[vertex_key]))
+
+    def degree(self, vertex_key):
+        """Return the number of vertices adjacent to the specified vertex key"""
+        return len(self._neighbor_ids(self._vertex_ids[vertex_key]))
+
+    def _connection_ids(self, source_key, target_key):
+        s = self._vertex_ids[source_key]
+        t = self._vertex_ids[target_key]
+        targets = self._targets
+        return [e for e in self._out[s] if targets[e] == t]
+
+    def iter_connections(self, source_key, target_key):
+        """Generate the edge keys from the source vertex key to the target
+        vertex key
+
+        """
+        return map(self._edge_keys.__getitem__, self._connection_ids(source_key, target_key))
+
+    def num_connections(self, source_key, target_key):
+        """Return the number of edges from the source vertex key to the target
+        vertex key
+
+        """
+        return len(self._connection_ids(source_key, target_key))
+
+    def is_adjacent(self, source_key, target_key):
+        """Return true if the specified source vertex key is adjacent to the
+        specified target vertex key.
+
+        """
+        s = self._vertex_ids[source_key]
+        t = self._vertex_ids[target_key]
+        return t in self._target_ids(s)
+
+    def iter_vertex_values(self):
+        """Generate the values of the vertices of the graph"""
+        return map(self._vertex_values.__getitem__, self._vertex_ids.values())
+
+    def iter_edge_values(self):
+        """Generate the values of the edges of the graph"""
+        return map(self._edge_values.__getitem__, self._edge_ids.values())
+
+    def iter_vertex_value_tuple(self):
+        """Generate all vertex key-value pairs from the graph"""
+        for key, v in self._vertex_ids.items():
+            yield (key, self._vertex_values[v])
+
+    def iter_edge_source_target_value_tuple(self):
+        """Generate all edge key-source-target-value quadruples from the graph"""
+        vertex_keys = self._vertex_keys
+        for key, e in self._edge_ids.items():
+            yield (key, vertex_keys[self._sources[e]], vertex_keys[self._targets[e]],
+                   self._edge_values[e])
+
+    def clear(self):
+        """Remove all vertices, edges, and values from the graph"""
+        self.__init__()
+
+    def copy(self):
+        """Return a copy of the graph, with the same values, not copies"""
+        result = CompactGraph()
+        result._vertex_ids = self._vertex_ids.copy()
+        result._vertex_keys = self._vertex_keys.copy()
+        result._vertex_values = self._vertex_values.copy()
+        result._free_vertices = self._free_vertices.copy()
+        result._edge_ids = self._edge_ids.copy()
+        result._edge_keys = self._edge_keys.copy()
+        result._edge_values = self._edge_values.copy()
+        result._free_edges = self._free_edges.copy()
+        result._sources = array('q', self._sources)
+        result._targets = array('q', self._targets)
+        result._out = [array('q', a) for a in self._out]
+        result._in = [array('q', a) for a in self._in]
+        return result
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot of the graph"""
+        from graphs.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def subgraph(self, vertex_keys):
+        """Return a read-only view of the part of the graph induced by the
+        vertex keys, without copying it.
+
+        """
+        return GraphView(self, vertex_keys)
+
+    def filtered(self, vertex_pred=None, edge_pred=None):
+        """Return a read-only view of the vertices and edges of the graph
+        satisfying the predicates, which are called with a vertex key or
+        an edge key, without copying it.
+
+        """
+        return GraphView(self, None, vertex_pred, edge_pred)
+
+    def __str__(self):
+        return "<CompactGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def __repr__(self):
+        return "<CompactGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def from_tuple_set_tuple(self, tst):
+        """Given graph data in the form (vertices, edges), where vertices is
+        an iterable of tuples (vertex_key, vertex_value) and edges is
+        an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value), load the data into the current
+        graph.
+
+        """
+        vertices, edges = tst
+        for vertex_key, vertex_value in vertices:
+            self.add_vertex(vertex_key, vertex_value)
+        self.add_edges_from(edges)
+
+    def to_tuple_set_tuple(self):
+        """Return data of the graph, in the form (vertices, edges), where
+        vertices is a set of tuples (vertex_key, vertex_value) and
+        edges is a set of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value).
+
+        """
+        return (set(self.iter_vertex_value_tuple()), set(self.iter_edge_source_target_value_tuple()))
+
+    # traversals run over the vertex ids
+
+    def _num_incident_edges(self, v):
+        # the edges an undirected traversal scans at the vertex id
+        loops = sum(1 for e in self._out[v] if self._targets[e] == v)
+        return len(self._out[v]) + len(self._in[v]) - loops
+
+    def _search(self, search, successors, start_vertices, max_depth, stats, algorithm,
+                num_edges=None):
+        ids = [self._vertex_ids[key] for key in start_vertices]
+        return map(self._vertex_keys.__getitem__,
+                   traversal.traverse(search, successors, ids, max_depth, stats, algorithm,
+                                      num_edges=num_edges))
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return self._search(traversal.bfs, self._neighbor_ids, start_vertices, max_depth,
+                            stats, 'bfs_undirected', self._num_incident_edges)
+
+    def bfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in breadth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._search(traversal.bfs, self._target_ids, start_vertices, max_depth,
+                            stats, 'bfs_directed')
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in depth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return self._search(traversal.dfs, self._neighbor_ids, start_vertices, max_depth,
+                            stats, 'dfs_undirected', self._num_incident_edges)
+
+    def dfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in depth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._search(traversal.dfs, self._target_ids, start_vertices, max_depth,
+                            stats, 'dfs_directed')
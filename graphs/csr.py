@@ -0,0 +1,449 @@
+import copyreg
+import mmap as _mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+from graphs import traversal
+from graphs.graph import Graph
+
+
+def _group(n, keys):
+    """Group the indices of keys (integers in range(n)) by key, stably.
+    Return (offsets, items) where the indices having key k are
+    items[offsets[k]:offsets[k+1]].
+
+    """
+    offsets = array('q', bytes(8 * (n + 1)))
+    for k in keys:
+        offsets[k + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    position = array('q', offsets)
+    items = array('q', bytes(8 * len(keys)))
+    for i, k in enumerate(keys):
+        items[position[k]] = i
+        position[k] += 1
+    return offsets, items
+
+
+# On-disk layout: a header, then the integer arrays as 8-byte machine
+# integers in the byte order named by the magic, then the pickled keys
+# (vertex_keys, edge_keys), then the pickled values (vertex_values,
+# edge_values).
+_MAGIC = {'little': b'PMGRAPHL', 'big': b'PMGRAPHB'}
+_HEADER = struct.Struct('<8s5q') #magic, n, m, len(nbr_targets), keys size, values size
+_ARRAYS = ('_edge_sources', '_edge_targets', '_out_offsets', '_out_edges', '_out_targets',
+           '_in_offsets', '_in_edges', '_in_sources', '_nbr_offsets', '_nbr_targets')
+
+
+class CSRGraph:
+    """
+    CSRGraph.from_graph(graph) -> new read-only snapshot of a graph
+
+    Vertex and edge keys are mapped to dense integer ids, and the
+    outgoing, incoming and undirected adjacency is stored as
+    compressed-sparse-row arrays of machine integers.  The read API is
+    the same as that of Graph.
+    """
+    def __init__(self, vertices, edges):
+        """Build the snapshot from a list of (vertex_key, vertex_value) tuples
+        and a list of (edge_key, source_vertex_key, target_vertex_key,
+        edge_value) tuples.  Every source and target vertex key must
+        be among the vertex keys.
+
+        """
+        self._vertex_keys = [key for key, value in vertices]
+        self._vertex_values = [value for key, value in vertices]
+        self._vertex_ids = {key: i for i, key in enumerate(self._vertex_keys)}
+        vertex_ids = self._vertex_ids
+        n = len(self._vertex_keys)
+        # sort the edges by target, then stably by source, so that the
+        # targets of each vertex's outgoing edges are in ascending order
+        edges = [(vertex_ids[s], vertex_ids[t], key, value) for key, s, t, value in edges]
+        by_target = _group(n, [t for s, t, key, value in edges])[1]
+        edges = [edges[i] for i in by_target]
+        self._edge_keys = [key for s, t, key, value in edges]
+        self._edge_values = [value for s, t, key, value in edges]
+        self._edge_ids = {key: i for i, key in enumerate(self._edge_keys)}
+        self._edge_sources = array('q', [s for s, t, key, value in edges])
+        self._edge_targets = array('q', [t for s, t, key, value in edges])
+        self._out_offsets, self._out_edges = _group(n, self._edge_sources)
+        self._out_targets = array('q', [self._edge_targets[e] for e in self._out_edges])
+        self._in_offsets, self._in_edges = _group(n, self._edge_targets)
+        self._in_sources = array('q', [self._edge_sources[e] for e in self._in_edges])
+        self._nbr_offsets = array('q', bytes(8 * (n + 1)))
+        self._nbr_targets = array('q')
+        for v in range(n):
+            neighbors = set(self._out_targets[self._out_offsets[v]:self._out_offsets[v + 1]])
+            neighbors.update(self._in_sources[self._in_offsets[v]:self._in_offsets[v + 1]])
+            self._nbr_targets.extend(sorted(neighbors))
+            self._nbr_offsets[v + 1] = len(self._nbr_targets)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Return a snapshot of the specified graph"""
+        return cls(list(graph.iter_vertex_value_tuple()),
+                   list(graph.iter_edge_source_target_value_tuple()))
+
+    def save(self, path):
+        """Write the graph to a file in a compact binary format, which load
+        can open without reading the adjacency into memory.  Keys and
+        values must be picklable.
+
+        """
+        keys = pickle.dumps((self._vertex_keys, self._edge_keys), pickle.HIGHEST_PROTOCOL)
+        values = pickle.dumps((self._vertex_values, self._edge_values), pickle.HIGHEST_PROTOCOL)
+        with open(path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC[sys.byteorder], len(self._vertex_keys), len(self._edge_keys),
+                                 len(self._nbr_targets), len(keys), len(values)))
+            for name in _ARRAYS:
+                f.write(getattr(self, name).tobytes())
+            f.write(keys)
+            f.write(values)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Open a graph written by save.  With mmap, the adjacency arrays are
+        memory-mapped read-only, so opening takes near-constant time and
+        processes opening the same file share its pages; the keys and
+        values are unpickled when first needed.  A memory-mapped graph
+        is pickled as the path of its file, which must not change while
+        the pickle is in use.
+
+        """
+        with open(path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            magic, n, m, k, keys_size, values_size = _HEADER.unpack(header)
+            if magic not in _MAGIC.values():
+                raise Exception("%s is not a graph file" % path)
+            native = magic == _MAGIC[sys.byteorder]
+            if mmap and native:
+                data = memoryview(_mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_READ))
+            else:
+                f.seek(0)
+                data = memoryview(f.read())
+        result = cls.__new__(cls)
+        if mmap and native:
+            result._path = os.path.abspath(path) #reopened when pickled
+        position = _HEADER.size
+        for name, length in zip(_ARRAYS, (m, m, n + 1, m, m, n + 1, m, m, n + 1, k)):
+            size = 8 * length
+            if native:
+                values = data[position:position + size].cast('q')
+            else:
+                values = array('q', data[position:position + size].tobytes())
+                values.byteswap()
+            setattr(result, name, values)
+            position += size
+        result._keys_data = data[position:position + keys_size]
+        position += keys_size
+        result._values_data = data[position:position + values_size]
+        return result
+
+    def __reduce__(self):
+        # a memory-mapped graph is pickled as its file's path, to be mapped
+        # again; any other has the arrays and data copied out of the
+        # buffers a load left them viewing
+        path = self.__dict__.get('_path')
+        if path is not None:
+            return (type(self).load, (path,))
+        state = dict(self.__dict__)
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                state[name] = array('q', value.tobytes()) if name in _ARRAYS else value.tobytes()
+        return (copyreg.__newobj__, (type(self),), state)
+
+    def __getattr__(self, name):
+        # the parts of a loaded graph that are unpickled or built on first use
+        if name in ('_vertex_keys', '_edge_keys'):
+            self._vertex_keys, self._edge_keys = pickle.loads(self._keys_data)
+        elif name in ('_vertex_values', '_edge_values'):
+            self._vertex_values, self._edge_values = pickle.loads(self._values_data)
+        elif name == '_vertex_ids':
+            self._vertex_ids = {key: i for i, key in enumerate(self._vertex_keys)}
+        elif name == '_edge_ids':
+            self._edge_ids = {key: i for i, key in enumerate(self._edge_keys)}
+        else:
+            raise AttributeError(name)
+        return self.__dict__[name]
+
+    def to_graph(self):
+        """Return a new mutable Graph with the same vertices and edges"""
+        result = Graph()
+        result.from_tuple_set_tuple((self.iter_vertex_value_tuple(),
+                                     self.iter_edge_source_target_value_tuple()))
+        return result
+
+    def vertex_id(self, key):
+        """Return the integer id of the vertex having the specified key"""
+        return self._vertex_ids[key]
+
+    def vertex_key(self, vertex_id):
+        """Return the key of the vertex having the specified integer id"""
+        return self._vertex_keys[vertex_id]
+
+    def edge_id(self, key):
+        """Return the integer id of the edge having the specified key"""
+        return self._edge_ids[key]
+
+    def edge_key(self, edge_id):
+        """Return the key of the edge having the specified integer id"""
+        return self._edge_keys[edge_id]
+
+    def get_vertex(self, key):
+        """Get the value of the vertex having the specified key"""
+        return self._vertex_values[self._vertex_ids[key]]
+
+    def is_vertex(self, key):
+        """Return True if the key is of a vertex in the graph"""
+        return key in self._vertex_ids
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph"""
+        return len(self._vertex_keys)
+
+    def iter_vertices(self):
+        """Generate the vertex keys"""
+        return iter(self._vertex_keys)
+
+    def get_edge(self, key):
+        """Get the value of the edge having the specified key"""
+        return self._edge_values[self._edge_ids[key]]
+
+    def is_edge(self, key):
+        """Return True if the key is of an edge in the graph"""
+        return key in self._edge_ids
+
+    def num_edges(self):
+        """Return the number of edges in the graph"""
+        return len(self._edge_keys)
+
+    def iter_edges(self):
+        """Generate the edge keys"""
+        return iter(self._edge_keys)
+
+    def get_source(self, edge_key):
+        """Return the source vertex of the edge key"""
+        return self._vertex_keys[self._edge_sources[self._edge_ids[edge_key]]]
+
+    def get_target(self, edge_key):
+        """Return the target vertex of the edge key"""
+        return self._vertex_keys[self._edge_targets[self._edge_ids[edge_key]]]
+
+    def iter_outgoing_edges(self, vertex_key):
+        """Generate the edge keys coming out of the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        edge_keys = self._edge_keys
+        for e in self._out_edges[self._out_offsets[v]:self._out_offsets[v + 1]]:
+            yield edge_keys[e]
+
+    def iter_target_vertices(self, vertex_key):
+        """Generate the target vertex keys of edges coming out of the
+specified vertex key
+
+        """
+        v = self._vertex_ids[vertex_key]
+        vertex_keys = self._vertex_keys
+        for t in self._out_targets[self._out_offsets[v]:self._out_offsets[v + 1]]:
+            yield vertex_keys[t]
+
+    def outdegree(self, vertex_key):
+        """Return the number of outgoing edges from the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        return self._out_offsets[v + 1] - self._out_offsets[v]
+
+    def iter_incoming_edges(self, vertex_key):
+        """Generate the edge keys entering the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        edge_keys = self._edge_keys
+        for e in self._in_edges[self._in_offsets[v]:self._in_offsets[v + 1]]:
+            yield edge_keys[e]
+
+    def iter_source_vertices(self, vertex_key):
+        """Generate the source vertex keys of edges entering the specified
+vertex key
+
+        """
+        v = self._vertex_ids[vertex_key]
+        vertex_keys = self._vertex_keys
+        for s in self._in_sources[self._in_offsets[v]:self._in_offsets[v + 1]]:
+            yield vertex_keys[s]
+
+    def indegree(self, vertex_key):
+        """Return the number of incoming edges to the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        return self._in_offsets[v + 1] - self._in_offsets[v]
+
+    def iter_neighbors(self, vertex_key):
+        """Generate the vertex keys adjacent to the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        vertex_keys = self._vertex_keys
+        for n in self._nbr_targets[self._nbr_offsets[v]:self._nbr_offsets[v + 1]]:
+            yield vertex_keys[n]
+
+    def degree(self, vertex_key):
+        """Return the number of vertices adjacent to the specified vertex key"""
+        v = self._vertex_ids[vertex_key]
+        return self._nbr_offsets[v + 1] - self._nbr_offsets[v]
+
+    def _connection_range(self, source_key, target_key):
+        s = self._vertex_ids[source_key]
+        t = self._vertex_ids[target_key]
+        lo = self._out_offsets[s]
+        hi = self._out_offsets[s + 1]
+        return (bisect_left(self._out_targets, t, lo, hi),
+                bisect_right(self._out_targets, t, lo, hi))
+
+    def iter_connections(self, source_key, target_key):
+        """Generate the edge keys from the source vertex key to the target
+        vertex key
+
+        """
+        lo, hi = self._connection_range(source_key, target_key)
+        edge_keys = self._edge_keys
+        for e in self._out_edges[lo:hi]:
+            yield edge_keys[e]
+
+    def num_connections(self, source_key, target_key):
+        """Return the number of edges from the source vertex key to the target
+        vertex key
+
+        """
+        lo, hi = self._connection_range(source_key, target_key)
+        return hi - lo
+
+    def is_adjacent(self, source_key, target_key):
+        """Return true if the specified source vertex key is adjacent to the
+        specified target vertex key.
+
+        """
+        lo, hi = self._connection_range(source_key, target_key)
+        return hi > lo
+
+    def iter_vertex_values(self):
+        """Generate the values of the vertices of the graph"""
+        return iter(self._vertex_values)
+
+    def iter_edge_values(self):
+        """Generate the values of the edges of the graph"""
+        return iter(self._edge_values)
+
+    def iter_vertex_value_tuple(self):
+        """Generate all vertex key-value pairs from the graph"""
+        return zip(self._vertex_keys, self._vertex_values)
+
+    def iter_edge_source_target_value_tuple(self):
+        """Generate all edge key-source-target-value quadruples from the graph"""
+        vertex_keys = self._vertex_keys
+        for e, key in enumerate(self._edge_keys):
+            yield (key, vertex_keys[self._edge_sources[e]],
+                   vertex_keys[self._edge_targets[e]], self._edge_values[e])
+
+    def to_tuple_set_tuple(self):
+        """Return data of the graph, in the form (vertices, edges), where
+        vertices is a set of tuples (vertex_key, vertex_value) and
+        edges is a set of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value).
+
+        """
+        return (set(self.iter_vertex_value_tuple()), set(self.iter_edge_source_target_value_tuple()))
+
+    def __str__(self):
+        return "<CSRGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def __repr__(self):
+        return "<CSRGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    # traversals over the integer ids, with a bitmap of visited vertices
+    # local to each call
+
+    def _num_incident_edges(self, v):
+        # the edges an undirected traversal scans at the vertex id; the
+        # targets of its outgoing edges are sorted, so its self-loops
+        # are together
+        lo = self._out_offsets[v]
+        hi = self._out_offsets[v + 1]
+        loops = bisect_right(self._out_targets, v, lo, hi) - bisect_left(self._out_targets, v, lo, hi)
+        return hi - lo + self._in_offsets[v + 1] - self._in_offsets[v] - loops
+
+    def _search(self, start_vertices, offsets, targets, breadth_first, max_depth, stats, algorithm,
+                num_edges=None):
+        if stats is None and (breadth_first or max_depth is None):
+            return self._scan(start_vertices, offsets, targets, breadth_first, max_depth)
+        # a depth limit may need vertices expanded more than once, and
+        # stats are recorded by the generic traversals
+        ids = [self._vertex_ids[key] for key in start_vertices]
+        successors = lambda v: targets[offsets[v]:offsets[v + 1]]
+        search = traversal.bfs if breadth_first else traversal.dfs
+        return map(self._vertex_keys.__getitem__,
+                   traversal.traverse(search, successors, ids, max_depth, stats, algorithm,
+                                      num_edges=num_edges))
+
+    def _scan(self, start_vertices, offsets, targets, breadth_first, max_depth):
+        visited = bytearray(len(self._vertex_keys))
+        frontier = deque()
+        for key in start_vertices:
+            v = self._vertex_ids[key]
+            if not visited[v]:
+                visited[v] = 1
+                frontier.append((v, 0))
+        pop = frontier.popleft if breadth_first else frontier.pop
+        vertex_keys = self._vertex_keys
+        while frontier:
+            v, depth = pop()
+            yield vertex_keys[v]
+            if max_depth is None or depth < max_depth:
+                depth += 1
+                for n in targets[offsets[v]:offsets[v + 1]]:
+                    if not visited[n]:
+                        visited[n] = 1
+                        frontier.append((n, depth))
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return self._search(start_vertices, self._nbr_offsets, self._nbr_targets, True, max_depth,
+                            stats, 'bfs_undirected', self._num_incident_edges)
+
+    def bfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in breadth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._search(start_vertices, self._out_offsets, self._out_targets, True, max_depth,
+                            stats, 'bfs_directed')
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in depth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return self._search(start_vertices, self._nbr_offsets, self._nbr_targets, False, max_depth,
+                            stats, 'dfs_undirected', self._num_incident_edges)
+
+    def dfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in depth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._search(start_vertices, self._out_offsets, self._out_targets, False, max_depth,
+                            stats, 'dfs_directed')
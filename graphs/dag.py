@@ -0,0 +1,122 @@
+from collections import deque
+
+# Iterative algorithms on the directed structure of a graph, usable on
+# anything with the Graph read API.  None of them recurse, so they work
+# on graphs with paths longer than the recursion limit.
+
+
+def strongly_connected_components(graph):
+    """Generate the strongly connected components of the graph as sets of
+    vertex keys, using Tarjan's algorithm.  Each component is generated
+    after every component reachable from it, so the order is a reverse
+    topological order of the condensed graph.
+
+    """
+    targets = graph.iter_target_vertices
+    index = dict()
+    lowlink = dict()
+    stack = []
+    on_stack = set()
+    counter = 0
+    for root in graph.iter_vertices():
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, targets(root))]
+        while work:
+            v, successors = work[-1]
+            for w in successors:
+                if w not in index:
+                    index[w] = lowlink[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, targets(w)))
+                    break
+                elif w in on_stack and index[w] < lowlink[v]:
+                    lowlink[v] = index[w]
+            else:
+                work.pop()
+                if work:
+                    u = work[-1][0]
+                    if lowlink[v] < lowlink[u]:
+                        lowlink[u] = lowlink[v]
+                if lowlink[v] == index[v]:
+                    component = set()
+                    while True:
+                        w = stack.pop()
+                        on_stack.remove(w)
+                        component.add(w)
+                        if w == v:
+                            break
+                    yield component
+
+
+def topological_sort(graph):
+    """Return a list of the vertex keys in which the source of every edge
+    comes before its target, using Kahn's algorithm.  An exception is
+    raised if the graph has a cycle.
+
+    """
+    indegrees = dict()
+    ready = deque()
+    for v in graph.iter_vertices():
+        d = graph.indegree(v)
+        if d:
+            indegrees[v] = d
+        else:
+            ready.append(v)
+    order = []
+    targets = graph.iter_target_vertices
+    while ready:
+        v = ready.popleft()
+        order.append(v)
+        for w in targets(v):
+            indegrees[w] -= 1
+            if not indegrees[w]:
+                del indegrees[w]
+                ready.append(w)
+    if indegrees:
+        raise Exception("Graph has a cycle")
+    return order
+
+
+def find_cycle(graph, *start_vertices):
+    """Return the list of edge keys of a directed cycle, or None if there
+    is none.  If start vertices are specified, only cycles reachable
+    from them are looked for.
+
+    """
+    outgoing = graph.iter_outgoing_edges
+    target = graph.get_target
+    done = set()
+    roots = start_vertices if start_vertices else graph.iter_vertices()
+    for root in roots:
+        if root in done:
+            continue
+        # the current path: its vertices, the edges between them, and the
+        # position of each vertex on it
+        path = [(root, outgoing(root))]
+        path_edges = []
+        on_path = {root: 0}
+        while path:
+            v, edges = path[-1]
+            for e in edges:
+                w = target(e)
+                if w in on_path:
+                    return path_edges[on_path[w]:] + [e]
+                if w not in done:
+                    on_path[w] = len(path)
+                    path.append((w, outgoing(w)))
+                    path_edges.append(e)
+                    break
+            else:
+                path.pop()
+                del on_path[v]
+                if path_edges:
+                    path_edges.pop()
+                done.add(v)
+    return None
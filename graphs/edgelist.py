@@ -0,0 +1,108 @@
+import csv
+import json
+from itertools import islice
+
+# Edge lists in text files, one edge per line: comma- or tab-separated
+# key, source, target and value columns after a header line, or JSON
+# objects with "key", "source", "target" and "value" members.  Values
+# read from csv and tsv files are strings, with empty strings read as
+# None.  Vertices without edges are not represented.
+
+FORMATS = ('csv', 'tsv', 'jsonl')
+HEADER = ('key', 'source', 'target', 'value')
+
+
+class _Opened:
+    # a context manager that opens a path, or passes an open file through
+    def __init__(self, path_or_file, mode):
+        self._path_or_file = path_or_file
+        self._mode = mode
+        self._file = None
+
+    def __enter__(self):
+        if hasattr(self._path_or_file, 'read') or hasattr(self._path_or_file, 'write'):
+            return self._path_or_file
+        self._file = open(self._path_or_file, self._mode, newline='', encoding='utf-8')
+        return self._file
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+
+
+def _check_format(fmt):
+    if fmt not in FORMATS:
+        raise ValueError("fmt must be one of %s" % ", ".join(FORMATS))
+
+
+def _delimited_edges(rows):
+    # rows is a csv reader, whose line_num locates a bad row
+    for row in rows:
+        if not row:
+            continue
+        if len(row) == 3:
+            yield (row[0], row[1], row[2])
+        elif len(row) == 4:
+            yield (row[0], row[1], row[2], row[3] if row[3] != '' else None)
+        else:
+            raise ValueError("line %d has %d fields, not 3 or 4" % (rows.line_num, len(row)))
+
+
+def _json_edges(lines):
+    for line in lines:
+        if not line.strip():
+            continue
+        edge = json.loads(line)
+        yield (edge['key'], edge['source'], edge['target'], edge.get('value'))
+
+
+def iter_edgelist(path_or_file, fmt='csv'):
+    """Generate (edge_key, source_vertex_key, target_vertex_key,
+    edge_value) tuples from an edge list file, reading it a line at a
+    time.
+
+    """
+    _check_format(fmt)
+    with _Opened(path_or_file, 'r') as f:
+        if fmt == 'jsonl':
+            yield from _json_edges(f)
+        else:
+            rows = csv.reader(f, delimiter=',' if fmt == 'csv' else '\t')
+            next(rows, None)
+            yield from _delimited_edges(rows)
+
+
+def read_edgelist(graph, path_or_file, fmt='csv', chunk_size=100000):
+    """Add the edges of an edge list file to the graph, chunk_size edges at
+    a time through its add_edges_from, so that memory use is bounded
+    by the chunk size rather than the file size.  Return the number of
+    edges read.
+
+    """
+    edges = iter_edgelist(path_or_file, fmt)
+    count = 0
+    while True:
+        chunk = list(islice(edges, chunk_size))
+        if not chunk:
+            return count
+        graph.add_edges_from(chunk)
+        count += len(chunk)
+
+
+def write_edgelist(graph, path_or_file, fmt='csv'):
+    """Write the edges of the graph to an edge list file, a line at a time.
+    For jsonl, keys and values must be serializable as JSON.
+
+    """
+    _check_format(fmt)
+    edges = graph.iter_edge_source_target_value_tuple()
+    with _Opened(path_or_file, 'w') as f:
+        if fmt == 'jsonl':
+            for edge in edges:
+                f.write(json.dumps(dict(zip(HEADER, edge))))
+                f.write('\n')
+        else:
+            writer = csv.writer(f, delimiter=',' if fmt == 'csv' else '\t', lineterminator='\n')
+            writer.writerow(HEADER)
+            writer.writerows((key, source, target, '' if value is None else value)
+                             for key, source, target, value in edges)
@@ -0,0 +1,136 @@
+from collections import deque
+
+# Maximum flow by Dinic's algorithm.  Edge capacities are the edge
+# values, or capacity(edge value) if capacity is specified; parallel
+# edges are separate arcs.  The residual network is kept in flat lists
+# indexed by arc id, where arc 2i is edge i and arc 2i+1 its reverse.
+
+
+class _Network:
+    def __init__(self, graph, source, sink, capacity):
+        if not graph.is_vertex(source) or not graph.is_vertex(sink):
+            raise KeyError
+        if source == sink:
+            raise ValueError("The source and sink must differ")
+        get_edge = graph.get_edge
+        edge_capacity = get_edge if capacity is None else lambda e: capacity(get_edge(e))
+        self.vertex_keys = list(graph.iter_vertices())
+        ids = {key: i for i, key in enumerate(self.vertex_keys)}
+        self.edge_keys = []
+        self.head = [] #arc id -> vertex id the arc points to
+        self.residual = [] #arc id -> remaining capacity
+        self.capacities = [] #edge id -> capacity
+        self.arcs = [[] for key in self.vertex_keys] #vertex id -> [arc id]
+        for key, s, t, value in graph.iter_edge_source_target_value_tuple():
+            c = edge_capacity(key)
+            if c < 0:
+                raise ValueError("Edge %r has negative capacity" % (key,))
+            s = ids[s]
+            t = ids[t]
+            arc = len(self.head)
+            self.edge_keys.append(key)
+            self.capacities.append(c)
+            self.head.extend((t, s))
+            self.residual.extend((c, 0))
+            self.arcs[s].append(arc)
+            self.arcs[t].append(arc + 1)
+        self.source = ids[source]
+        self.sink = ids[sink]
+
+    def levels(self):
+        """Return the list of breadth-first levels of the vertices in the
+        residual network, -1 where unreachable.
+
+        """
+        level = [-1] * len(self.arcs)
+        level[self.source] = 0
+        queue = deque([self.source])
+        head = self.head
+        residual = self.residual
+        while queue:
+            v = queue.popleft()
+            for a in self.arcs[v]:
+                w = head[a]
+                if residual[a] > 0 and level[w] < 0:
+                    level[w] = level[v] + 1
+                    queue.append(w)
+        return level
+
+    def blocking_flow(self, level):
+        """Saturate the level graph with augmenting paths found by an
+        iterative depth-first search, and return the flow added.
+
+        """
+        head = self.head
+        residual = self.residual
+        arcs = self.arcs
+        current = [0] * len(arcs) #next arc to try from each vertex
+        total = 0
+        path = []
+        v = self.source
+        while True:
+            if v == self.sink:
+                f = min(residual[a] for a in path)
+                for a in path:
+                    residual[a] -= f
+                    residual[a ^ 1] += f
+                total += f
+                path = []
+                v = self.source
+                continue
+            vertex_arcs = arcs[v]
+            i = current[v]
+            while i < len(vertex_arcs):
+                a = vertex_arcs[i]
+                if residual[a] > 0 and level[head[a]] == level[v] + 1:
+                    break
+                i += 1
+            current[v] = i
+            if i < len(vertex_arcs):
+                path.append(vertex_arcs[i])
+                v = head[vertex_arcs[i]]
+            elif not path:
+                return total
+            else:
+                # a dead end: retreat and skip the arc that led here
+                level[v] = -1
+                a = path.pop()
+                v = head[a ^ 1]
+                current[v] += 1
+
+    def run(self):
+        total = 0
+        while True:
+            level = self.levels()
+            if level[self.sink] < 0:
+                return total
+            total += self.blocking_flow(level)
+
+
+def max_flow(graph, source, sink, capacity=None):
+    """Return (value, flows) for a maximum flow from the source vertex key
+    to the sink vertex key, where flows maps each edge key to the flow
+    along the edge.
+
+    """
+    network = _Network(graph, source, sink, capacity)
+    value = network.run()
+    flows = {key: network.capacities[i] - network.residual[2 * i]
+             for i, key in enumerate(network.edge_keys)}
+    return value, flows
+
+
+def min_cut(graph, source, sink, capacity=None):
+    """Return (value, source_side, cut_edges) for a minimum cut separating
+    the source vertex key from the sink vertex key, where source_side
+    is the set of vertex keys on the source's side and cut_edges is the
+    list of keys of edges from the source side to the other side.
+
+    """
+    network = _Network(graph, source, sink, capacity)
+    value = network.run()
+    level = network.levels()
+    source_side = {network.vertex_keys[v] for v in range(len(level)) if level[v] >= 0}
+    cut_edges = [key for i, key in enumerate(network.edge_keys)
+                 if level[network.head[2 * i + 1]] >= 0 and level[network.head[2 * i]] < 0]
+    return value, source_side, cut_edges
@@ -0,0 +1,80 @@
+import random
+
+from graphs.graph import Graph
+
+# Random and regular graph generators.  Each *_edges function returns
+# parallel lists (sources, targets) of vertex ids, drawn in bulk, for
+# Graph.from_arrays; the other functions return the Graph itself, whose
+# edge keys are the positions in those lists.
+
+
+def erdos_renyi_edges(n, m, seed=None):
+    """Return (sources, targets) for m edges between vertices 0 to n-1,
+    with endpoints chosen uniformly at random, so there may be
+    parallel edges and loops.
+
+    """
+    rng = random.Random(seed)
+    vertices = range(n)
+    return rng.choices(vertices, k=m), rng.choices(vertices, k=m)
+
+
+def erdos_renyi(n, m, seed=None):
+    """Return a random graph with vertices 0 to n-1 and m edges, as for
+    erdos_renyi_edges.  Vertices with no edges are included.
+
+    """
+    graph = Graph.from_arrays(*erdos_renyi_edges(n, m, seed))
+    for v in range(n):
+        graph.add_vertex(v)
+    return graph
+
+
+def barabasi_albert_edges(n, m, seed=None):
+    """Return (sources, targets) for a preferential-attachment graph on
+    vertices 0 to n-1: each vertex from m on has edges to m distinct
+    earlier vertices, chosen with probability proportional to their
+    degree.
+
+    """
+    if not 1 <= m < n:
+        raise ValueError("m must be at least 1 and less than n")
+    rng = random.Random(seed)
+    sources = []
+    targets = []
+    # every endpoint of every edge so far, so a uniform choice from it is
+    # a choice in proportion to degree
+    endpoints = list(range(m))
+    for v in range(m, n):
+        chosen = set()
+        while len(chosen) < m:
+            chosen.update(rng.choices(endpoints, k=m - len(chosen)))
+        sources.extend([v] * m)
+        targets.extend(chosen)
+        endpoints.extend(chosen)
+        endpoints.extend([v] * m)
+    return sources, targets
+
+
+def barabasi_albert(n, m, seed=None):
+    """Return a preferential-attachment graph, as for barabasi_albert_edges"""
+    return Graph.from_arrays(*barabasi_albert_edges(n, m, seed))
+
+
+def grid_edges(rows, columns):
+    """Return (sources, targets) for a grid of rows x columns vertices,
+    numbered row by row, with an edge from each vertex to the vertex
+    on its right and the vertex below it.
+
+    """
+    right = [v for v in range(rows * columns) if v % columns != columns - 1]
+    down = list(range((rows - 1) * columns)) if rows else []
+    return right + down, [v + 1 for v in right] + [v + columns for v in down]
+
+
+def grid(rows, columns):
+    """Return a grid graph, as for grid_edges"""
+    graph = Graph.from_arrays(*grid_edges(rows, columns))
+    for v in range(rows * columns):
+        graph.add_vertex(v)
+    return graph
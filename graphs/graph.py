@@ -1,4 +1,119 @@
-from collections import deque
+import gc
+from collections import deque, namedtuple
+from itertools import islice, repeat
+
+from graphs import dag
+from graphs import edgelist
+from graphs import traversal
+from graphs.index import ValueIndex
+from graphs.unionfind import UnionFind
+from graphs.view import GraphView
+
+Change = namedtuple('Change', 'version operation key source target value')
+Change.__doc__ = """A change made to a graph, as recorded in its journal and passed
+to subscribers.  operation is one of 'add_vertex', 'add_edge',
+'remove_edge', 'remove_vertex' and 'clear'; source and target are the
+endpoints of an edge, and value is the new value of an added vertex or
+edge or the old value of a removed one.  Adding an existing vertex or
+edge with a new value is recorded as adding it again."""
+
+
+class _Layer(dict):
+    # a table over a base dict that is shared with copies and so never
+    # changed: the layer holds the entries set since, and the base keys
+    # deleted since, so a change costs no more than on a dict
+    __slots__ = ('base', 'removed', 'added')
+
+    def __init__(self, base, changes=(), removed=()):
+        dict.__init__(self, changes)
+        self.base = base #the shared dict
+        self.removed = set(removed) #base keys deleted
+        self.added = sum(1 for key in dict.__iter__(self) if key not in base) #keys not in base
+
+    @classmethod
+    def over(cls, table):
+        """Return a new layer with the entries of table, over its base"""
+        if type(table) is cls:
+            return cls(table.base, dict.items(table), table.removed)
+        return cls(table)
+
+    def __reduce__(self):
+        return (_Layer, (self.base, dict(dict.items(self)), self.removed))
+
+    def flatten(self):
+        """Return a dict with the entries of the layer"""
+        result = self.base.copy()
+        for key in self.removed:
+            del result[key]
+        result.update(dict.items(self))
+        return result
+
+    def __missing__(self, key):
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __contains__(self, key):
+        if dict.__contains__(self, key):
+            return True
+        return key in self.base and key not in self.removed
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def __setitem__(self, key, value):
+        if not dict.__contains__(self, key):
+            if key in self.base:
+                self.removed.discard(key)
+            else:
+                self.added += 1
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        if dict.__contains__(self, key):
+            dict.__delitem__(self, key)
+            if key in self.base:
+                self.removed.add(key)
+            else:
+                self.added -= 1
+        elif key in self.base and key not in self.removed:
+            self.removed.add(key)
+        else:
+            raise KeyError(key)
+
+    def pop(self, key, *default):
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default:
+            return default[0]
+        raise KeyError(key)
+
+    def __len__(self):
+        return len(self.base) - len(self.removed) + self.added
+
+    def __iter__(self):
+        removed = self.removed
+        for key in self.base:
+            if key not in removed:
+                yield key
+        base = self.base
+        for key in dict.__iter__(self):
+            if key not in base:
+                yield key
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
 
 class Graph:
     """
@@ -13,7 +128,93 @@ class Graph:
         self._incoming_edges = dict() #vertex_key -> {edge_key}
         self._neighbors = dict() #vertex_key -> {vertex_key}
         self._connections = dict() #(vertex_key, vertex_key) -> {edge_key}
-        self._aux = dict() #used internally in various algorithms
+        self._components = None #UnionFind of vertex keys, if tracked
+        self._components_stale = False
+        # copy-on-write state: whether the dicts above are shared with a
+        # copy, the changes left before the layers over shared dicts are
+        # merged into new dicts with sets of their own, and if per-vertex
+        # and per-connection sets may be shared, the keys whose sets this
+        # graph has made its own
+        self._shared = False
+        self._layered_changes = None #changes left, or None if no layers
+        self._owned_vertices = None #{vertex_key}, or None if all are owned
+        self._owned_connections = None #{(vertex_key, vertex_key)}, or None
+        self._version = 0 #number of changes made
+        self._journal = None #deque of Change, if enabled
+        self._subscribers = [] #callbacks called with each Change
+        self._indexes = dict() #index name -> ValueIndex
+        self._vertex_indexes = [] #ValueIndexes of vertex values
+        self._edge_indexes = [] #ValueIndexes of edge values
+        self._k_hop_cache = None #KHopCache, once k_hop is called
+        self._reachability_index = None #ReachabilityIndex, once reachability_index is called
+        self._traversal_callback = None #called with the TraversalStats of each traversal
+        self._trace_memory = False
+
+    def _record(self, operation, key=None, source=None, target=None, value=None):
+        # called after each change
+        self._version += 1
+        if self._journal is not None or self._subscribers:
+            change = Change(self._version, operation, key, source, target, value)
+            if self._journal is not None:
+                self._journal.append(change)
+            for callback in self._subscribers:
+                callback(change)
+
+    def _write(self):
+        # called before any change: stop sharing the dicts with copies by
+        # laying this graph's changes over them, and once the changes are
+        # a fair part of the graph, merge the layers into new dicts
+        if self._shared:
+            self._vertices = _Layer.over(self._vertices)
+            self._edges = _Layer.over(self._edges)
+            self._sources = _Layer.over(self._sources)
+            self._targets = _Layer.over(self._targets)
+            self._outgoing_edges = _Layer.over(self._outgoing_edges)
+            self._incoming_edges = _Layer.over(self._incoming_edges)
+            self._neighbors = _Layer.over(self._neighbors)
+            self._connections = _Layer.over(self._connections)
+            self._owned_vertices = set()
+            self._owned_connections = set()
+            self._shared = False
+            if self._layered_changes is None:
+                self._layered_changes = max(64, (len(self._vertices) + len(self._edges)) // 8)
+        if self._layered_changes is not None:
+            self._layered_changes -= 1
+            if self._layered_changes <= 0:
+                self._vertices = self._vertices.flatten()
+                self._edges = self._edges.flatten()
+                self._sources = self._sources.flatten()
+                self._targets = self._targets.flatten()
+                self._outgoing_edges = self._outgoing_edges.flatten()
+                self._incoming_edges = self._incoming_edges.flatten()
+                self._neighbors = self._neighbors.flatten()
+                self._connections = self._connections.flatten()
+                self._layered_changes = None
+                # copy the sets still shared, so that the graph shares
+                # nothing and bulk loading takes its fast path again
+                for table in (self._outgoing_edges, self._incoming_edges, self._neighbors):
+                    for key, value in table.items():
+                        if key not in self._owned_vertices:
+                            table[key] = set(value)
+                for pair, value in self._connections.items():
+                    if pair not in self._owned_connections:
+                        self._connections[pair] = set(value)
+                self._owned_vertices = None
+                self._owned_connections = None
+
+    def _own_vertex(self, key):
+        # called before changing the sets of a vertex, after _write
+        if self._owned_vertices is not None and key not in self._owned_vertices:
+            self._outgoing_edges[key] = set(self._outgoing_edges[key])
+            self._incoming_edges[key] = set(self._incoming_edges[key])
+            self._neighbors[key] = set(self._neighbors[key])
+            self._owned_vertices.add(key)
+
+    def _own_connection(self, pair):
+        # called before changing the edge set of an existing connection
+        if self._owned_connections is not None and pair not in self._owned_connections:
+            self._connections[pair] = set(self._connections[pair])
+            self._owned_connections.add(pair)
 
     def add_vertex(self, key, value=None):
         """Add a new vertex, with an optional value, to the graph.  The key
@@ -22,12 +223,25 @@ class Graph:
         will replace the old value.
         """
         if key not in self._vertices:
+            self._write()
             self._outgoing_edges[key] = set()
             self._incoming_edges[key] = set()
             self._neighbors[key] = set()
             self._vertices[key] = value
+            if self._owned_vertices is not None:
+                self._owned_vertices.add(key)
+            if self._components is not None and not self._components_stale:
+                self._components.add(key)
+            for index in self._vertex_indexes:
+                index.add(key, value)
+            self._record('add_vertex', key, value=value)
         elif value is not None:
+            self._write()
+            for index in self._vertex_indexes:
+                index.remove(key, self._vertices[key])
+                index.add(key, value)
             self._vertices[key] = value
+            self._record('add_vertex', key, value=value)
 
     def add_edge(self, key, source_key, target_key, value=None):
         """Add a new edge, with an optional value, to the graph, connecting
@@ -43,13 +257,21 @@ class Graph:
         if key in self._edges:
             if self._sources[key] != source_key:
                 raise Exception("Edge %s exists with different endpoints" % key)
-            if self._targets[key] != targets_key:
+            if self._targets[key] != target_key:
                 raise Exception("Edge %s exists with different endpoints" % key)                
             if value is not None:
+                self._write()
+                for index in self._edge_indexes:
+                    index.remove(key, self._edges[key])
+                    index.add(key, value)
                 self._edges[key] = value
+                self._record('add_edge', key, source_key, target_key, value)
         else:
             self.add_vertex(source_key)
             self.add_vertex(target_key)            
+            self._write()
+            self._own_vertex(source_key)
+            self._own_vertex(target_key)
             self._edges[key] = value
             self._sources[key] = source_key
             self._targets[key] = target_key
@@ -59,27 +281,57 @@ class Graph:
             self._neighbors[target_key].add(source_key)
             if not (source_key, target_key) in self._connections:
                 self._connections[(source_key, target_key)] = set()
+                if self._owned_connections is not None:
+                    self._owned_connections.add((source_key, target_key))
+            else:
+                self._own_connection((source_key, target_key))
             self._connections[(source_key, target_key)].add(key)
+            if self._components is not None and not self._components_stale:
+                self._components.union(source_key, target_key)
+            for index in self._edge_indexes:
+                index.add(key, value)
+            self._record('add_edge', key, source_key, target_key, value)
 
     def remove_edge(self, key):
         """Remove the edge having the specified key, and return the value, if
         any.
 
         """
+        return self._remove_edge(key, True)
+
+    def _remove_edge(self, key, check_split):
+        # check_split is false when remove_vertex checks for itself whether
+        # removing the edge split a component
         if key in self._edges:
+            self._write()
             value = self._edges[key]
             del self._edges[key]
             source_key =  self._sources[key]
             del self._sources[key]
             target_key = self._targets[key]
             del self._targets[key]
+            self._own_vertex(source_key)
+            self._own_vertex(target_key)
+            self._own_connection((source_key, target_key))
             self._outgoing_edges[source_key].remove(key)
             self._incoming_edges[target_key].remove(key)
-            self._neighbors[source_key].remove(target_key)
-            self._neighbors[target_key].remove(source_key)
             self._connections[(source_key, target_key)].remove(key)
             if not self._connections[(source_key, target_key)]:
                 del self._connections[(source_key, target_key)]
+                # the vertices stay neighbors while an edge in either
+                # direction remains between them
+                if (target_key, source_key) not in self._connections:
+                    self._neighbors[source_key].discard(target_key)
+                    self._neighbors[target_key].discard(source_key)
+                    if (check_split and self._components is not None
+                        and not self._components_stale and source_key != target_key
+                        and not self._connected_nearby(source_key, target_key)):
+                        # the last edge between the vertices may have
+                        # split a component; rebuild when next asked
+                        self._components_stale = True
+            for index in self._edge_indexes:
+                index.remove(key, value)
+            self._record('remove_edge', key, source_key, target_key, value)
             return value
         else:
             return None
@@ -95,17 +347,35 @@ class Graph:
                 edges.add(edge_key)
             for edge_key in self._incoming_edges[key]:
                 edges.add(edge_key)
+            adjacent = self._neighbors[key] - {key}
             for edge_key in edges:
-                self.remove_edge(edge_key)
+                self._remove_edge(edge_key, False)
+            if self._components is not None and not self._components_stale and len(adjacent) > 1:
+                # the component is split unless the vertex's neighbors
+                # are still connected without it
+                first = next(iter(adjacent))
+                for vertex_key in adjacent:
+                    if vertex_key != first and not self._connected_nearby(first, vertex_key):
+                        self._components_stale = True
+                        break
+            self._write()
             value = self._vertices[key]
             del self._vertices[key]
             del self._outgoing_edges[key]
             del self._incoming_edges[key]
             neighbors = self._neighbors[key]
             for vertex_key in neighbors:
+                self._own_vertex(vertex_key)
                 self._neighbors[vertex_key].remove(key)
             del self._neighbors[key]
+            if self._owned_vertices is not None:
+                self._owned_vertices.discard(key)
             del edges
+            if self._components is not None and not self._components_stale:
+                self._components.discard(key)
+            for index in self._vertex_indexes:
+                index.remove(key, value)
+            self._record('remove_vertex', key, value=value)
             return value
         else:
             return None
@@ -251,28 +521,289 @@ vertex key
             
     def clear(self):
         """Remove all vertices, edges, and values from the graph"""
-        self._vertices.clear()
-        self._edges.clear()
-        self._sources.clear()
-        self._targets.clear()
-        self._outgoing_edges.clear()
-        self._incoming_edges.clear()
-        self._neighbors.clear()
-        self._connections.clear()
+        if self._shared or self._layered_changes is not None:
+            self._vertices = dict()
+            self._edges = dict()
+            self._sources = dict()
+            self._targets = dict()
+            self._outgoing_edges = dict()
+            self._incoming_edges = dict()
+            self._neighbors = dict()
+            self._connections = dict()
+            self._shared = False
+            self._layered_changes = None
+        else:
+            self._vertices.clear()
+            self._edges.clear()
+            self._sources.clear()
+            self._targets.clear()
+            self._outgoing_edges.clear()
+            self._incoming_edges.clear()
+            self._neighbors.clear()
+            self._connections.clear()
+        self._owned_vertices = None
+        self._owned_connections = None
+        if self._components is not None:
+            self._components.clear()
+            self._components_stale = False
+        for index in self._indexes.values():
+            index.clear()
+        self._record('clear')
 
     def copy(self):
-        """Return a shallow copy of the graph"""
+        """Return a copy of the graph, with the same values, not copies.  The
+        copy takes constant time: the graphs share their structure, and
+        each keeps its later changes in layers over the shared tables,
+        copying the adjacency of only the vertices it touches.  The first
+        change after a copy takes time in proportion to the changes in
+        the layers, which are merged into new tables once they grow to
+        an eighth of the graph.
+
+        """
         result = Graph()
-        result._vertices = self._vertices.copy()
-        result._edges = self._edges.copy()
-        result._sources = self._sources.copy()
-        result._targets = self._targets.copy()
-        result._outgoing_edges = self._outgoing_edges.copy()
-        result._incoming_edges = self._incoming_edges.copy()
-        result._neighbors = self._neighbors.copy( )
-        result._connections = self._connections.copy()
+        result._vertices = self._vertices
+        result._edges = self._edges
+        result._sources = self._sources
+        result._targets = self._targets
+        result._outgoing_edges = self._outgoing_edges
+        result._incoming_edges = self._incoming_edges
+        result._neighbors = self._neighbors
+        result._connections = self._connections
+        result._shared = self._shared = True
+        result._layered_changes = self._layered_changes
+        result._version = self._version
+        if self._components is not None:
+            result.track_components()
         return result
 
+    def version(self):
+        """Return the number of changes made to the graph, which increases
+        with every change.
+
+        """
+        return self._version
+
+    def enable_journal(self, maxlen=None):
+        """Start recording changes to the graph, keeping the last maxlen
+        (default: all) for changes_since.
+
+        """
+        if self._journal is None or self._journal.maxlen != maxlen:
+            self._journal = deque(self._journal or (), maxlen)
+
+    def disable_journal(self):
+        """Stop recording changes to the graph and discard the journal"""
+        self._journal = None
+
+    def changes_since(self, version):
+        """Return the list of Changes made after the graph had the specified
+        version, in order.  The journal must be enabled, and must still
+        hold all of those changes.
+
+        """
+        if self._journal is None:
+            raise Exception("The journal is not enabled; call enable_journal first")
+        if version >= self._version:
+            return []
+        first = self._journal[0].version if self._journal else self._version + 1
+        if version + 1 < first:
+            raise Exception("Changes since version %d are no longer in the journal" % version)
+        return list(islice(self._journal, version + 1 - first, None))
+
+    def subscribe(self, callback):
+        """Call callback(change) with a Change after each change to the graph"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        """Stop calling a callback passed to subscribe"""
+        self._subscribers.remove(callback)
+
+    def create_index(self, kind, key_fn, name=None):
+        """Create a secondary index of the vertices (kind 'vertex') or edges
+        (kind 'edge') by key_fn(value), kept up to date as the graph
+        changes, and return its name: the specified name, or key_fn
+        itself.  Vertices or edges for which key_fn returns None are not
+        indexed.  Indexes are not carried over by copy.
+
+        """
+        if kind not in ('vertex', 'edge'):
+            raise ValueError("kind must be 'vertex' or 'edge'")
+        if name is None:
+            name = key_fn
+        if name in self._indexes:
+            raise Exception("Index %r already exists" % (name,))
+        index = ValueIndex(key_fn)
+        if kind == 'vertex':
+            for key, value in self._vertices.items():
+                index.add(key, value)
+            self._vertex_indexes.append(index)
+        else:
+            for key, value in self._edges.items():
+                index.add(key, value)
+            self._edge_indexes.append(index)
+        self._indexes[name] = index
+        return name
+
+    def drop_index(self, name):
+        """Remove the secondary index having the specified name"""
+        index = self._indexes.pop(name)
+        if index in self._vertex_indexes:
+            self._vertex_indexes.remove(index)
+        else:
+            self._edge_indexes.remove(index)
+
+    def find_vertices(self, name, index_value):
+        """Return the set of keys of the vertices whose values the named
+        vertex index files under index_value.
+
+        """
+        return self._indexes[name].find(index_value)
+
+    def find_edges(self, name, index_value):
+        """Return the set of keys of the edges whose values the named edge
+        index files under index_value.
+
+        """
+        return self._indexes[name].find(index_value)
+
+    def k_hop(self, vertex_key, k, direction='out'):
+        """Return the frozenset of the vertex keys within k hops of the
+        specified vertex key, including itself, following edges forward
+        (direction 'out'), backward ('in') or either way ('both').
+        Results are cached; adding or removing an edge drops only the
+        cached results it may change.  The cache is not carried over by
+        copy.
+
+        """
+        if self._k_hop_cache is None:
+            from graphs.khop import KHopCache
+            self._k_hop_cache = KHopCache(self)
+        return self._k_hop_cache.get(vertex_key, k, direction)
+
+    def reachability_index(self):
+        """Return a ReachabilityIndex of the graph, which answers whether one
+        vertex reaches another, and which vertices one reaches, without
+        traversing the graph, and follows changes to the graph.  The
+        index is made by the first call and returned by later ones, so
+        the graph has one subscribed index however often this is
+        called; once the index is closed, the next call makes a new one.
+
+        """
+        index = self._reachability_index
+        if index is None or not index._following:
+            from graphs.reachability import ReachabilityIndex
+            index = self._reachability_index = ReachabilityIndex(self)
+        return index
+
+    def track_components(self):
+        """Maintain an index of the connected components of the graph,
+        ignoring direction, so that same_component and component_of
+        take near-constant time.  The index is kept up to date as
+        vertices and edges are added.  Removing the last edge between
+        two vertices makes it rebuild on the next query, unless a short
+        search finds them still connected by another path.
+
+        """
+        if self._components is None:
+            self._components = UnionFind()
+            self._components_stale = True
+
+    def _connected_nearby(self, vertex_key1, vertex_key2, limit=64):
+        # whether searches from the two vertices, ignoring direction and
+        # taking turns, meet before either reaches limit vertices; a
+        # search that runs out has found the component split
+        seen = (set([vertex_key1]), set([vertex_key2]))
+        frontiers = (deque([vertex_key1]), deque([vertex_key2]))
+        while True:
+            for side in (0, 1):
+                other = seen[1 - side]
+                for w in self._neighbors[frontiers[side].popleft()]:
+                    if w in other:
+                        return True
+                    if w not in seen[side]:
+                        seen[side].add(w)
+                        frontiers[side].append(w)
+                if not frontiers[side] or len(seen[side]) > limit:
+                    return False
+
+    def _component_index(self):
+        if self._components is None:
+            raise Exception("Components are not tracked; call track_components first")
+        if self._components_stale:
+            self._components.clear()
+            for key in self._vertices:
+                self._components.add(key)
+            for key in self._edges:
+                self._components.union(self._sources[key], self._targets[key])
+            self._components_stale = False
+        return self._components
+
+    def same_component(self, vertex_key1, vertex_key2):
+        """Return True if the two vertex keys are connected, ignoring
+        direction.  The graph must be tracking components.
+
+        """
+        if vertex_key1 not in self._vertices or vertex_key2 not in self._vertices:
+            raise KeyError
+        return self._component_index().same(vertex_key1, vertex_key2)
+
+    def component_of(self, vertex_key):
+        """Return the key of a vertex representing the connected component,
+        ignoring direction, containing the specified vertex key.  The
+        graph must be tracking components.
+
+        """
+        if vertex_key not in self._vertices:
+            raise KeyError
+        return self._component_index().find(vertex_key)
+
+    def num_components(self):
+        """Return the number of connected components, ignoring direction.
+        The graph must be tracking components.
+
+        """
+        return self._component_index().num_sets()
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot of the graph, with the
+        adjacency stored as compressed-sparse-row integer arrays for
+        fast repeated traversal.
+
+        """
+        from graphs.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def subgraph(self, vertex_keys):
+        """Return a read-only view of the part of the graph induced by the
+        vertex keys, without copying it.
+
+        """
+        return GraphView(self, vertex_keys)
+
+    def filtered(self, vertex_pred=None, edge_pred=None):
+        """Return a read-only view of the vertices and edges of the graph
+        satisfying the predicates, which are called with a vertex key or
+        an edge key, without copying it.
+
+        """
+        return GraphView(self, None, vertex_pred, edge_pred)
+
+    def save(self, path):
+        """Write the graph to a file in the compact binary format of
+        CSRGraph.save.  Keys and values must be picklable.
+
+        """
+        self.freeze().save(path)
+
+    @staticmethod
+    def load(path, mmap=True):
+        """Open a graph written by save as a read-only CSRGraph, memory-mapped
+        if mmap is true.  Use its to_graph method for a mutable copy.
+
+        """
+        from graphs.csr import CSRGraph
+        return CSRGraph.load(path, mmap)
+
     def __str__(self):
         return "<Graph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
 
@@ -291,8 +822,123 @@ vertex key
         vertices, edges = tst
         for vertex_key, vertex_value in vertices:
             self.add_vertex(vertex_key, vertex_value)
-        for edge_key, source_vertex_key, target_vertex_key, edge_value in edges:
-            self.add_edge(edge_key, source_vertex_key, target_vertex_key, edge_value)
+        self.add_edges_from(edges)
+
+    def add_edges_from(self, edges):
+        """Add edges from an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key) or (edge_key, source_vertex_key,
+        target_vertex_key, edge_value), with the same effect as calling
+        add_edge for each, but without its per-edge overhead.
+
+        """
+        if (self._components is not None or self._shared or self._owned_vertices is not None
+            or self._journal is not None or self._subscribers or self._indexes):
+            # indexes, subscribers and adjacency shared with a copy need
+            # the bookkeeping add_edge does
+            for edge in edges:
+                self.add_edge(*edge)
+            return
+        # the loop allocates only acyclic containers, so suspend the cyclic
+        # garbage collector rather than have it rescan the growing graph
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._add_edges_from(edges)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _add_edges_from(self, edges):
+        vertices = self._vertices
+        edge_values = self._edges
+        sources = self._sources
+        targets = self._targets
+        outgoing = self._outgoing_edges
+        incoming = self._incoming_edges
+        neighbors = self._neighbors
+        connections = self._connections
+        # the vertices and edges added, each a change that add_edge would
+        # have recorded
+        changes = 0
+        try:
+            for edge in edges:
+                if len(edge) == 4:
+                    key, source_key, target_key, value = edge
+                else:
+                    key, source_key, target_key = edge
+                    value = None
+                if key in edge_values:
+                    self.add_edge(key, source_key, target_key, value)
+                    continue
+                changes += 1
+                if source_key not in vertices:
+                    changes += 1
+                    vertices[source_key] = None
+                    outgoing[source_key] = set()
+                    incoming[source_key] = set()
+                    neighbors[source_key] = set()
+                if target_key not in vertices:
+                    changes += 1
+                    vertices[target_key] = None
+                    outgoing[target_key] = set()
+                    incoming[target_key] = set()
+                    neighbors[target_key] = set()
+                edge_values[key] = value
+                sources[key] = source_key
+                targets[key] = target_key
+                outgoing[source_key].add(key)
+                incoming[target_key].add(key)
+                pair = (source_key, target_key)
+                if pair in connections:
+                    connections[pair].add(key)
+                else:
+                    connections[pair] = {key}
+                    neighbors[source_key].add(target_key)
+                    neighbors[target_key].add(source_key)
+        finally:
+            self._version += changes
+
+    def read_edgelist(self, path_or_file, fmt='csv', chunk_size=100000):
+        """Add the edges of an edge list file, in fmt 'csv', 'tsv' or
+        'jsonl', to the graph, chunk_size edges at a time, and return the
+        number of edges read.  See graphs.edgelist for the formats.
+
+        """
+        return edgelist.read_edgelist(self, path_or_file, fmt, chunk_size)
+
+    def write_edgelist(self, path_or_file, fmt='csv'):
+        """Write the edges of the graph to an edge list file in fmt 'csv',
+        'tsv' or 'jsonl', streaming them rather than building sets as
+        to_tuple_set_tuple does.
+
+        """
+        edgelist.write_edgelist(self, path_or_file, fmt)
+
+    @classmethod
+    def from_arrays(cls, sources, targets, keys=None, values=None):
+        """Return a new graph with an edge from sources[i] to targets[i] for
+        each i, having key keys[i] (default: i) and value values[i]
+        (default: None).  The sequences may be lists or NumPy arrays.
+
+        """
+        def as_list(seq):
+            return seq.tolist() if hasattr(seq, 'tolist') else seq
+        sources = as_list(sources)
+        targets = as_list(targets)
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets differ in length")
+        keys = range(len(sources)) if keys is None else as_list(keys)
+        if len(keys) != len(sources):
+            raise ValueError("keys and sources differ in length")
+        if values is None:
+            values = repeat(None)
+        else:
+            values = as_list(values)
+            if len(values) != len(sources):
+                raise ValueError("values and sources differ in length")
+        result = cls()
+        result.add_edges_from(zip(keys, sources, targets, values))
+        return result
     
     def to_tuple_set_tuple(self):
         """Return data of the graph, in the form (vertices, edges), where
@@ -303,97 +949,96 @@ vertex key
         """
         return ({t for t in self.iter_vertex_value_tuple()}, {t for t in self.iter_edge_source_target_value_tuple()})
 
-    # basic operations for various graph traversal algorithms
-    # from http://www.cs.cornell.edu/courses/cs2112/2012sp/lectures/lec24/lec24-12sp.html
-    
-    def _tricolor_init(self, *roots):
-        self._aux['black'] = set()
-        self._aux['gray'] = {x for x in roots}
+    # graph traversals; the visited vertices are tracked per call, so
+    # traversals may be interleaved or run from several threads at once
+
+    def instrument(self, callback, trace_memory=False):
+        """Call callback(stats) with a TraversalStats after each traversal of
+        the graph ends or is abandoned, or stop if callback is None.
+        If trace_memory, the memory allocated is measured as well, which
+        slows traversals down.  Instrumentation is not carried over by
+        copy.
 
-    def _tricolor_is_white(self, vertex):
-        return vertex not in self._aux['black'] and vertex not in self._aux['gray']
+        """
+        self._traversal_callback = callback
+        self._trace_memory = trace_memory
 
-    def _tricolor_make_gray(self, vertex):
-        assert vertex not in self._aux['black']
-        self._aux['gray'].add(vertex)
+    def _num_incident_edges(self, vertex_key):
+        # the edges an undirected traversal scans at the vertex
+        return (len(self._outgoing_edges[vertex_key]) + len(self._incoming_edges[vertex_key])
+                - len(self._connections.get((vertex_key, vertex_key), ())))
 
-    def _tricolor_make_black(self, vertex):
-        self._aux['black'].add(vertex)
-        self._aux['gray'].remove(vertex)
-        
-    def _tricolor_make_gray_neighbors(self, vertex, op=None):
-        for n in self.iter_neighbors(vertex):
-            if self._tricolor_is_white(n):
-                self._tricolor_make_gray(n)
-                if op is not None:
-                    op(n)                
-
-    def _tricolor_make_gray_targets(self, vertex, op=None):
-        for e in self.iter_outgoing_edges(vertex):
-            n = self.get_target(e)
-            if self._tricolor_is_white(n):
-                self._tricolor_make_gray(n)
-                if op is not None:
-                    op(n)
-
-    def bfs_undirected(self, *start_vertices):
+    def _traverse(self, search, successors, algorithm, start_vertices, max_depth, stats,
+                  num_edges=None):
+        callback = self._traversal_callback
+        if stats is None and callback is not None:
+            stats = traversal.TraversalStats(algorithm, self._trace_memory)
+        return traversal.traverse(search, successors, start_vertices, max_depth, stats, algorithm,
+                                  callback, num_edges)
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
         """Generate vertices connected to one or more of the start vertices
-        in breadth-first order, ignoring direction.
+        in breadth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
 
         """
-        frontier = deque()  
-        for v in start_vertices:
-            frontier.append(v)
-        self._tricolor_init(*start_vertices)
-        while frontier:
-            v = frontier.popleft()
-            self._tricolor_make_black(v)
-            yield v
-            self._tricolor_make_gray_neighbors(v, frontier.append)
+        return self._traverse(traversal.bfs, self._neighbors.__getitem__, 'bfs_undirected',
+                              start_vertices, max_depth, stats, self._num_incident_edges)
 
-    def bfs_directed(self, *start_vertices):
+    def bfs_directed(self, *start_vertices, max_depth=None, stats=None):
         """Generate vertices that are in directed paths starting with one or
         more of the start vertices in breadth-first order, following
-        direction.
-
-        """        
-        frontier = deque()  
-        for v in start_vertices:
-            frontier.append(v)
-        self._tricolor_init(*start_vertices)
-        while frontier:
-            v = frontier.popleft()
-            self._tricolor_make_black(v)
-            yield v
-            self._tricolor_make_gray_targets(v, frontier.append) 
-            
-    def dfs_undirected(self, *start_vertices):
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._traverse(traversal.bfs, self.iter_target_vertices, 'bfs_directed',
+                              start_vertices, max_depth, stats)
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
         """Generate vertices connected to one or more of the start vertices
-        in depth-first order, ignoring direction.
+        in depth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
 
         """
-        frontier = list()  
-        for v in start_vertices:
-            frontier.append(v)
-        self._tricolor_init(*start_vertices)
-        while frontier:
-            v = frontier.pop()
-            self._tricolor_make_black(v)
-            yield v
-            self._tricolor_make_gray_neighbors(v, frontier.append)
+        return self._traverse(traversal.dfs, self._neighbors.__getitem__, 'dfs_undirected',
+                              start_vertices, max_depth, stats, self._num_incident_edges)
 
-    def dfs_directed(self, *start_vertices):
+    def dfs_directed(self, *start_vertices, max_depth=None, stats=None):
         """Generate vertices that are in directed paths starting with one or
         more of the start vertices in depth-first order, following
-        direction.
-
-        """        
-        frontier = list()  
-        for v in start_vertices:
-            frontier.append(v)
-            self._tricolor_init(*start_vertices)
-        while frontier:
-            v = frontier.pop()
-            self._tricolor_make_black(v)
-            yield v
-            self._tricolor_make_gray_targets(v, frontier.append) 
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return self._traverse(traversal.dfs, self.iter_target_vertices, 'dfs_directed',
+                              start_vertices, max_depth, stats)
+
+    def strongly_connected_components(self):
+        """Generate the strongly connected components of the graph as sets of
+        vertex keys, each after every component reachable from it.
+
+        """
+        return dag.strongly_connected_components(self)
+
+    def topological_sort(self):
+        """Return a list of the vertex keys in which the source of every edge
+        comes before its target.  An exception is raised if the graph
+        has a cycle.
+
+        """
+        return dag.topological_sort(self)
+
+    def find_cycle(self, *start_vertices):
+        """Return the list of edge keys of a directed cycle, or None if there
+        is none.  If start vertices are specified, only cycles reachable
+        from them are looked for.
+
+        """
+        return dag.find_cycle(self, *start_vertices)
@@ -0,0 +1,44 @@
+class ValueIndex:
+    """
+    ValueIndex(key_fn) -> new empty index of keys by key_fn(value)
+
+    A secondary index of graph vertices or edges: each vertex or edge
+    key is filed under key_fn of its value, unless that is None.
+    """
+    def __init__(self, key_fn):
+        self.key_fn = key_fn
+        self._buckets = dict() #key_fn(value) -> {key}
+
+    def add(self, key, value):
+        """File the key under key_fn(value)"""
+        index_value = self.key_fn(value)
+        if index_value is not None:
+            if index_value in self._buckets:
+                self._buckets[index_value].add(key)
+            else:
+                self._buckets[index_value] = {key}
+
+    def remove(self, key, value):
+        """Remove the key, which was filed with the specified value"""
+        index_value = self.key_fn(value)
+        if index_value is not None:
+            bucket = self._buckets[index_value]
+            bucket.remove(key)
+            if not bucket:
+                del self._buckets[index_value]
+
+    def find(self, index_value):
+        """Return the set of keys filed under the index value"""
+        return set(self._buckets.get(index_value, ()))
+
+    def count(self, index_value):
+        """Return the number of keys filed under the index value"""
+        return len(self._buckets.get(index_value, ()))
+
+    def iter_index_values(self):
+        """Generate the index values having keys filed under them"""
+        return iter(self._buckets)
+
+    def clear(self):
+        """Remove all keys"""
+        self._buckets.clear()
@@ -0,0 +1,196 @@
+from collections import Counter
+
+# Finding the embeddings of a small pattern graph in a host graph, by
+# extending a partial mapping one pattern vertex at a time as in VF2.
+# The pattern vertices are ordered so that each comes, where possible,
+# after one of its neighbors: its candidates are then only the host
+# vertices adjacent to the images of its earlier neighbors, rather than
+# every host vertex.  Candidates are pruned by label, by degree, and by the edges
+# to the pattern vertices already mapped.
+
+
+def _order(pattern):
+    """Return the list of the pattern vertex keys in matching order: each
+    component starts with its vertex of greatest degree, and then takes
+    the vertex with the most neighbors already ordered.
+
+    """
+    order = []
+    placed = set()
+    links = dict() #unplaced vertex key -> number of placed neighbors
+    remaining = set(pattern.iter_vertices())
+    while remaining:
+        if links:
+            v = max(links, key=lambda v: (links[v], pattern.degree(v)))
+            del links[v]
+        else:
+            v = max(remaining, key=pattern.degree)
+        remaining.discard(v)
+        placed.add(v)
+        order.append(v)
+        for w in pattern.iter_neighbors(v):
+            if w not in placed:
+                links[w] = links.get(w, 0) + 1
+    return order
+
+
+def _labels(graph, edge_keys, edge_label):
+    if edge_label is None:
+        return Counter({None: len(edge_keys)})
+    return Counter(edge_label(graph.get_edge(e)) for e in edge_keys)
+
+
+class _Step:
+    # what must hold of the host vertex a pattern vertex maps to
+    def __init__(self, pattern, v, earlier, vertex_label, edge_label):
+        self.vertex = v
+        self.label = None if vertex_label is None else vertex_label(pattern.get_vertex(v))
+        self.outdegree = pattern.outdegree(v)
+        self.indegree = pattern.indegree(v)
+        self.degree = pattern.degree(v)
+        self.loops = None
+        if pattern.is_adjacent(v, v):
+            self.loops = _labels(pattern, list(pattern.iter_connections(v, v)), edge_label)
+        # (earlier vertex key, edge labels to it, edge labels from it);
+        # the labels are None where there are no edges
+        self.links = []
+        self.unlinked = [] #earlier vertex keys not adjacent to v either way
+        for w in earlier:
+            forward = backward = None
+            if pattern.is_adjacent(v, w):
+                forward = _labels(pattern, list(pattern.iter_connections(v, w)), edge_label)
+            if pattern.is_adjacent(w, v):
+                backward = _labels(pattern, list(pattern.iter_connections(w, v)), edge_label)
+            if forward is None and backward is None:
+                self.unlinked.append(w)
+            else:
+                self.links.append((w, forward, backward))
+
+
+class _Matcher:
+    def __init__(self, host, pattern, vertex_label, edge_label, induced):
+        self.host = host
+        self.vertex_label = vertex_label
+        self.edge_label = edge_label
+        self.induced = induced
+        order = _order(pattern)
+        self.steps = [_Step(pattern, v, order[:i], vertex_label, edge_label)
+                      for i, v in enumerate(order)]
+        self.host_labels = dict() #host vertex key -> label, as computed
+        self.by_label = None #label -> [host vertex key], once needed
+        self.mapping = dict() #pattern vertex key -> host vertex key
+        self.used = set() #host vertex keys mapped to
+
+    def host_label(self, h):
+        label = self.host_labels.get(h, self)
+        if label is self:
+            label = self.host_labels[h] = self.vertex_label(self.host.get_vertex(h))
+        return label
+
+    def candidates(self, step):
+        if step.links:
+            # the host vertices adjacent to the images of all the earlier
+            # neighbors, in the right directions
+            result = None
+            for w, forward, backward in step.links:
+                image = self.mapping[w]
+                if forward is not None:
+                    adjacent = set(self.host.iter_source_vertices(image))
+                    if backward is not None:
+                        adjacent.intersection_update(self.host.iter_target_vertices(image))
+                else:
+                    adjacent = set(self.host.iter_target_vertices(image))
+                result = adjacent if result is None else result & adjacent
+                if not result:
+                    break
+            return result
+        if self.vertex_label is None:
+            return self.host.iter_vertices()
+        if self.by_label is None:
+            self.by_label = dict()
+            for h in self.host.iter_vertices():
+                self.by_label.setdefault(self.host_label(h), []).append(h)
+        return self.by_label.get(step.label, ())
+
+    def covers(self, source, target, labels):
+        """Return True if the host edges from source to target include
+        edges with the labels, counted with multiplicity.
+
+        """
+        host = self.host
+        if not host.is_adjacent(source, target):
+            return False
+        if self.edge_label is None:
+            return labels[None] == 1 or host.num_connections(source, target) >= labels[None]
+        found = _labels(host, list(host.iter_connections(source, target)), self.edge_label)
+        return all(found[label] >= count for label, count in labels.items())
+
+    def feasible(self, step, h):
+        host = self.host
+        if h in self.used:
+            return False
+        if self.vertex_label is not None and self.host_label(h) != step.label:
+            return False
+        if (host.outdegree(h) < step.outdegree or host.indegree(h) < step.indegree
+                or host.degree(h) < step.degree):
+            return False
+        if step.loops is not None:
+            if not self.covers(h, h, step.loops):
+                return False
+        elif self.induced and host.is_adjacent(h, h):
+            return False
+        for w, forward, backward in step.links:
+            image = self.mapping[w]
+            if forward is not None:
+                if not self.covers(h, image, forward):
+                    return False
+            elif self.induced and host.is_adjacent(h, image):
+                return False
+            if backward is not None:
+                if not self.covers(image, h, backward):
+                    return False
+            elif self.induced and host.is_adjacent(image, h):
+                return False
+        if self.induced:
+            for w in step.unlinked:
+                image = self.mapping[w]
+                if host.is_adjacent(h, image) or host.is_adjacent(image, h):
+                    return False
+        return True
+
+    def matches(self, i):
+        if i == len(self.steps):
+            yield dict(self.mapping)
+            return
+        step = self.steps[i]
+        for h in self.candidates(step):
+            if self.feasible(step, h):
+                self.mapping[step.vertex] = h
+                self.used.add(h)
+                yield from self.matches(i + 1)
+                del self.mapping[step.vertex]
+                self.used.discard(h)
+
+
+def subgraph_matches(host, pattern, vertex_label=None, edge_label=None, induced=False):
+    """Generate the embeddings of the pattern graph in the host graph, as
+    dicts mapping each pattern vertex key to a distinct host vertex
+    key, such that for every pattern edge there is a host edge between
+    the images of its ends in the same direction, each host edge
+    standing for at most one pattern edge.  If vertex_label or
+    edge_label is specified, the labels vertex_label(value) or
+    edge_label(value) of the pattern vertices or edges must equal
+    those of the host vertices or edges they map to.  If induced,
+    host vertices whose pattern vertices are not adjacent must not be
+    adjacent either.  Matches are found as they are generated.
+
+    """
+    return _Matcher(host, pattern, vertex_label, edge_label, induced).matches(0)
+
+
+def find_subgraph(host, pattern, vertex_label=None, edge_label=None, induced=False):
+    """Return the first embedding generated by subgraph_matches, or None
+    if there is none.
+
+    """
+    return next(subgraph_matches(host, pattern, vertex_label, edge_label, induced), None)
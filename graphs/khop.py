@@ -0,0 +1,117 @@
+from collections import OrderedDict
+
+DIRECTIONS = ('out', 'in', 'both')
+
+
+class KHopCache:
+    """
+    KHopCache(graph, maxsize=1024) -> new least-recently-used cache of the
+    sets of vertices within k hops of a vertex
+
+    If the graph has a subscribe method, as Graph does, the cache
+    follows its changes.  Each entry is filed under the vertices from
+    which its traversal went on, those less than k hops away, so that
+    adding or removing an edge drops only the entries whose traversal
+    went on from one of its ends.
+    """
+    def __init__(self, graph, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self._graph = graph
+        self._maxsize = maxsize
+        self._entries = OrderedDict() #(vertex_key, k, direction) -> (frozenset, [watch key])
+        self._watchers = dict() #(direction, vertex_key) -> {(vertex_key, k, direction)}
+        self.hits = 0
+        self.misses = 0
+        if hasattr(graph, 'subscribe'):
+            graph.subscribe(self._changed)
+
+    def close(self):
+        """Stop following changes to the graph"""
+        if hasattr(self._graph, 'unsubscribe'):
+            self._graph.unsubscribe(self._changed)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Remove all entries"""
+        self._entries.clear()
+        self._watchers.clear()
+
+    def _discard(self, entry_key):
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            for watch_key in entry[1]:
+                watching = self._watchers[watch_key]
+                watching.discard(entry_key)
+                if not watching:
+                    del self._watchers[watch_key]
+
+    def _invalidate(self, watch_key):
+        for entry_key in list(self._watchers.get(watch_key, ())):
+            self._discard(entry_key)
+
+    def _changed(self, change):
+        operation = change.operation
+        if operation in ('add_edge', 'remove_edge'):
+            self._invalidate(('out', change.source))
+            self._invalidate(('in', change.target))
+            self._invalidate(('both', change.source))
+            self._invalidate(('both', change.target))
+        elif operation == 'remove_vertex':
+            for direction in DIRECTIONS:
+                self._invalidate((direction, change.key))
+        elif operation != 'add_vertex':
+            self.clear()
+
+    def get(self, vertex_key, k, direction='out'):
+        """Return the frozenset of the vertex keys within k hops of the
+        specified vertex key, including itself, following edges forward
+        (direction 'out'), backward ('in') or either way ('both').
+
+        """
+        entry_key = (vertex_key, k, direction)
+        entry = self._entries.get(entry_key)
+        if entry is not None:
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return entry[0]
+        if direction not in DIRECTIONS:
+            raise ValueError("direction must be 'out', 'in' or 'both'")
+        if k < 0:
+            raise ValueError("k must not be negative")
+        graph = self._graph
+        if not graph.is_vertex(vertex_key):
+            raise KeyError(vertex_key)
+        self.misses += 1
+        if direction == 'out':
+            successors = graph.iter_target_vertices
+        elif direction == 'in':
+            successors = graph.iter_source_vertices
+        else:
+            successors = graph.iter_neighbors
+        # a breadth-first search, level by level; the traversal goes on
+        # from the vertices before the last level
+        visited = {vertex_key}
+        level = [vertex_key]
+        watch_keys = [(direction, vertex_key)]
+        for depth in range(k):
+            next_level = []
+            for v in level:
+                for n in successors(v):
+                    if n not in visited:
+                        visited.add(n)
+                        next_level.append(n)
+            if not next_level:
+                break
+            level = next_level
+            if depth + 1 < k:
+                watch_keys.extend((direction, v) for v in level)
+        result = frozenset(visited)
+        for watch_key in watch_keys:
+            self._watchers.setdefault(watch_key, set()).add(entry_key)
+        self._entries[entry_key] = (result, watch_keys)
+        if len(self._entries) > self._maxsize:
+            self._discard(next(iter(self._entries)))
+        return result
@@ -0,0 +1,155 @@
+import multiprocessing
+import os
+from array import array
+from multiprocessing import shared_memory
+from operator import add
+
+from graphs.csr import CSRGraph
+
+# Algorithms that run a breadth-first search from every vertex, fanned
+# out over a pool of processes.  The outgoing CSR arrays are copied once
+# into a shared memory block that the workers map, instead of each
+# worker unpickling the graph.
+
+_offsets = None #outgoing CSR offsets, in each worker
+_targets = None #outgoing CSR target vertex ids, in each worker
+_memory = None #the SharedMemory block holding them, in each worker
+
+
+def _attach(name, n, m):
+    # pool initializer: map the adjacency arrays from shared memory
+    global _offsets, _targets, _memory
+    _memory = shared_memory.SharedMemory(name)
+    _offsets = _memory.buf[:8 * (n + 1)].cast('q')
+    _targets = _memory.buf[8 * (n + 1):8 * (n + 1 + m)].cast('q')
+
+
+def _distances(s, offsets, targets, n):
+    """Return (distances, order, sigma) for a breadth-first search from the
+    vertex id s, where distances[v] is -1 for unreachable v, order
+    lists the reached ids by distance and sigma[v] counts the shortest
+    paths to v.
+
+    """
+    distances = [-1] * n
+    sigma = [0] * n
+    distances[s] = 0
+    sigma[s] = 1
+    order = [s]
+    i = 0
+    while i < len(order):
+        v = order[i]
+        i += 1
+        d = distances[v] + 1
+        for w in targets[offsets[v]:offsets[v + 1]]:
+            if distances[w] < 0:
+                distances[w] = d
+                order.append(w)
+            if distances[w] == d:
+                sigma[w] += sigma[v]
+    return distances, order, sigma
+
+
+def _betweenness(sources, offsets, targets, n):
+    # Brandes' dependency accumulation from each source, walking the
+    # shortest-path DAG through successors so no predecessor lists are kept
+    result = [0.0] * n
+    for s in sources:
+        distances, order, sigma = _distances(s, offsets, targets, n)
+        delta = [0.0] * n
+        for v in reversed(order):
+            d = distances[v] + 1
+            for w in targets[offsets[v]:offsets[v + 1]]:
+                if distances[w] == d:
+                    delta[v] += sigma[v] / sigma[w] * (1.0 + delta[w])
+            if v != s:
+                result[v] += delta[v]
+    return result
+
+
+def _all_distances(sources, offsets, targets, n):
+    return [(s, array('q', _distances(s, offsets, targets, n)[0])) for s in sources]
+
+
+def _betweenness_worker(sources):
+    return _betweenness(sources, _offsets, _targets, len(_offsets) - 1)
+
+
+def _all_distances_worker(sources):
+    return _all_distances(sources, _offsets, _targets, len(_offsets) - 1)
+
+
+def _map_sources(frozen, serial, worker, processes):
+    """Return the list of results of running a function over chunks of the
+    vertex ids, serially in this process if processes is 1, else in a
+    pool of processes sharing the adjacency.
+
+    """
+    n = frozen.num_vertices()
+    m = frozen.num_edges()
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = max(1, min(processes, n))
+    if processes == 1:
+        return [serial(range(n), frozen._out_offsets, frozen._out_targets, n)]
+    step = max(1, n // (4 * processes))
+    chunks = [range(i, min(i + step, n)) for i in range(0, n, step)]
+    memory = shared_memory.SharedMemory(create=True, size=8 * (n + 1 + m))
+    try:
+        memory.buf[:8 * (n + 1)] = array('q', frozen._out_offsets).tobytes()
+        memory.buf[8 * (n + 1):8 * (n + 1 + m)] = array('q', frozen._out_targets).tobytes()
+        with multiprocessing.Pool(processes, _attach, (memory.name, n, m)) as pool:
+            return pool.map(worker, chunks)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _frozen(graph):
+    if isinstance(graph, CSRGraph):
+        return graph
+    return CSRGraph.from_graph(graph)
+
+
+def betweenness_centrality(graph, normalized=True, processes=None):
+    """Return a dict of the betweenness centrality of each vertex key, the
+    sum over pairs of other vertices of the fraction of shortest
+    directed paths between them passing through the vertex, using
+    Brandes' algorithm.  Parallel edges count as distinct paths.  If
+    normalized, the sums are divided by the number of ordered pairs of
+    other vertices.  The sources are divided among processes worker
+    processes (default: one per CPU); with processes=1 everything runs
+    in this process.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    if n == 0:
+        return dict()
+    partials = _map_sources(frozen, _betweenness, _betweenness_worker, processes)
+    result = partials[0]
+    for partial in partials[1:]:
+        result = list(map(add, result, partial))
+    if normalized and n > 2:
+        scale = 1.0 / ((n - 1) * (n - 2))
+        result = [value * scale for value in result]
+    return dict(zip(frozen.iter_vertices(), result))
+
+
+def all_pairs_distances(graph, processes=None):
+    """Return a dict mapping each vertex key to a dict mapping each vertex
+    key reachable from it to the number of edges on a shortest
+    directed path.  The sources are divided among processes as for
+    betweenness_centrality.
+
+    """
+    frozen = _frozen(graph)
+    n = frozen.num_vertices()
+    if n == 0:
+        return dict()
+    keys = list(frozen.iter_vertices())
+    result = dict()
+    for chunk in _map_sources(frozen, _all_distances, _all_distances_worker, processes):
+        for s, distances in chunk:
+            result[keys[s]] = {keys[t]: d for t, d in enumerate(distances) if d >= 0}
+    return result
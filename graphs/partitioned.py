@@ -0,0 +1,384 @@
+import multiprocessing
+import os
+from array import array
+
+# A graph whose vertices are divided among worker processes, each
+# holding the adjacency of its own shard.  Vertices are numbered so that
+# the owner of a vertex id is computed from the id alone: with hash
+# partitioning, partition p owns the ids p, p + n, p + 2n, ...; with
+# range partitioning, it owns a block of consecutive ids.  Traversals are
+# level-synchronous: in each round this process sends every worker the
+# batch of vertex ids sent to its shard, and each worker answers with
+# the batches its shard sends to every shard, which are routed in the
+# next round.
+
+_GAP = object() #the key of an unused vertex id
+
+
+class _Shard:
+    # the part of the graph a worker holds, and the traversal state
+    def __init__(self, partition, num_partitions, scheme, block, targets, neighbors):
+        self.partition = partition
+        self.num_partitions = num_partitions
+        self.scheme = scheme
+        self.block = block
+        self.targets = targets #local index -> array of target vertex ids
+        self.neighbors = neighbors #local index -> array of adjacent vertex ids
+        self.adjacency = targets
+        self.visited = None
+        self.labels = None
+
+    def local(self, vertex_id):
+        if self.scheme == 'hash':
+            return vertex_id // self.num_partitions
+        return vertex_id - self.partition * self.block
+
+    def global_id(self, local):
+        if self.scheme == 'hash':
+            return local * self.num_partitions + self.partition
+        return local + self.partition * self.block
+
+    def owner(self, vertex_id):
+        if self.scheme == 'hash':
+            return vertex_id % self.num_partitions
+        return vertex_id // self.block
+
+    def start_search(self, directed):
+        self.adjacency = self.targets if directed else self.neighbors
+        self.visited = bytearray(len(self.targets))
+
+    def search_level(self, vertex_ids, expand):
+        """Mark the unvisited vertex ids, and return (the array of them, the
+        list of arrays of their successors for each partition).
+
+        """
+        visited = self.visited
+        reached = array('q')
+        for v in vertex_ids:
+            i = self.local(v)
+            if not visited[i]:
+                visited[i] = 1
+                reached.append(v)
+        batches = [array('q') for p in range(self.num_partitions)]
+        if expand:
+            seen = set()
+            for v in reached:
+                for w in self.adjacency[self.local(v)]:
+                    if w not in seen:
+                        seen.add(w)
+                        batches[self.owner(w)].append(w)
+        return reached, batches
+
+    def _send_labels(self, local_ids):
+        # the smallest label sent to each vertex, batched by partition
+        best = dict()
+        labels = self.labels
+        for i in local_ids:
+            label = labels[i]
+            for w in self.neighbors[i]:
+                if best.get(w, label + 1) > label:
+                    best[w] = label
+        batches = [(array('q'), array('q')) for p in range(self.num_partitions)]
+        for w, label in best.items():
+            ids, values = batches[self.owner(w)]
+            ids.append(w)
+            values.append(label)
+        return batches
+
+    def start_labels(self):
+        self.labels = array('q', map(self.global_id, range(len(self.neighbors))))
+        return self._send_labels(range(len(self.neighbors)))
+
+    def label_round(self, messages):
+        """Lower the labels of the vertices to the smallest labels sent to
+        them, and return the batches of the changed labels to send on.
+
+        """
+        labels = self.labels
+        changed = set()
+        for ids, values in messages:
+            for v, label in zip(ids, values):
+                i = self.local(v)
+                if label < labels[i]:
+                    labels[i] = label
+                    changed.add(i)
+        return self._send_labels(changed)
+
+    def get_labels(self):
+        return array('q', map(self.global_id, range(len(self.labels)))), self.labels
+
+
+def _work(connection, shard):
+    # the worker loop: run each command on the shard and send the result
+    while True:
+        command, args = connection.recv()
+        if command == 'stop':
+            connection.close()
+            return
+        connection.send(getattr(shard, command)(*args))
+
+
+def _check_partitions(num_partitions, scheme):
+    """Return the number of partitions, os.cpu_count() if None"""
+    if scheme not in ('hash', 'range'):
+        raise ValueError("scheme must be 'hash' or 'range'")
+    if num_partitions is None:
+        num_partitions = os.cpu_count() or 1
+    if num_partitions < 1:
+        raise ValueError("num_partitions must be positive")
+    return num_partitions
+
+
+class PartitionedGraph:
+    """
+    PartitionedGraph(graph, num_partitions=None, scheme='hash') -> new
+    read-only copy of the graph's structure spread over num_partitions
+    worker processes (default: one per CPU)
+
+    Vertices are assigned to partitions by hashing their keys (scheme
+    'hash') or in blocks in the graph's vertex order (scheme 'range').
+    Values are not copied.  Only one traversal runs at a time; call
+    close, or use the graph in a with statement, to stop the workers.
+    PartitionedGraph.from_edges builds one from a stream of edges.
+    """
+    def __init__(self, graph, num_partitions=None, scheme='hash'):
+        num_partitions = _check_partitions(num_partitions, scheme)
+        keys = list(graph.iter_vertices())
+        block = max(1, -(-len(keys) // num_partitions))
+        if scheme == 'hash':
+            shards = [[] for p in range(num_partitions)]
+            for key in keys:
+                shards[hash(key) % num_partitions].append(key)
+            # partition p's i-th vertex gets id i * num_partitions + p;
+            # the ids of short partitions leave gaps
+            size = max(map(len, shards))
+            self._keys = [_GAP] * (size * num_partitions) #vertex id -> vertex key
+            for p, shard in enumerate(shards):
+                self._keys[p::num_partitions] = shard + [_GAP] * (size - len(shard))
+        else:
+            self._keys = keys
+        self._ids = {key: i for i, key in enumerate(self._keys) if key is not _GAP}
+        self._block = block
+        self._num_vertices = len(keys)
+        self._num_partitions = num_partitions
+        self._scheme = scheme
+        self._start(self._adjacency(graph))
+
+    def _adjacency(self, graph):
+        # generate each partition's (targets, neighbors), one at a time
+        ids = self._ids
+        for p in range(self._num_partitions):
+            if self._scheme == 'hash':
+                owned = self._keys[p::self._num_partitions]
+            else:
+                owned = self._keys[p * self._block:(p + 1) * self._block]
+            targets = []
+            neighbors = []
+            for key in owned:
+                if key is _GAP:
+                    targets.append(array('q'))
+                    neighbors.append(array('q'))
+                else:
+                    targets.append(array('q', {ids[w] for w in graph.iter_target_vertices(key)}))
+                    neighbors.append(array('q', {ids[w] for w in graph.iter_neighbors(key)}))
+            yield targets, neighbors
+
+    @classmethod
+    def from_edges(cls, edges, num_partitions=None, scheme='hash', vertices=()):
+        """Return a PartitionedGraph of the vertex keys in vertices and the
+        edges, an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key) or (edge_key, source_vertex_key,
+        target_vertex_key, edge_value) such as iter_edgelist generates.
+        The edges are read once, keeping only the vertex ids of their
+        ends in arrays for each partition, so no Graph is built.  With
+        scheme 'range', the vertices are in the order first seen.
+
+        """
+        num_partitions = _check_partitions(num_partitions, scheme)
+        self = cls.__new__(cls)
+        ids = dict() #vertex key -> vertex id
+        if scheme == 'hash':
+            counts = [0] * num_partitions #vertices in each partition
+            targets = [[] for p in range(num_partitions)] #partition -> local index -> array
+            neighbors = [[] for p in range(num_partitions)]
+        else:
+            targets = [] #vertex id -> array of target vertex ids, with repeats
+            neighbors = []
+
+        def vertex_id(key):
+            v = ids.get(key)
+            if v is None:
+                if scheme == 'hash':
+                    p = hash(key) % num_partitions
+                    v = counts[p] * num_partitions + p
+                    counts[p] += 1
+                    targets[p].append(array('q'))
+                    neighbors[p].append(array('q'))
+                else:
+                    v = len(ids)
+                    targets.append(array('q'))
+                    neighbors.append(array('q'))
+                ids[key] = v
+            return v
+
+        for key in vertices:
+            vertex_id(key)
+        for edge in edges:
+            s = vertex_id(edge[1])
+            t = vertex_id(edge[2])
+            if scheme == 'hash':
+                targets[s % num_partitions][s // num_partitions].append(t)
+                neighbors[s % num_partitions][s // num_partitions].append(t)
+                neighbors[t % num_partitions][t // num_partitions].append(s)
+            else:
+                targets[s].append(t)
+                neighbors[s].append(t)
+                neighbors[t].append(s)
+        n = len(ids)
+        self._block = max(1, -(-n // num_partitions))
+        if scheme == 'hash':
+            self._keys = [_GAP] * (max(counts) * num_partitions)
+            for key, v in ids.items():
+                self._keys[v] = key
+            shards = zip(targets, neighbors)
+        else:
+            self._keys = list(ids)
+            block = self._block
+            shards = ((targets[p * block:(p + 1) * block], neighbors[p * block:(p + 1) * block])
+                      for p in range(num_partitions))
+        self._ids = ids
+        self._num_vertices = n
+        self._num_partitions = num_partitions
+        self._scheme = scheme
+        # drop the repeats of parallel edges, one partition at a time
+        self._start(([array('q', set(a)) for a in shard_targets],
+                     [array('q', set(a)) for a in shard_neighbors])
+                    for shard_targets, shard_neighbors in shards)
+        return self
+
+    def _start(self, adjacency):
+        # start a worker for each partition's (targets, neighbors)
+        self._connections = []
+        self._processes = []
+        try:
+            for p, (targets, neighbors) in enumerate(adjacency):
+                shard = _Shard(p, self._num_partitions, self._scheme, self._block, targets, neighbors)
+                connection, worker_connection = multiprocessing.Pipe()
+                process = multiprocessing.Process(target=_work, args=(worker_connection, shard), daemon=True)
+                process.start()
+                worker_connection.close()
+                self._connections.append(connection)
+                self._processes.append(process)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Stop the worker processes"""
+        for connection in self._connections:
+            try:
+                connection.send(('stop', ()))
+                connection.close()
+            except OSError:
+                pass
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _call(self, command, per_partition_args):
+        """Run a command on every worker, and return the list of results"""
+        if not self._connections:
+            raise Exception("The PartitionedGraph is closed")
+        for connection, args in zip(self._connections, per_partition_args):
+            connection.send((command, args))
+        return [connection.recv() for connection in self._connections]
+
+    def _broadcast(self, command, *args):
+        return self._call(command, [args] * self._num_partitions)
+
+    def num_partitions(self):
+        """Return the number of partitions"""
+        return self._num_partitions
+
+    def num_vertices(self):
+        """Return the number of vertices"""
+        return self._num_vertices
+
+    def is_vertex(self, key):
+        """Return True if the specified vertex key is in the graph"""
+        return key in self._ids
+
+    def _owner(self, vertex_id):
+        if self._scheme == 'hash':
+            return vertex_id % self._num_partitions
+        return vertex_id // self._block
+
+    def partition_of(self, vertex_key):
+        """Return the number of the partition owning the specified vertex key"""
+        return self._owner(self._ids[vertex_key])
+
+    def _search(self, start_vertices, max_depth, directed):
+        frontier = [array('q') for p in range(self._num_partitions)]
+        for key in start_vertices:
+            v = self._ids[key]
+            frontier[self._owner(v)].append(v)
+        self._broadcast('start_search', directed)
+        depth = 0
+        while any(frontier):
+            expand = max_depth is None or depth < max_depth
+            results = self._call('search_level', [(batch, expand) for batch in frontier])
+            level = []
+            for reached, batches in results:
+                level.extend(reached)
+            # route every partition's batch for partition p to p
+            frontier = [array('q') for p in range(self._num_partitions)]
+            for reached, batches in results:
+                for p, batch in enumerate(batches):
+                    frontier[p].extend(batch)
+            for v in level:
+                yield self._keys[v]
+            depth += 1
+
+    def bfs_directed(self, *start_vertices, max_depth=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in breadth-first order, one level at
+        a time.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.
+
+        """
+        return self._search(start_vertices, max_depth, True)
+
+    def bfs_undirected(self, *start_vertices, max_depth=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order, one level at a time, ignoring direction.
+        If max_depth is specified, only vertices within max_depth steps
+        of the start vertices are generated.
+
+        """
+        return self._search(start_vertices, max_depth, False)
+
+    def connected_components(self):
+        """Return the list of the connected components of the graph,
+        ignoring direction, as sets of vertex keys.  Every vertex takes
+        the smallest id of its component by propagating labels, a round
+        per step of the largest distance to that id.
+
+        """
+        results = self._broadcast('start_labels')
+        while any(ids for batches in results for ids, values in batches):
+            messages = [[batches[p] for batches in results] for p in range(self._num_partitions)]
+            results = self._call('label_round', [(m,) for m in messages])
+        components = dict()
+        for ids, labels in self._broadcast('get_labels'):
+            for v, label in zip(ids, labels):
+                key = self._keys[v]
+                if key is not _GAP:
+                    components.setdefault(label, set()).add(key)
+        return list(components.values())
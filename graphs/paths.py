@@ -0,0 +1,188 @@
+from heapq import heappush, heappop
+from itertools import count
+
+
+def _weight_function(graph, weight):
+    """Return a function from edge key to edge weight: the edge value, or
+    weight(edge value) if weight is specified.
+
+    """
+    get_edge = graph.get_edge
+    if weight is None:
+        def edge_weight(edge_key):
+            w = get_edge(edge_key)
+            if w < 0:
+                raise ValueError("Edge %r has negative weight" % (edge_key,))
+            return w
+    else:
+        def edge_weight(edge_key):
+            w = weight(get_edge(edge_key))
+            if w < 0:
+                raise ValueError("Edge %r has negative weight" % (edge_key,))
+            return w
+    return edge_weight
+
+
+def iter_dijkstra(graph, source, weight=None, heuristic=None, target=None):
+    """Generate (vertex_key, distance, edge_key) triples in order of
+    increasing distance from the source vertex key, as each vertex is
+    settled.  The edge key is that of the last edge of a shortest path
+    to the vertex, or None for the source.  Edge weights are the edge
+    values, or weight(edge value) if weight is specified, and must not
+    be negative.
+
+    If heuristic is specified, it is called as heuristic(vertex_key)
+    and must be consistent: no greater than the weight of any edge
+    from the vertex plus the heuristic at its other end, and 0 at the
+    target vertex key.  This turns the search into A*.  A settled
+    vertex is never reopened, so a heuristic that is only a lower
+    bound on the distance to the target can give longer paths.  If
+    target is specified, the search ends after the target is settled.
+
+    """
+    edge_weight = _weight_function(graph, weight)
+    targets = graph.get_target
+    outgoing = graph.iter_outgoing_edges
+    tiebreak = count()
+    distances = {source: 0}
+    settled = set()
+    estimate = 0 if heuristic is None else heuristic(source)
+    heap = [(estimate, 0, next(tiebreak), source, None)]
+    while heap:
+        estimate, distance, _, v, edge_key = heappop(heap)
+        if v in settled:
+            continue
+        settled.add(v)
+        yield v, distance, edge_key
+        if v == target:
+            return
+        for e in outgoing(v):
+            t = targets(e)
+            if t in settled:
+                continue
+            d = distance + edge_weight(e)
+            if t not in distances or d < distances[t]:
+                distances[t] = d
+                estimate = d if heuristic is None else d + heuristic(t)
+                heappush(heap, (estimate, d, next(tiebreak), t, e))
+
+
+def dijkstra(graph, source, target=None, weight=None):
+    """Return (distances, predecessors) for the shortest paths from the
+    source vertex key, where distances maps each reachable vertex key
+    to its distance and predecessors maps each reachable vertex key
+    other than the source to the key of the last edge of a shortest
+    path to it.  If target is specified, the search stops as soon as
+    the target's distance is known.  Edge weights are as for
+    iter_dijkstra.
+
+    """
+    distances = dict()
+    predecessors = dict()
+    for v, distance, edge_key in iter_dijkstra(graph, source, weight, target=target):
+        distances[v] = distance
+        if edge_key is not None:
+            predecessors[v] = edge_key
+    return distances, predecessors
+
+
+def astar(graph, source, target, heuristic, weight=None):
+    """Return (distances, predecessors), as for dijkstra, for the vertices
+    settled by an A* search from the source vertex key to the target
+    vertex key.  heuristic(vertex_key) must be consistent, as for
+    iter_dijkstra, not merely never overestimate the distance from
+    the vertex to the target.
+
+    """
+    distances = dict()
+    predecessors = dict()
+    for v, distance, edge_key in iter_dijkstra(graph, source, weight, heuristic, target):
+        distances[v] = distance
+        if edge_key is not None:
+            predecessors[v] = edge_key
+    return distances, predecessors
+
+
+def bidirectional_dijkstra(graph, source, target, weight=None):
+    """Return (distance, edge_keys) for a shortest path from the source
+    vertex key to the target vertex key, searching forward from the
+    source and backward from the target at the same time.  Edge
+    weights are as for iter_dijkstra.  An exception is raised if there
+    is no path.
+
+    """
+    edge_weight = _weight_function(graph, weight)
+    if not graph.is_vertex(source) or not graph.is_vertex(target):
+        raise KeyError
+    if source == target:
+        return 0, []
+    # index 0 searches forward from the source, index 1 backward from
+    # the target
+    neighbors = ((graph.iter_outgoing_edges, graph.get_target),
+                 (graph.iter_incoming_edges, graph.get_source))
+    distances = ({source: 0}, {target: 0})
+    predecessors = (dict(), dict())
+    settled = (set(), set())
+    tiebreak = count()
+    heaps = ([(0, next(tiebreak), source)], [(0, next(tiebreak), target)])
+    best = None
+    meeting = None
+    while heaps[0] and heaps[1]:
+        if best is not None and heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, _, v = heappop(heaps[side])
+        if v in settled[side]:
+            continue
+        settled[side].add(v)
+        iter_edges, endpoint = neighbors[side]
+        for e in iter_edges(v):
+            n = endpoint(e)
+            d = distance + edge_weight(e)
+            if n not in distances[side] or d < distances[side][n]:
+                distances[side][n] = d
+                predecessors[side][n] = e
+                heappush(heaps[side], (d, next(tiebreak), n))
+            if n in distances[1 - side]:
+                total = d + distances[1 - side][n]
+                if best is None or total < best:
+                    best = total
+                    meeting = n
+    if best is None:
+        raise Exception("No path from %r to %r" % (source, target))
+    edge_keys = path_edges(graph, predecessors[0], meeting)
+    v = meeting
+    while v != target:
+        e = predecessors[1][v]
+        edge_keys.append(e)
+        v = graph.get_target(e)
+    return best, edge_keys
+
+
+def path_edges(graph, predecessors, target):
+    """Return the list of edge keys of the path to the target vertex key
+    recorded in a predecessors map, as returned by dijkstra.
+
+    """
+    edge_keys = []
+    v = target
+    while v in predecessors:
+        e = predecessors[v]
+        edge_keys.append(e)
+        v = graph.get_source(e)
+    edge_keys.reverse()
+    return edge_keys
+
+
+def path_vertices(graph, predecessors, target):
+    """Return the list of vertex keys of the path to the target vertex key
+    recorded in a predecessors map, as returned by dijkstra.
+
+    """
+    vertex_keys = [target]
+    v = target
+    while v in predecessors:
+        v = graph.get_source(predecessors[v])
+        vertex_keys.append(v)
+    vertex_keys.reverse()
+    return vertex_keys
@@ -0,0 +1,99 @@
+from graphs import dag
+
+
+class ReachabilityIndex:
+    """
+    ReachabilityIndex(graph) -> new index answering reachability queries
+    on the graph without traversing it
+
+    The strongly connected components of the graph are condensed into a
+    directed acyclic graph, and each component is labeled with a bitset
+    of the components it reaches.  If the graph has a subscribe method,
+    as Graph does, the index follows its changes: adding vertices, and
+    edges between vertices that already reach each other, keeps the
+    labels; other changes rebuild them on the next query.
+    """
+    def __init__(self, graph):
+        self._graph = graph
+        self._stale = True
+        self._components = [] #component id -> {vertex_key}
+        self._component_of = dict() #vertex_key -> component id
+        self._reach = [] #component id -> bitset of the component ids it reaches
+        self._following = hasattr(graph, 'subscribe') #whether subscribed to the graph
+        if self._following:
+            graph.subscribe(self._changed)
+
+    def close(self):
+        """Stop following changes to the graph"""
+        if self._following:
+            self._graph.unsubscribe(self._changed)
+            self._following = False
+
+    def _build(self):
+        # components come after every component they reach, so the labels
+        # of a component's successors are known by the time it is labeled
+        graph = self._graph
+        self._components = list(dag.strongly_connected_components(graph))
+        self._component_of = {v: i for i, component in enumerate(self._components) for v in component}
+        self._reach = []
+        component_of = self._component_of
+        for i, component in enumerate(self._components):
+            bits = 1 << i
+            for v in component:
+                for w in graph.iter_target_vertices(v):
+                    j = component_of[w]
+                    if j != i:
+                        bits |= self._reach[j]
+            self._reach.append(bits)
+        self._stale = False
+
+    def _changed(self, change):
+        if self._stale:
+            return
+        operation = change.operation
+        if operation == 'add_vertex':
+            if change.key not in self._component_of:
+                self._component_of[change.key] = len(self._components)
+                self._components.append({change.key})
+                self._reach.append(1 << len(self._reach))
+        elif operation == 'add_edge':
+            if not self._reaches(change.source, change.target):
+                self._stale = True
+        elif operation == 'remove_edge':
+            if not self._graph.is_adjacent(change.source, change.target):
+                self._stale = True
+        elif operation == 'remove_vertex':
+            # its edges are gone, so it is a component of its own
+            i = self._component_of.pop(change.key)
+            self._components[i].discard(change.key)
+        else:
+            self._stale = True
+
+    def _reaches(self, source_key, target_key):
+        return self._reach[self._component_of[source_key]] >> self._component_of[target_key] & 1 == 1
+
+    def reaches(self, source_key, target_key):
+        """Return True if there is a directed path, possibly with no edges,
+        from the source vertex key to the target vertex key.
+
+        """
+        if self._stale:
+            self._build()
+        return self._reaches(source_key, target_key)
+
+    def descendants(self, vertex_key):
+        """Return the set of the other vertex keys reachable from the
+        specified vertex key by directed paths.
+
+        """
+        if self._stale:
+            self._build()
+        # the binary digits of the label, lowest first
+        digits = bin(self._reach[self._component_of[vertex_key]])[:1:-1]
+        result = set()
+        i = digits.find('1')
+        while i >= 0:
+            result.update(self._components[i])
+            i = digits.find('1', i + 1)
+        result.discard(vertex_key)
+        return result
@@ -0,0 +1,77 @@
+from heapq import heappush, heappop
+from itertools import count
+
+from graphs.unionfind import UnionFind
+
+# Minimum spanning forests, ignoring the direction of edges.  Edge
+# weights are the edge values, or weight(edge value) if weight is
+# specified; negative weights are allowed.  Of parallel edges, only the
+# lightest can be chosen.
+
+
+def _weight_function(graph, weight):
+    if weight is None:
+        return graph.get_edge
+    get_edge = graph.get_edge
+    return lambda edge_key: weight(get_edge(edge_key))
+
+
+def kruskal(graph, weight=None):
+    """Return the list of edge keys of a minimum spanning forest of the
+    graph, using Kruskal's algorithm.
+
+    """
+    edge_weight = _weight_function(graph, weight)
+    components = UnionFind(graph.iter_vertices())
+    forest = []
+    for e in sorted(graph.iter_edges(), key=edge_weight):
+        if components.union(graph.get_source(e), graph.get_target(e)):
+            forest.append(e)
+    return forest
+
+
+def prim(graph, weight=None):
+    """Return the list of edge keys of a minimum spanning forest of the
+    graph, using Prim's algorithm with a binary heap, growing a tree
+    from each vertex not yet reached.
+
+    """
+    edge_weight = _weight_function(graph, weight)
+    tiebreak = count()
+    reached = set()
+    forest = []
+
+    def push_edges(v):
+        for e in graph.iter_outgoing_edges(v):
+            if graph.get_target(e) not in reached:
+                heappush(heap, (edge_weight(e), next(tiebreak), e, graph.get_target(e)))
+        for e in graph.iter_incoming_edges(v):
+            if graph.get_source(e) not in reached:
+                heappush(heap, (edge_weight(e), next(tiebreak), e, graph.get_source(e)))
+
+    for root in graph.iter_vertices():
+        if root in reached:
+            continue
+        reached.add(root)
+        heap = []
+        push_edges(root)
+        while heap:
+            w, _, e, v = heappop(heap)
+            if v in reached:
+                continue
+            reached.add(v)
+            forest.append(e)
+            push_edges(v)
+    return forest
+
+
+def minimum_spanning_tree(graph, weight=None, algorithm='kruskal'):
+    """Return the list of edge keys of a minimum spanning forest of the
+    graph, using algorithm 'kruskal' or 'prim'.
+
+    """
+    if algorithm == 'kruskal':
+        return kruskal(graph, weight)
+    if algorithm == 'prim':
+        return prim(graph, weight)
+    raise ValueError("algorithm must be 'kruskal' or 'prim'")
@@ -0,0 +1,480 @@
+import io
+import pickle
+import sqlite3
+from collections import OrderedDict
+
+from graphs import traversal
+from graphs.view import GraphView
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vertices (
+    id INTEGER PRIMARY KEY,
+    key BLOB NOT NULL UNIQUE,
+    value BLOB
+);
+CREATE TABLE IF NOT EXISTS edges (
+    id INTEGER PRIMARY KEY,
+    key BLOB NOT NULL UNIQUE,
+    source INTEGER NOT NULL REFERENCES vertices (id),
+    target INTEGER NOT NULL REFERENCES vertices (id),
+    value BLOB
+);
+CREATE INDEX IF NOT EXISTS edges_by_source ON edges (source, target);
+CREATE INDEX IF NOT EXISTS edges_by_target ON edges (target);
+"""
+
+_OUT = """SELECT e.key, v.key FROM edges e JOIN vertices v ON v.id = e.target
+WHERE e.source = ?"""
+_IN = """SELECT e.key, v.key FROM edges e JOIN vertices v ON v.id = e.source
+WHERE e.target = ?"""
+
+
+def _dump(key):
+    # keys are pickled without the memo, which would otherwise write an
+    # object repeated within a key differently from an equal copy
+    f = io.BytesIO()
+    pickler = pickle.Pickler(f, pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True
+    pickler.dump(key)
+    return f.getvalue()
+
+
+def _dump_value(value):
+    return None if value is None else pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _load_value(data):
+    return None if data is None else pickle.loads(data)
+
+
+class SQLiteGraph:
+    """
+    SQLiteGraph(path=':memory:', cache_size=100000) -> directed graph
+    stored in the SQLite database file at path, created if necessary
+
+    A Graph with the same API, keeping the vertices and edges on disk so
+    that graphs larger than memory can be traversed, and reading only
+    the adjacency of the vertices visited.  Keys and values are stored
+    pickled, keys without pickle's memo; equal keys must pickle to the
+    same bytes, as None, strings, bytes, numbers of one type, and
+    tuples of them do, but not equal numbers of different types such
+    as 1 and 1.0, nor sets.  The outgoing and incoming adjacency of
+    the most recently used vertices is kept in memory, up to cache_size
+    edges in all, each vertex counting at least one, so that a few hub
+    vertices cannot fill memory; a vertex with more edges than that is
+    read again each time.
+    Changes are written in a transaction that commit or close ends.
+    """
+    def __init__(self, path=':memory:', cache_size=100000):
+        if cache_size < 1:
+            raise ValueError("cache_size must be positive")
+        self._db = sqlite3.connect(path)
+        self._db.executescript(_SCHEMA)
+        self._cache_size = cache_size
+        self._adjacency = OrderedDict() #('out' or 'in', vertex_key) -> [(edge_key, vertex_key)]
+        self._cached = 0 #edges in the cached adjacency, at least one per vertex
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def commit(self):
+        """Write the changes made since the last commit to the database"""
+        self._db.commit()
+
+    def close(self):
+        """Commit the changes and close the database"""
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _one(self, sql, *args):
+        # the first column of the first row of a query, or None
+        row = self._db.execute(sql, args).fetchone()
+        return None if row is None else row[0]
+
+    def _vertex_id(self, key):
+        v = self._one("SELECT id FROM vertices WHERE key = ?", _dump(key))
+        if v is None:
+            raise KeyError(key)
+        return v
+
+    def _drop(self, direction, vertex_key):
+        # drop the cached adjacency of a vertex in one direction
+        adjacent = self._adjacency.pop((direction, vertex_key), None)
+        if adjacent is not None:
+            self._cached -= len(adjacent) or 1
+
+    def _forget(self, vertex_key):
+        # drop the cached adjacency of a vertex
+        self._drop('out', vertex_key)
+        self._drop('in', vertex_key)
+
+    def _adjacent(self, direction, vertex_key):
+        """Return the list of (edge key, vertex key) of the edges coming out
+        of (direction 'out') or entering ('in') the vertex, and the
+        vertices at their other ends.
+
+        """
+        cache_key = (direction, vertex_key)
+        adjacent = self._adjacency.get(cache_key)
+        if adjacent is not None:
+            self._adjacency.move_to_end(cache_key)
+            self.cache_hits += 1
+            return adjacent
+        self.cache_misses += 1
+        v = self._vertex_id(vertex_key)
+        rows = self._db.execute(_OUT if direction == 'out' else _IN, (v,))
+        adjacent = [(pickle.loads(e), pickle.loads(w)) for e, w in rows]
+        size = len(adjacent) or 1
+        if size <= self._cache_size:
+            self._adjacency[cache_key] = adjacent
+            self._cached += size
+            while self._cached > self._cache_size:
+                self._cached -= len(self._adjacency.popitem(last=False)[1]) or 1
+        return adjacent
+
+    def add_vertex(self, key, value=None):
+        """Add a new vertex, with an optional value, to the graph.  The key
+        must be of a picklable type.  If a vertex of the same key is
+        already in the graph and a value is specified, the new value
+        will replace the old value.
+        """
+        data = _dump(key)
+        self._db.execute("INSERT OR IGNORE INTO vertices (key) VALUES (?)", (data,))
+        if value is not None:
+            self._db.execute("UPDATE vertices SET value = ? WHERE key = ?", (_dump_value(value), data))
+
+    def add_edge(self, key, source_key, target_key, value=None):
+        """Add a new edge, with an optional value, to the graph, connecting
+        the specified source vertex key to the specified target vertex
+        key.  The keys must be of picklable types.  If the vertices are
+        not already in the graph, they will be added with no value.
+        If the edge key is already in the graph with the same source
+        and target vertex keys and the value is specified, the new
+        value will overwrite the old value.  If the edge key is in the
+        graph with different source and vetex keys, an exception will
+        be raised.
+        """
+        data = _dump(key)
+        self.add_vertex(source_key)
+        self.add_vertex(target_key)
+        s = self._vertex_id(source_key)
+        t = self._vertex_id(target_key)
+        row = self._db.execute("SELECT source, target FROM edges WHERE key = ?", (data,)).fetchone()
+        if row is not None:
+            if row != (s, t):
+                raise Exception("Edge %s exists with different endpoints" % (key,))
+            if value is not None:
+                self._db.execute("UPDATE edges SET value = ? WHERE key = ?", (_dump_value(value), data))
+            # cached adjacency holds keys only, so it stays valid
+            return
+        self._db.execute("INSERT INTO edges (key, source, target, value) VALUES (?, ?, ?, ?)",
+                         (data, s, t, _dump_value(value)))
+        self._drop('out', source_key)
+        self._drop('in', target_key)
+
+    def add_edges_from(self, edges):
+        """Add edges from an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key) or (edge_key, source_vertex_key,
+        target_vertex_key, edge_value), as add_edge would.
+
+        """
+        for edge in edges:
+            self.add_edge(*edge)
+
+    def remove_edge(self, key):
+        """Remove the edge having the specified key, and return the value, if
+        any.
+
+        """
+        data = _dump(key)
+        row = self._db.execute("""SELECT s.key, t.key, e.value FROM edges e
+            JOIN vertices s ON s.id = e.source JOIN vertices t ON t.id = e.target
+            WHERE e.key = ?""", (data,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute("DELETE FROM edges WHERE key = ?", (data,))
+        self._drop('out', pickle.loads(row[0]))
+        self._drop('in', pickle.loads(row[1]))
+        return _load_value(row[2])
+
+    def remove_vertex(self, key):
+        """Remove the vertex with the specified key and return the value, if
+        any.  Any edges incident with the vertex will be deleted.
+
+        """
+        row = self._db.execute("SELECT id, value FROM vertices WHERE key = ?", (_dump(key),)).fetchone()
+        if row is None:
+            return None
+        v, value = row
+        for edge_key, target_key in self._adjacent('out', key):
+            self._drop('in', target_key)
+        for edge_key, source_key in self._adjacent('in', key):
+            self._drop('out', source_key)
+        self._db.execute("DELETE FROM edges WHERE source = ? OR target = ?", (v, v))
+        self._db.execute("DELETE FROM vertices WHERE id = ?", (v,))
+        self._forget(key)
+        return _load_value(value)
+
+    def get_vertex(self, key):
+        """Get the value of the vertex having the specified key"""
+        row = self._db.execute("SELECT value FROM vertices WHERE key = ?", (_dump(key),)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return _load_value(row[0])
+
+    def is_vertex(self, key):
+        """Return True if the key is of a vertex in the graph"""
+        return self._one("SELECT id FROM vertices WHERE key = ?", _dump(key)) is not None
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph"""
+        return self._one("SELECT count(*) FROM vertices")
+
+    def iter_vertices(self):
+        """Generate the vertex keys"""
+        for (data,) in self._db.execute("SELECT key FROM vertices"):
+            yield pickle.loads(data)
+
+    def get_edge(self, key):
+        """Get the value of the edge having the specified key"""
+        row = self._db.execute("SELECT value FROM edges WHERE key = ?", (_dump(key),)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return _load_value(row[0])
+
+    def is_edge(self, key):
+        """Return True if the key is of an edge in the graph"""
+        return self._one("SELECT id FROM edges WHERE key = ?", _dump(key)) is not None
+
+    def num_edges(self):
+        """Return the number of edges in the graph"""
+        return self._one("SELECT count(*) FROM edges")
+
+    def iter_edges(self):
+        """Generate the edge keys"""
+        for (data,) in self._db.execute("SELECT key FROM edges"):
+            yield pickle.loads(data)
+
+    def _endpoint(self, column, edge_key):
+        data = self._one("SELECT v.key FROM edges e JOIN vertices v ON v.id = e.%s WHERE e.key = ?" % column,
+                         _dump(edge_key))
+        if data is None:
+            raise KeyError(edge_key)
+        return pickle.loads(data)
+
+    def get_source(self, edge_key):
+        """Return the source vertex of the edge key"""
+        return self._endpoint('source', edge_key)
+
+    def get_target(self, edge_key):
+        """Return the target vertex of the edge key"""
+        return self._endpoint('target', edge_key)
+
+    def iter_outgoing_edges(self, vertex_key):
+        """Generate the edge keys coming out of the specified vertex key"""
+        return (e for e, w in self._adjacent('out', vertex_key))
+
+    def iter_target_vertices(self, vertex_key):
+        """Generate the target vertex keys of edges coming out of the
+specified vertex key
+
+        """
+        return (w for e, w in self._adjacent('out', vertex_key))
+
+    def outdegree(self, vertex_key):
+        """Return the number of outgoing edges from the specified vertex key"""
+        return len(self._adjacent('out', vertex_key))
+
+    def iter_incoming_edges(self, vertex_key):
+        """Generate the edge keys entering the specified vertex key"""
+        return (e for e, w in self._adjacent('in', vertex_key))
+
+    def iter_source_vertices(self, vertex_key):
+        """Generate the source vertex keys of edges entering the specified
+vertex key
+
+        """
+        return (w for e, w in self._adjacent('in', vertex_key))
+
+    def indegree(self, vertex_key):
+        """Return the number of incoming edges to the specified vertex key"""
+        return len(self._adjacent('in', vertex_key))
+
+    def _neighbor_keys(self, vertex_key):
+        neighbors = {w for e, w in self._adjacent('out', vertex_key)}
+        neighbors.update(w for e, w in self._adjacent('in', vertex_key))
+        return neighbors
+
+    def _num_incident_edges(self, vertex_key):
+        # the edges an undirected traversal scans at the vertex
+        outgoing = self._adjacent('out', vertex_key)
+        loops = sum(1 for e, w in outgoing if w == vertex_key)
+        return len(outgoing) + len(self._adjacent('in', vertex_key)) - loops
+
+    def iter_neighbors(self, vertex_key):
+        """Generate the vertex keys adjacent to the specified vertex key"""
+        return iter(self._neighbor_keys(vertex_key))
+
+    def degree(self, vertex_key):
+        """Return the number of vertices adjacent to the specified vertex key"""
+        return len(self._neighbor_keys(vertex_key))
+
+    def _connection_keys(self, source_key, target_key):
+        if not self.is_vertex(target_key):
+            raise KeyError(target_key)
+        return [e for e, w in self._adjacent('out', source_key) if w == target_key]
+
+    def iter_connections(self, source_key, target_key):
+        """Generate the edge keys from the source vertex key to the target
+        vertex key
+
+        """
+        return iter(self._connection_keys(source_key, target_key))
+
+    def num_connections(self, source_key, target_key):
+        """Return the number of edges from the source vertex key to the target
+        vertex key
+
+        """
+        return len(self._connection_keys(source_key, target_key))
+
+    def is_adjacent(self, source_key, target_key):
+        """Return true if the specified source vertex key is adjacent to the
+        specified target vertex key.
+
+        """
+        return len(self._connection_keys(source_key, target_key)) > 0
+
+    def iter_vertex_values(self):
+        """Generate the values of the vertices of the graph"""
+        for (data,) in self._db.execute("SELECT value FROM vertices"):
+            yield _load_value(data)
+
+    def iter_edge_values(self):
+        """Generate the values of the edges of the graph"""
+        for (data,) in self._db.execute("SELECT value FROM edges"):
+            yield _load_value(data)
+
+    def iter_vertex_value_tuple(self):
+        """Generate all vertex key-value pairs from the graph"""
+        for key, value in self._db.execute("SELECT key, value FROM vertices"):
+            yield (pickle.loads(key), _load_value(value))
+
+    def iter_edge_source_target_value_tuple(self):
+        """Generate all edge key-source-target-value quadruples from the graph"""
+        rows = self._db.execute("""SELECT e.key, s.key, t.key, e.value FROM edges e
+            JOIN vertices s ON s.id = e.source JOIN vertices t ON t.id = e.target""")
+        for key, source, target, value in rows:
+            yield (pickle.loads(key), pickle.loads(source), pickle.loads(target), _load_value(value))
+
+    def clear(self):
+        """Remove all vertices, edges, and values from the graph"""
+        self._db.execute("DELETE FROM edges")
+        self._db.execute("DELETE FROM vertices")
+        self._adjacency.clear()
+        self._cached = 0
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot of the graph, in memory"""
+        from graphs.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def subgraph(self, vertex_keys):
+        """Return a read-only view of the part of the graph induced by the
+        vertex keys, without copying it.
+
+        """
+        return GraphView(self, vertex_keys)
+
+    def filtered(self, vertex_pred=None, edge_pred=None):
+        """Return a read-only view of the vertices and edges of the graph
+        satisfying the predicates, which are called with a vertex key or
+        an edge key, without copying it.
+
+        """
+        return GraphView(self, None, vertex_pred, edge_pred)
+
+    def __str__(self):
+        return "<SQLiteGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def __repr__(self):
+        return "<SQLiteGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def from_tuple_set_tuple(self, tst):
+        """Given graph data in the form (vertices, edges), where vertices is
+        an iterable of tuples (vertex_key, vertex_value) and edges is
+        an iterable of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value), load the data into the current
+        graph.
+
+        """
+        vertices, edges = tst
+        for vertex_key, vertex_value in vertices:
+            self.add_vertex(vertex_key, vertex_value)
+        self.add_edges_from(edges)
+
+    def to_tuple_set_tuple(self):
+        """Return data of the graph, in the form (vertices, edges), where
+        vertices is a set of tuples (vertex_key, vertex_value) and
+        edges is a set of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value).
+
+        """
+        return (set(self.iter_vertex_value_tuple()), set(self.iter_edge_source_target_value_tuple()))
+
+    # traversals read the adjacency of each vertex they visit through the
+    # cache
+
+    def _start_vertices(self, start_vertices):
+        for key in start_vertices:
+            self._vertex_id(key)
+        return start_vertices
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.bfs, self._neighbor_keys, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'bfs_undirected', num_edges=self._num_incident_edges)
+
+    def bfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in breadth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.bfs, self.iter_target_vertices, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'bfs_directed')
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in depth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.dfs, self._neighbor_keys, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'dfs_undirected', num_edges=self._num_incident_edges)
+
+    def dfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in depth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.dfs, self.iter_target_vertices, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'dfs_directed')
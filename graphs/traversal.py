@@ -0,0 +1,230 @@
+import threading
+import time
+import tracemalloc
+
+
+def bfs(successors, start_vertices, max_depth=None, stats=None):
+    """Generate the vertices reachable from one or more of the start
+    vertices in breadth-first order, where successors(vertex) is an
+    iterable of the vertices following the vertex.  If max_depth is
+    specified, vertices more than max_depth steps from the start
+    vertices are not generated.
+
+    All state is local to the call, so any number of traversals may
+    run at once over the same graph, and abandoning the generator
+    stops the traversal.  If stats is specified, it is a
+    TraversalStats whose peak frontier is kept up to date.
+
+    """
+    visited = set()
+    level = []
+    for v in start_vertices:
+        if v not in visited:
+            visited.add(v)
+            level.append(v)
+    depth = 0
+    while level:
+        if stats is not None and len(level) > stats.peak_frontier:
+            stats.peak_frontier = len(level)
+        expand = max_depth is None or depth < max_depth
+        next_level = []
+        for v in level:
+            yield v
+            if expand:
+                for n in successors(v):
+                    if n not in visited:
+                        visited.add(n)
+                        next_level.append(n)
+        level = next_level
+        depth += 1
+
+
+def dfs(successors, start_vertices, max_depth=None, stats=None):
+    """Generate the vertices reachable from one or more of the start
+    vertices in depth-first order, where successors(vertex) is an
+    iterable of the vertices following the vertex.  If max_depth is
+    specified, vertices more than max_depth steps from the start
+    vertices are not generated.
+
+    All state is local to the call, and stats is used, as with bfs.
+
+    """
+    visited = set()
+    stack = []
+    for v in start_vertices:
+        if v not in visited:
+            visited.add(v)
+            stack.append(v)
+    if max_depth is None:
+        while stack:
+            if stats is not None and len(stack) > stats.peak_frontier:
+                stats.peak_frontier = len(stack)
+            v = stack.pop()
+            yield v
+            for n in successors(v):
+                if n not in visited:
+                    visited.add(n)
+                    stack.append(n)
+    else:
+        # a vertex first reached through a long path may be reached later
+        # through a shorter one, and must then be expanded again to find
+        # the vertices within max_depth beyond it; the stack holds
+        # (vertex, depth), and entries superseded by a shallower one
+        # are skipped
+        best = dict.fromkeys(stack, 0) #vertex -> least depth pushed
+        stack = [(v, 0) for v in stack]
+        visited = set()
+        while stack:
+            if stats is not None and len(stack) > stats.peak_frontier:
+                stats.peak_frontier = len(stack)
+            v, depth = stack.pop()
+            if depth > best[v]:
+                continue
+            if v not in visited:
+                visited.add(v)
+                yield v
+            if depth < max_depth:
+                depth += 1
+                for n in successors(v):
+                    if depth < best.get(n, depth + 1):
+                        best[n] = depth
+                        stack.append((n, depth))
+
+
+class TraversalStats:
+    """
+    TraversalStats(algorithm=None, trace_memory=False) -> new record of
+    the work done by a traversal, filled in by instrumented
+
+    The counts are the vertices generated, the edges scanned, and the
+    largest number of vertices waiting to be visited.  A directed
+    traversal scans the edges going out of each vertex it expands, and
+    an undirected one the edges incident with it, each self-loop once,
+    so parallel edges count in both.  The seconds
+    are those spent inside the traversal, not in the code consuming
+    it.  If trace_memory, peak_bytes is the most memory the traversal
+    held allocated, measured with tracemalloc between the vertices it
+    generates, which slows the traversal down.  Only the allocations
+    made inside the traversal count, so traversals traced at once do
+    not disturb each other, unless they run in different threads.
+    """
+    def __init__(self, algorithm=None, trace_memory=False):
+        self.algorithm = algorithm
+        self.trace_memory = trace_memory
+        self.vertices_visited = 0
+        self.edges_scanned = 0
+        self.peak_frontier = 0
+        self.seconds = 0.0
+        self.peak_bytes = None
+        self.finished = False
+
+    def as_dict(self):
+        """Return the statistics as a dict"""
+        return {
+            'algorithm': self.algorithm,
+            'vertices_visited': self.vertices_visited,
+            'edges_scanned': self.edges_scanned,
+            'peak_frontier': self.peak_frontier,
+            'seconds': self.seconds,
+            'peak_bytes': self.peak_bytes,
+            'finished': self.finished,
+        }
+
+    def __repr__(self):
+        return "<TraversalStats %s>" % ", ".join("%s=%r" % item for item in self.as_dict().items())
+
+
+# tracemalloc is process-wide: it is started when the first traversal
+# tracing memory starts, unless it was already running, and stopped when
+# the last one ends
+_tracing_lock = threading.Lock()
+_tracing_count = 0 #traversals tracing memory
+_tracing_started = False #whether they started tracemalloc
+
+
+def _start_tracing():
+    global _tracing_count, _tracing_started
+    with _tracing_lock:
+        if _tracing_count == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_count += 1
+
+
+def _stop_tracing():
+    global _tracing_count, _tracing_started
+    with _tracing_lock:
+        _tracing_count -= 1
+        if _tracing_count == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+def instrumented(search, successors, start_vertices, max_depth, stats, callback=None,
+                 num_edges=None):
+    """Generate the vertices of search(successors, start_vertices,
+    max_depth, stats), bfs or dfs, recording the work done in stats.
+    Each successor counts as an edge scanned, unless num_edges is
+    specified, when num_edges(vertex) edges are scanned to find the
+    successors of the vertex.  When the traversal ends, or the
+    generator is closed, stats.finished tells whether it ran to the
+    end, and callback(stats) is called if specified.
+
+    """
+    if num_edges is None:
+        def scanning(v):
+            for n in successors(v):
+                stats.edges_scanned += 1
+                yield n
+    else:
+        def scanning(v):
+            stats.edges_scanned += num_edges(v)
+            return successors(v)
+
+    trace = stats.trace_memory
+    if trace:
+        _start_tracing()
+        held = 0 #bytes allocated inside the traversal and not yet freed
+        stats.peak_bytes = stats.peak_bytes or 0
+    vertices = search(scanning, start_vertices, max_depth, stats)
+    clock = time.perf_counter
+    try:
+        while True:
+            if trace:
+                before = tracemalloc.get_traced_memory()[0]
+            start = clock()
+            try:
+                v = next(vertices)
+            except StopIteration:
+                stats.finished = True
+                return
+            finally:
+                stats.seconds += clock() - start
+                if trace:
+                    held += tracemalloc.get_traced_memory()[0] - before
+                    if held > stats.peak_bytes:
+                        stats.peak_bytes = held
+            stats.vertices_visited += 1
+            yield v
+    finally:
+        if trace:
+            _stop_tracing()
+        if callback is not None:
+            callback(stats)
+
+
+def traverse(search, successors, start_vertices, max_depth=None, stats=None, algorithm=None,
+             callback=None, num_edges=None):
+    """Return search(successors, start_vertices, max_depth), bfs or dfs,
+    instrumented as by instrumented, with num_edges, if stats is a
+    TraversalStats or callback is specified.  The algorithm name is given to stats if it
+    has none, or to a new TraversalStats if only callback is specified.
+
+    """
+    if stats is None:
+        if callback is None:
+            return search(successors, start_vertices, max_depth)
+        stats = TraversalStats(algorithm)
+    elif stats.algorithm is None:
+        stats.algorithm = algorithm
+    return instrumented(search, successors, start_vertices, max_depth, stats, callback, num_edges)
@@ -0,0 +1,298 @@
+from graphs import traversal
+
+
+class UndirectedGraph:
+    """
+    UndirectedGraph() -> new undirected graph with no vertices or edges
+
+    Each vertex maps its neighbors to the set of keys of the edges
+    joining them, and the two ends of an edge share the one set, so
+    adding or removing an edge updates a single set, and two vertices
+    stay neighbors exactly while an edge between them remains.
+    Parallel edges and self-loops are allowed.  The ends of an edge
+    are kept in the order given, but their order has no meaning.
+    """
+    def __init__(self):
+        self._vertices = dict() #vertex_key -> vertex_data
+        self._edges = dict() #edge_key -> edge_data
+        self._ends = dict() #edge_key -> (vertex_key, vertex_key)
+        self._adjacency = dict() #vertex_key -> {vertex_key: {edge_key}}
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Return an undirected graph with the vertices, edges and values of
+        the specified graph, ignoring the direction of its edges.
+
+        """
+        result = cls()
+        for key, value in graph.iter_vertex_value_tuple():
+            result.add_vertex(key, value)
+        result.add_edges_from(graph.iter_edge_source_target_value_tuple())
+        return result
+
+    def add_vertex(self, key, value=None):
+        """Add a new vertex, with an optional value, to the graph.  The key
+        must be of a hashable type.  If a vertex of the same key is
+        already in the graph and a value is specified, the new value
+        will replace the old value.
+        """
+        if key not in self._vertices:
+            self._vertices[key] = value
+            self._adjacency[key] = dict()
+        elif value is not None:
+            self._vertices[key] = value
+
+    def add_edge(self, key, end_key1, end_key2, value=None):
+        """Add a new edge, with an optional value, to the graph, joining the
+        two specified vertex keys.  The keys must be of hashable types.
+        If the vertices are not already in the graph, they will be
+        added with no value.  If the edge key is already in the graph
+        with the same ends, in either order, and the value is
+        specified, the new value will overwrite the old value.  If the
+        edge key is in the graph with different ends, an exception will
+        be raised.
+        """
+        ends = self._ends.get(key)
+        if ends is not None:
+            if ends != (end_key1, end_key2) and ends != (end_key2, end_key1):
+                raise Exception("Edge %s exists with different ends" % (key,))
+            if value is not None:
+                self._edges[key] = value
+            return
+        self.add_vertex(end_key1)
+        self.add_vertex(end_key2)
+        self._edges[key] = value
+        self._ends[key] = (end_key1, end_key2)
+        joining = self._adjacency[end_key1].get(end_key2)
+        if joining is None:
+            joining = self._adjacency[end_key1][end_key2] = self._adjacency[end_key2][end_key1] = set()
+        joining.add(key)
+
+    def add_edges_from(self, edges):
+        """Add edges from an iterable of tuples (edge_key, vertex_key,
+        vertex_key) or (edge_key, vertex_key, vertex_key, edge_value), as
+        add_edge would.
+
+        """
+        for edge in edges:
+            self.add_edge(*edge)
+
+    def remove_edge(self, key):
+        """Remove the edge having the specified key, and return the value, if
+        any.
+
+        """
+        ends = self._ends.pop(key, None)
+        if ends is None:
+            return None
+        u, v = ends
+        joining = self._adjacency[u][v]
+        joining.remove(key)
+        if not joining:
+            del self._adjacency[u][v]
+            self._adjacency[v].pop(u, None)
+        return self._edges.pop(key)
+
+    def remove_vertex(self, key):
+        """Remove the vertex with the specified key and return the value, if
+        any.  Any edges incident with the vertex will be deleted.
+
+        """
+        if key not in self._vertices:
+            return None
+        for w, joining in self._adjacency.pop(key).items():
+            for edge_key in joining:
+                del self._edges[edge_key]
+                del self._ends[edge_key]
+            if w != key:
+                del self._adjacency[w][key]
+        return self._vertices.pop(key)
+
+    def get_vertex(self, key):
+        """Get the value of the vertex having the specified key"""
+        return self._vertices[key]
+
+    def is_vertex(self, key):
+        """Return True if the key is of a vertex in the graph"""
+        return key in self._vertices
+
+    def num_vertices(self):
+        """Return the number of vertices in the graph"""
+        return len(self._vertices)
+
+    def iter_vertices(self):
+        """Generate the vertex keys"""
+        return iter(self._vertices)
+
+    def get_edge(self, key):
+        """Get the value of the edge having the specified key"""
+        return self._edges[key]
+
+    def is_edge(self, key):
+        """Return True if the key is of an edge in the graph"""
+        return key in self._edges
+
+    def num_edges(self):
+        """Return the number of edges in the graph"""
+        return len(self._edges)
+
+    def iter_edges(self):
+        """Generate the edge keys"""
+        return iter(self._edges)
+
+    def get_ends(self, edge_key):
+        """Return the pair of vertex keys the edge joins, in the order given
+        when it was added.
+
+        """
+        return self._ends[edge_key]
+
+    def get_other_end(self, edge_key, vertex_key):
+        """Return the vertex key the edge joins to the specified vertex key"""
+        u, v = self._ends[edge_key]
+        if vertex_key == u:
+            return v
+        if vertex_key == v:
+            return u
+        raise KeyError(vertex_key)
+
+    def iter_incident_edges(self, vertex_key):
+        """Generate the keys of the edges incident with the specified vertex
+        key, each self-loop once.
+
+        """
+        for joining in self._adjacency[vertex_key].values():
+            yield from joining
+
+    def num_incident_edges(self, vertex_key):
+        """Return the number of edges incident with the specified vertex key,
+        counting each self-loop once.
+
+        """
+        return sum(map(len, self._adjacency[vertex_key].values()))
+
+    def iter_neighbors(self, vertex_key):
+        """Generate the vertex keys adjacent to the specified vertex key"""
+        return iter(self._adjacency[vertex_key])
+
+    def degree(self, vertex_key):
+        """Return the number of vertices adjacent to the specified vertex key"""
+        return len(self._adjacency[vertex_key])
+
+    def iter_connections(self, vertex_key1, vertex_key2):
+        """Generate the keys of the edges joining the two vertex keys"""
+        if vertex_key2 not in self._vertices:
+            raise KeyError(vertex_key2)
+        return iter(self._adjacency[vertex_key1].get(vertex_key2, ()))
+
+    def num_connections(self, vertex_key1, vertex_key2):
+        """Return the number of edges joining the two vertex keys"""
+        if vertex_key2 not in self._vertices:
+            raise KeyError(vertex_key2)
+        return len(self._adjacency[vertex_key1].get(vertex_key2, ()))
+
+    def is_adjacent(self, vertex_key1, vertex_key2):
+        """Return true if an edge joins the two vertex keys"""
+        if vertex_key2 not in self._vertices:
+            raise KeyError(vertex_key2)
+        return vertex_key2 in self._adjacency[vertex_key1]
+
+    def iter_vertex_values(self):
+        """Generate the values of the vertices of the graph"""
+        return iter(self._vertices.values())
+
+    def iter_edge_values(self):
+        """Generate the values of the edges of the graph"""
+        return iter(self._edges.values())
+
+    def iter_vertex_value_tuple(self):
+        """Generate all vertex key-value pairs from the graph"""
+        return iter(self._vertices.items())
+
+    def iter_edge_source_target_value_tuple(self):
+        """Generate all edge key-end-end-value quadruples from the graph,
+        with the ends in the order given when the edge was added.
+
+        """
+        for key, (u, v) in self._ends.items():
+            yield (key, u, v, self._edges[key])
+
+    def clear(self):
+        """Remove all vertices, edges, and values from the graph"""
+        self.__init__()
+
+    def copy(self):
+        """Return a copy of the graph, with the same values, not copies"""
+        result = UndirectedGraph()
+        result._vertices = self._vertices.copy()
+        result._edges = self._edges.copy()
+        result._ends = self._ends.copy()
+        for key, adjacent in self._adjacency.items():
+            result._adjacency[key] = copied = dict()
+            for w, joining in adjacent.items():
+                # share the copied set between the two ends, as here
+                other = result._adjacency.get(w)
+                if other is not None and key in other:
+                    copied[w] = other[key]
+                else:
+                    copied[w] = set(joining)
+        return result
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot of the graph, with each edge
+        directed from its first end to its second.  Its neighbor queries
+        are those of this graph.
+
+        """
+        from graphs.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def __str__(self):
+        return "<UndirectedGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def __repr__(self):
+        return "<UndirectedGraph with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def from_tuple_set_tuple(self, tst):
+        """Given graph data in the form (vertices, edges), where vertices is
+        an iterable of tuples (vertex_key, vertex_value) and edges is
+        an iterable of tuples (edge_key, vertex_key, vertex_key,
+        edge_value), load the data into the current graph.
+
+        """
+        vertices, edges = tst
+        for vertex_key, vertex_value in vertices:
+            self.add_vertex(vertex_key, vertex_value)
+        self.add_edges_from(edges)
+
+    def to_tuple_set_tuple(self):
+        """Return data of the graph, in the form (vertices, edges), where
+        vertices is a set of tuples (vertex_key, vertex_value) and
+        edges is a set of tuples (edge_key, vertex_key, vertex_key,
+        edge_value).
+
+        """
+        return (set(self.iter_vertex_value_tuple()), set(self.iter_edge_source_target_value_tuple()))
+
+    # traversals follow the adjacency dicts directly
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order.  If max_depth is specified, only
+        vertices within max_depth steps of the start vertices are
+        generated.  If stats is a TraversalStats, the work done is
+        recorded in it.
+
+        """
+        return traversal.traverse(traversal.bfs, self._adjacency.__getitem__, start_vertices,
+                                  max_depth, stats, 'bfs_undirected', num_edges=self.num_incident_edges)
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in depth-first order.  If max_depth is specified, only vertices
+        within max_depth steps of the start vertices are generated.  If
+        stats is a TraversalStats, the work done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.dfs, self._adjacency.__getitem__, start_vertices,
+                                  max_depth, stats, 'dfs_undirected', num_edges=self.num_incident_edges)
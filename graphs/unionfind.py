@@ -0,0 +1,102 @@
+class UnionFind:
+    """
+    UnionFind() -> new empty disjoint-set forest, with union by size and
+    path halving
+    """
+    def __init__(self, keys=()):
+        self._parent = dict() #key -> parent key
+        self._size = dict() #root key -> number of keys in its set
+        # keys removed from sets of several, left in the forest for the
+        # keys whose paths to their roots pass through them
+        self._removed = set()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key):
+        """Add the key as a set of its own, if it is not already present"""
+        if key in self._removed:
+            self._compact()
+        if key not in self._parent:
+            self._parent[key] = key
+            self._size[key] = 1
+
+    def discard(self, key):
+        """Remove the key, if it is present, from its set, leaving the other
+        keys of the set together.
+
+        """
+        if key not in self._parent or key in self._removed:
+            return
+        if self._parent[key] == key and self._size[key] == 1:
+            del self._parent[key]
+            del self._size[key]
+            return
+        root = self.find(key)
+        self._size[root] -= 1
+        if not self._size[root]:
+            del self._size[root]
+        self._removed.add(key)
+        if len(self._removed) > len(self._parent) // 2:
+            self._compact()
+
+    def _compact(self):
+        # rebuild the forest without the removed keys, every key pointing
+        # to the first key of its set
+        parent = dict()
+        size = dict()
+        roots = dict() #old root -> new root
+        for key in self._parent:
+            if key not in self._removed:
+                root = roots.setdefault(self.find(key), key)
+                parent[key] = root
+                size[root] = size.get(root, 0) + 1
+        self._parent = parent
+        self._size = size
+        self._removed = set()
+
+    def find(self, key):
+        """Return the representative key of the set containing the key"""
+        parent = self._parent
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    def union(self, key1, key2):
+        """Merge the sets containing the two keys.  Return True if they were
+        in different sets.
+
+        """
+        root1 = self.find(key1)
+        root2 = self.find(key2)
+        if root1 == root2:
+            return False
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size.pop(root2)
+        return True
+
+    def same(self, key1, key2):
+        """Return True if the two keys are in the same set"""
+        return self.find(key1) == self.find(key2)
+
+    def set_size(self, key):
+        """Return the number of keys in the set containing the key"""
+        return self._size[self.find(key)]
+
+    def num_sets(self):
+        """Return the number of disjoint sets"""
+        return len(self._size)
+
+    def clear(self):
+        """Remove all keys"""
+        self._parent.clear()
+        self._size.clear()
+        self._removed.clear()
+
+    def __contains__(self, key):
+        return key in self._parent and key not in self._removed
+
+    def __len__(self):
+        return len(self._parent) - len(self._removed)
@@ -0,0 +1,285 @@
+from graphs import traversal
+
+
+class GraphView:
+    """
+    GraphView(graph, vertex_keys=None, vertex_pred=None, edge_pred=None)
+    -> new read-only view of part of a graph
+
+    The view has the vertices of the graph that are among vertex_keys (if
+    specified) and for which vertex_pred(vertex_key) is true (if
+    specified), and the edges between those vertices for which
+    edge_pred(edge_key) is true (if specified).  Nothing is copied: the
+    view reflects later changes to the graph, and its read API is the
+    same as that of Graph.
+    """
+    def __init__(self, graph, vertex_keys=None, vertex_pred=None, edge_pred=None):
+        self._graph = graph
+        self._vertex_keys = None if vertex_keys is None else set(vertex_keys)
+        self._vertex_pred = vertex_pred
+        self._edge_pred = edge_pred
+
+    def _has_vertex(self, key):
+        return (self._graph.is_vertex(key)
+                and (self._vertex_keys is None or key in self._vertex_keys)
+                and (self._vertex_pred is None or self._vertex_pred(key)))
+
+    def _has_edge(self, key):
+        # for an edge of the graph whose source is known to be in the view
+        return (self._has_vertex(self._graph.get_target(key))
+                and (self._edge_pred is None or self._edge_pred(key)))
+
+    def _check_vertex(self, key):
+        if not self._has_vertex(key):
+            raise KeyError(key)
+
+    def _check_edge(self, key):
+        if not self.is_edge(key):
+            raise KeyError(key)
+
+    def get_vertex(self, key):
+        """Get the value of the vertex having the specified key"""
+        self._check_vertex(key)
+        return self._graph.get_vertex(key)
+
+    def is_vertex(self, key):
+        """Return True if the key is of a vertex in the view"""
+        return self._has_vertex(key)
+
+    def num_vertices(self):
+        """Return the number of vertices in the view"""
+        return sum(1 for v in self.iter_vertices())
+
+    def iter_vertices(self):
+        """Generate the vertex keys"""
+        if self._vertex_keys is None:
+            keys = self._graph.iter_vertices()
+        else:
+            keys = (key for key in self._vertex_keys if self._graph.is_vertex(key))
+        if self._vertex_pred is None:
+            return keys
+        return filter(self._vertex_pred, keys)
+
+    def get_edge(self, key):
+        """Get the value of the edge having the specified key"""
+        self._check_edge(key)
+        return self._graph.get_edge(key)
+
+    def is_edge(self, key):
+        """Return True if the key is of an edge in the view"""
+        return (self._graph.is_edge(key)
+                and self._has_vertex(self._graph.get_source(key))
+                and self._has_edge(key))
+
+    def num_edges(self):
+        """Return the number of edges in the view"""
+        return sum(1 for e in self.iter_edges())
+
+    def iter_edges(self):
+        """Generate the edge keys"""
+        for v in self.iter_vertices():
+            for e in self._graph.iter_outgoing_edges(v):
+                if self._has_edge(e):
+                    yield e
+
+    def get_source(self, edge_key):
+        """Return the source vertex of the edge key"""
+        self._check_edge(edge_key)
+        return self._graph.get_source(edge_key)
+
+    def get_target(self, edge_key):
+        """Return the target vertex of the edge key"""
+        self._check_edge(edge_key)
+        return self._graph.get_target(edge_key)
+
+    def iter_outgoing_edges(self, vertex_key):
+        """Generate the edge keys coming out of the specified vertex key"""
+        self._check_vertex(vertex_key)
+        for e in self._graph.iter_outgoing_edges(vertex_key):
+            if self._has_edge(e):
+                yield e
+
+    def iter_target_vertices(self, vertex_key):
+        """Generate the target vertex keys of edges coming out of the
+specified vertex key
+
+        """
+        for e in self.iter_outgoing_edges(vertex_key):
+            yield self._graph.get_target(e)
+
+    def outdegree(self, vertex_key):
+        """Return the number of outgoing edges from the specified vertex key"""
+        return sum(1 for e in self.iter_outgoing_edges(vertex_key))
+
+    def iter_incoming_edges(self, vertex_key):
+        """Generate the edge keys entering the specified vertex key"""
+        self._check_vertex(vertex_key)
+        for e in self._graph.iter_incoming_edges(vertex_key):
+            if (self._has_vertex(self._graph.get_source(e))
+                and (self._edge_pred is None or self._edge_pred(e))):
+                yield e
+
+    def iter_source_vertices(self, vertex_key):
+        """Generate the source vertex keys of edges entering the specified
+vertex key
+
+        """
+        for e in self.iter_incoming_edges(vertex_key):
+            yield self._graph.get_source(e)
+
+    def indegree(self, vertex_key):
+        """Return the number of incoming edges to the specified vertex key"""
+        return sum(1 for e in self.iter_incoming_edges(vertex_key))
+
+    def iter_neighbors(self, vertex_key):
+        """Generate the vertex keys adjacent to the specified vertex key"""
+        self._check_vertex(vertex_key)
+        for n in self._graph.iter_neighbors(vertex_key):
+            if not self._has_vertex(n):
+                continue
+            if (self._edge_pred is None
+                or self._any_connection(vertex_key, n)
+                or self._any_connection(n, vertex_key)):
+                yield n
+
+    def _any_connection(self, source_key, target_key):
+        return (self._graph.is_adjacent(source_key, target_key)
+                and any(map(self._edge_pred, self._graph.iter_connections(source_key, target_key))))
+
+    def degree(self, vertex_key):
+        """Return the number of vertices adjacent to the specified vertex key"""
+        return sum(1 for n in self.iter_neighbors(vertex_key))
+
+    def _num_incident_edges(self, vertex_key):
+        # the edges an undirected traversal scans at the vertex
+        return (self.outdegree(vertex_key) + self.indegree(vertex_key)
+                - self.num_connections(vertex_key, vertex_key))
+
+    def iter_connections(self, source_key, target_key):
+        """Generate the edge keys from the source vertex key to the target
+        vertex key
+
+        """
+        self._check_vertex(source_key)
+        self._check_vertex(target_key)
+        if self._graph.is_adjacent(source_key, target_key):
+            for e in self._graph.iter_connections(source_key, target_key):
+                if self._edge_pred is None or self._edge_pred(e):
+                    yield e
+
+    def num_connections(self, source_key, target_key):
+        """Return the number of edges from the source vertex key to the target
+        vertex key
+
+        """
+        return sum(1 for e in self.iter_connections(source_key, target_key))
+
+    def is_adjacent(self, source_key, target_key):
+        """Return true if the specified source vertex key is adjacent to the
+        specified target vertex key.
+
+        """
+        for e in self.iter_connections(source_key, target_key):
+            return True
+        return False
+
+    def iter_vertex_values(self):
+        """Generate the values of the vertices of the view"""
+        for key in self.iter_vertices():
+            yield self._graph.get_vertex(key)
+
+    def iter_edge_values(self):
+        """Generate the values of the edges of the view"""
+        for key in self.iter_edges():
+            yield self._graph.get_edge(key)
+
+    def iter_vertex_value_tuple(self):
+        """Generate all vertex key-value pairs from the view"""
+        for key in self.iter_vertices():
+            yield (key, self._graph.get_vertex(key))
+
+    def iter_edge_source_target_value_tuple(self):
+        """Generate all edge key-source-target-value quadruples from the view"""
+        graph = self._graph
+        for key in self.iter_edges():
+            yield (key, graph.get_source(key), graph.get_target(key), graph.get_edge(key))
+
+    def to_tuple_set_tuple(self):
+        """Return data of the view, in the form (vertices, edges), where
+        vertices is a set of tuples (vertex_key, vertex_value) and
+        edges is a set of tuples (edge_key, source_vertex_key,
+        target_vertex_key, edge_value).
+
+        """
+        return (set(self.iter_vertex_value_tuple()), set(self.iter_edge_source_target_value_tuple()))
+
+    def subgraph(self, vertex_keys):
+        """Return a view of the part of this view induced by the vertex keys"""
+        return GraphView(self, vertex_keys)
+
+    def filtered(self, vertex_pred=None, edge_pred=None):
+        """Return a view of the vertices and edges of this view satisfying the
+        predicates, which are called with a vertex key or an edge key.
+
+        """
+        return GraphView(self, None, vertex_pred, edge_pred)
+
+    def freeze(self):
+        """Return a read-only CSRGraph snapshot of the view"""
+        from graphs.csr import CSRGraph
+        return CSRGraph.from_graph(self)
+
+    def __str__(self):
+        return "<GraphView with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def __repr__(self):
+        return "<GraphView with %d vertices and %d edges>" %(self.num_vertices(), self.num_edges())
+
+    def _start_vertices(self, start_vertices):
+        for v in start_vertices:
+            self._check_vertex(v)
+        return start_vertices
+
+    def bfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in breadth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.bfs, self.iter_neighbors, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'bfs_undirected', num_edges=self._num_incident_edges)
+
+    def bfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in breadth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.bfs, self.iter_target_vertices, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'bfs_directed')
+
+    def dfs_undirected(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices connected to one or more of the start vertices
+        in depth-first order, ignoring direction.  If max_depth is
+        specified, only vertices within max_depth steps of the start
+        vertices are generated.  If stats is a TraversalStats, the work
+        done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.dfs, self.iter_neighbors, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'dfs_undirected', num_edges=self._num_incident_edges)
+
+    def dfs_directed(self, *start_vertices, max_depth=None, stats=None):
+        """Generate vertices that are in directed paths starting with one or
+        more of the start vertices in depth-first order, following
+        direction.  If max_depth is specified, only vertices within
+        max_depth steps of the start vertices are generated.  If stats
+        is a TraversalStats, the work done is recorded in it.
+
+        """
+        return traversal.traverse(traversal.dfs, self.iter_target_vertices, self._start_vertices(start_vertices),
+                                  max_depth, stats, 'dfs_directed')
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+
+from benchmarks.run import run_benchmarks, compare
+
+records = run_benchmarks([200], samples=5, repeat=1)
+assert {r['generator'] for r in records} == {'erdos_renyi', 'barabasi_albert', 'grid'}
+assert {r['operation'] for r in records} == {'add_edge', 'remove_vertex', 'bfs_directed',
+                                             'dfs_undirected', 'copy', 'to_tuple_set_tuple'}
+for r in records:
+    assert r['ops_per_sec'] > 0
+    assert r['peak_bytes'] >= 0
+assert compare(records, records, 0.2) == []
+slower = [dict(r, ops_per_sec=r['ops_per_sec'] / 2) for r in records]
+assert len(compare(slower, records, 0.2)) == len(records)
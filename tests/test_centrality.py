@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.centrality import pagerank, degree_centrality, eigenvector_centrality, hits
+
+
+def close(a, b, tol=1e-4):
+    return set(a) == set(b) and all(abs(a[k] - b[k]) < tol for k in a)
+
+
+def reference_pagerank(graph, damping=0.85, jump=None, iterations=200):
+    vertices = list(graph.iter_vertices())
+    n = len(vertices)
+    if jump is None:
+        jump = {v: 1.0 / n for v in vertices}
+    x = {v: 1.0 / n for v in vertices}
+    for i in range(iterations):
+        new = {v: 0.0 for v in vertices}
+        dangling = 0.0
+        for v in vertices:
+            if graph.outdegree(v):
+                for t in graph.iter_target_vertices(v):
+                    new[t] += damping * x[v] / graph.outdegree(v)
+            else:
+                dangling += damping * x[v]
+        for v in vertices:
+            new[v] += (dangling + 1 - damping) * jump[v]
+        x = new
+    return x
+
+
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("ac", "a", "c")
+g.add_edge("bc", "b", "c")
+g.add_edge("ca", "c", "a")
+g.add_edge("ca2", "c", "a")
+g.add_edge("dc", "d", "c")
+g.add_edge("ce", "c", "e")
+g.add_vertex("f")
+
+ranks = pagerank(g, tol=1e-10)
+assert close(ranks, reference_pagerank(g))
+assert abs(sum(ranks.values()) - 1) < 1e-9
+assert max(ranks, key=ranks.get) == "c"
+assert close(pagerank(g.freeze(), tol=1e-10), ranks)
+
+jump = {"d": 1.0}
+personal = pagerank(g, personalization=jump, tol=1e-10)
+assert close(personal, reference_pagerank(g, jump={v: jump.get(v, 0.0) for v in g.iter_vertices()}))
+assert personal["f"] == 0
+
+# warm-starting from the answer converges immediately
+assert close(pagerank(g, start=ranks, max_iter=2), ranks)
+try:
+    pagerank(g, tol=1e-15, max_iter=2)
+    assert False
+except Exception:
+    pass
+
+degrees = degree_centrality(g)
+assert abs(degrees["c"] - 6 / 5) < 1e-12
+assert abs(degree_centrality(g, "in")["a"] - 2 / 5) < 1e-12
+assert degree_centrality(g, 'out')["f"] == 0
+
+cycle = Graph()
+for i in range(5):
+    cycle.add_edge(i, i, (i + 1) % 5)
+centrality = eigenvector_centrality(cycle)
+assert close(centrality, {i: 5 ** -0.5 for i in range(5)})
+star = Graph()
+for i in range(1, 5):
+    star.add_edge((0, i), 0, i)
+    star.add_edge((i, 0), i, 0)
+centrality = eigenvector_centrality(star, tol=1e-10)
+assert all(centrality[0] > centrality[i] for i in range(1, 5))
+assert close(centrality, eigenvector_centrality(star, start=centrality, max_iter=3))
+
+hubs, authorities = hits(g)
+assert abs(sum(hubs.values()) - 1) < 1e-9
+assert abs(sum(authorities.values()) - 1) < 1e-9
+assert max(hubs, key=hubs.get) == "c"
+assert max(authorities, key=authorities.get) == "a"
+assert hubs["e"] == 0 and authorities["d"] == 0
+assert pagerank(Graph()) == {}
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import random
+from itertools import combinations
+
+from graphs.graph import Graph
+from graphs.clustering import (num_triangles, triangles, clustering, average_clustering,
+                               transitivity, core_number, k_core)
+
+# a square with one diagonal, a pendant vertex, parallel edges, a
+# self-loop and an isolated vertex
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("bc", "b", "c")
+g.add_edge("cd", "c", "d")
+g.add_edge("da", "d", "a")
+g.add_edge("ac", "a", "c")
+g.add_edge("ca", "c", "a")
+g.add_edge("de", "d", "e")
+g.add_edge("ee", "e", "e")
+g.add_vertex("f")
+
+assert num_triangles(g) == 2
+assert triangles(g) == {"a": 2, "b": 1, "c": 2, "d": 1, "e": 0, "f": 0}
+coefficients = clustering(g)
+assert coefficients["a"] == 2 / 3 and coefficients["b"] == 1.0
+assert coefficients["d"] == 1 / 3 and coefficients["e"] == 0.0 and coefficients["f"] == 0.0
+assert abs(average_clustering(g) - (2 / 3 + 1 + 2 / 3 + 1 / 3) / 6) < 1e-12
+# paths of two edges: a 3, b 1, c 3, d 3
+assert transitivity(g) == 3.0 * 2 / 10
+assert core_number(g) == {"a": 2, "b": 2, "c": 2, "d": 2, "e": 1, "f": 0}
+assert k_core(g, 2) == {"a", "b", "c", "d"}
+assert k_core(g, 3) == set()
+assert num_triangles(Graph()) == 0 and transitivity(Graph()) == 0.0
+assert average_clustering(Graph()) == 0.0 and core_number(Graph()) == {}
+
+# compare with brute force on random graphs, and on frozen copies
+random.seed(9)
+for trial in range(10):
+    g = Graph()
+    for i in range(30):
+        g.add_vertex(i)
+    for e in range(random.randrange(150)):
+        g.add_edge(e, random.randrange(30), random.randrange(30))
+    adjacent = {v: set(g.iter_neighbors(v)) - {v} for v in g.iter_vertices()}
+    expected = {v: 0 for v in adjacent}
+    for u, v, w in combinations(range(30), 3):
+        if v in adjacent[u] and w in adjacent[u] and w in adjacent[v]:
+            expected[u] += 1
+            expected[v] += 1
+            expected[w] += 1
+    assert triangles(g) == expected
+    assert triangles(g.freeze()) == expected
+    assert num_triangles(g) == sum(expected.values()) // 3
+    # the k-core by repeatedly removing vertices with fewer than k neighbors
+    cores = core_number(g)
+    for k in range(6):
+        remaining = set(adjacent)
+        changed = True
+        while changed:
+            changed = False
+            for v in list(remaining):
+                if len(adjacent[v] & remaining) < k:
+                    remaining.discard(v)
+                    changed = True
+        assert k_core(g, k) == remaining
+        assert {v for v in cores if cores[v] >= k} == remaining
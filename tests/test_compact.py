@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+
+import random
+import sys
+
+from graphs.graph import Graph
+from graphs.compact import CompactGraph
+
+
+def check_same_graph(graph, compact):
+    assert(compact.num_vertices() == graph.num_vertices())
+    assert(compact.num_edges() == graph.num_edges())
+    assert(compact.to_tuple_set_tuple() == graph.to_tuple_set_tuple())
+    assert(set(compact.iter_vertices()) == set(graph.iter_vertices()))
+    assert(set(compact.iter_edges()) == set(graph.iter_edges()))
+    for v in graph.iter_vertices():
+        assert(compact.is_vertex(v))
+        assert(compact.get_vertex(v) == graph.get_vertex(v))
+        assert(set(compact.iter_outgoing_edges(v)) == set(graph.iter_outgoing_edges(v)))
+        assert(set(compact.iter_incoming_edges(v)) == set(graph.iter_incoming_edges(v)))
+        assert(sorted(compact.iter_target_vertices(v)) == sorted(graph.iter_target_vertices(v)))
+        assert(sorted(compact.iter_source_vertices(v)) == sorted(graph.iter_source_vertices(v)))
+        assert(set(compact.iter_neighbors(v)) == set(graph.iter_neighbors(v)))
+        assert(compact.outdegree(v) == graph.outdegree(v))
+        assert(compact.indegree(v) == graph.indegree(v))
+        assert(compact.degree(v) == graph.degree(v))
+        assert(set(compact.bfs_directed(v)) == set(graph.bfs_directed(v)))
+        assert(set(compact.dfs_undirected(v, max_depth=2)) == set(graph.dfs_undirected(v, max_depth=2)))
+        for w in graph.iter_vertices():
+            assert(compact.is_adjacent(v, w) == graph.is_adjacent(v, w))
+            if graph.is_adjacent(v, w):
+                assert(set(compact.iter_connections(v, w)) == set(graph.iter_connections(v, w)))
+                assert(compact.num_connections(v, w) == graph.num_connections(v, w))
+    for e in graph.iter_edges():
+        assert(compact.get_edge(e) == graph.get_edge(e))
+        assert(compact.get_source(e) == graph.get_source(e))
+        assert(compact.get_target(e) == graph.get_target(e))
+
+
+g = Graph()
+c = CompactGraph()
+assert(str(c) == "<CompactGraph with 0 vertices and 0 edges>")
+random.seed(12)
+for step in range(600):
+    op = random.random()
+    if op < 0.6:
+        key = random.randrange(150)
+        s = random.randrange(25)
+        t = random.randrange(25)
+        if g.is_edge(key):
+            s = g.get_source(key)
+            t = g.get_target(key)
+        value = random.choice([None, step])
+        g.add_edge(key, s, t, value)
+        c.add_edge(key, s, t, value)
+    elif op < 0.8:
+        key = random.randrange(150)
+        assert(c.remove_edge(key) == g.remove_edge(key))
+    elif op < 0.9:
+        key = random.randrange(30)
+        assert(c.remove_vertex(key) == g.remove_vertex(key))
+    else:
+        key = random.randrange(30)
+        g.add_vertex(key, step)
+        c.add_vertex(key, step)
+    if step % 100 == 0:
+        check_same_graph(g, c)
+check_same_graph(g, c)
+
+try:
+    c.add_edge(next(c.iter_edges()), "x", "y")
+    assert(False)
+except Exception:
+    pass
+
+d = c.copy()
+d.remove_vertex(next(d.iter_vertices()))
+check_same_graph(g, c)
+check_same_graph(g, c.freeze())
+check_same_graph(g.subgraph(range(10)), c.subgraph(range(10)))
+e = CompactGraph()
+e.from_tuple_set_tuple(g.to_tuple_set_tuple())
+check_same_graph(g, e)
+c.clear()
+assert(c.num_vertices() == 0 and c.num_edges() == 0)
+
+# the compact graph takes a fraction of the memory
+
+
+def size(graph):
+    seen = set()
+    total = 0
+    stack = [graph]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (int, str, type(None))):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set)):
+            stack.extend(obj)
+        elif hasattr(obj, '__slots__'):
+            stack.extend(getattr(obj, name) for name in obj.__slots__)
+        elif hasattr(obj, '__dict__'):
+            stack.extend(vars(obj).values())
+    return total
+
+
+edges = [(i, random.randrange(1000), random.randrange(1000)) for i in range(20000)]
+g = Graph()
+g.add_edges_from(edges)
+c = CompactGraph()
+c.add_edges_from(edges)
+assert(size(c) * 4 < size(g))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.csr import CSRGraph
+
+
+def check_same_graph(graph, frozen):
+    assert(frozen.num_vertices() == graph.num_vertices())
+    assert(frozen.num_edges() == graph.num_edges())
+    assert(frozen.to_tuple_set_tuple() == graph.to_tuple_set_tuple())
+    for v in graph.iter_vertices():
+        assert(frozen.is_vertex(v))
+        assert(frozen.get_vertex(v) == graph.get_vertex(v))
+        assert(set(frozen.iter_outgoing_edges(v)) == set(graph.iter_outgoing_edges(v)))
+        assert(set(frozen.iter_incoming_edges(v)) == set(graph.iter_incoming_edges(v)))
+        assert(sorted(frozen.iter_target_vertices(v)) == sorted(graph.iter_target_vertices(v)))
+        assert(sorted(frozen.iter_source_vertices(v)) == sorted(graph.iter_source_vertices(v)))
+        assert(set(frozen.iter_neighbors(v)) == set(graph.iter_neighbors(v)))
+        assert(frozen.outdegree(v) == graph.outdegree(v))
+        assert(frozen.indegree(v) == graph.indegree(v))
+        assert(frozen.degree(v) == graph.degree(v))
+        assert(frozen.vertex_key(frozen.vertex_id(v)) == v)
+        for w in graph.iter_vertices():
+            assert(frozen.is_adjacent(v, w) == graph.is_adjacent(v, w))
+            if graph.is_adjacent(v, w):
+                assert(set(frozen.iter_connections(v, w)) == set(graph.iter_connections(v, w)))
+                assert(frozen.num_connections(v, w) == graph.num_connections(v, w))
+            else:
+                assert(frozen.num_connections(v, w) == 0)
+    for e in graph.iter_edges():
+        assert(frozen.is_edge(e))
+        assert(frozen.get_edge(e) == graph.get_edge(e))
+        assert(frozen.get_source(e) == graph.get_source(e))
+        assert(frozen.get_target(e) == graph.get_target(e))
+
+
+g = Graph()
+check_same_graph(g, g.freeze())
+assert(str(g.freeze()) == "<CSRGraph with 0 vertices and 0 edges>")
+
+g.add_vertex("spam", "eggs")
+for i in range(0, 6):
+    for j in range(0, 6):
+        if (i + 2 * j) % 3 == 1:
+            g.add_edge(str(i)+","+str(j), i, j, i+j)
+g.add_edge("parallel", 1, 3, "value")
+g.add_edge("loop", 1, 1)
+f = g.freeze()
+check_same_graph(g, f)
+assert(isinstance(f, CSRGraph))
+assert(str(f) == "<CSRGraph with 7 vertices and 14 edges>")
+assert(f.num_connections(1, 3) == 2)
+check_same_graph(f.to_graph(), CSRGraph.from_graph(f))
+
+# the snapshot is independent of later changes
+g.remove_vertex(0)
+assert(f.is_vertex(0))
+assert(f.num_edges() == 14)
+
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("ac", "a", "c")
+g.add_edge("ad", "a", "d")
+g.add_edge("be", "b", "e")
+g.add_edge("cf", "c", "f")
+g.add_edge("dg", "d", "g")
+g.add_vertex("h")
+f = g.freeze()
+
+s = [x for x in f.bfs_directed("a")]
+assert s[0] == 'a'
+assert set(s[1:4]) == {'b', 'c', 'd'}
+assert set(s[4:7]) == {'e', 'f', 'g'}
+s = [x for x in f.dfs_directed("a")]
+assert s[0] == 'a'
+assert {s[1], s[3], s[5]} == {'b', 'c', 'd'}
+assert {s[2], s[4], s[6]} == {'e', 'f', 'g'}
+assert [x for x in f.bfs_directed("e")] == ['e']
+assert set(f.bfs_undirected("e")) == set("abcdefg")
+assert set(f.dfs_undirected("e", "h")) == set("abcdefgh")
+s = [x for x in f.bfs_directed("a", max_depth=1)]
+assert s[0] == 'a'
+assert set(s[1:]) == {'b', 'c', 'd'}
+assert [x for x in f.dfs_directed("a", max_depth=0)] == ['a']
+assert set(f.dfs_undirected("e", max_depth=2)) == {'e', 'b', 'a'}
+
+# binary files
+import os
+import pickle
+import shutil
+import tempfile
+
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "graph.bin")
+g.add_edge("hh", "h", "h", ("weight", 2))
+g.save(path)
+for use_mmap in (True, False):
+    loaded = Graph.load(path, mmap=use_mmap)
+    check_same_graph(g, loaded)
+    assert(loaded.get_edge("hh") == ("weight", 2))
+    assert(set(loaded.bfs_directed("a")) == set("abcdefg"))
+    loaded.save(path + "2")
+    check_same_graph(g, CSRGraph.load(path + "2"))
+    check_same_graph(g, pickle.loads(pickle.dumps(loaded)))
+    assert (b"graph.bin" in pickle.dumps(loaded)) == use_mmap #mapped again from the file
+    # once the keys and values are unpickled too
+    loaded.get_vertex("a")
+    check_same_graph(g, pickle.loads(pickle.dumps(loaded)))
+check_same_graph(g, pickle.loads(pickle.dumps(g.freeze())))
+path = os.path.join(directory, "empty.bin")
+Graph().save(path)
+assert(Graph.load(path).to_tuple_set_tuple() == (set(), set()))
+shutil.rmtree(directory)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import sys
+
+from graphs.graph import Graph
+from graphs.dag import strongly_connected_components, topological_sort, find_cycle
+
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("bc", "b", "c")
+g.add_edge("ca", "c", "a")
+g.add_edge("cd", "c", "d")
+g.add_edge("de", "d", "e")
+g.add_edge("ed", "e", "d")
+g.add_edge("ef", "e", "f")
+g.add_vertex("g")
+
+components = list(strongly_connected_components(g))
+assert sorted(sorted(c) for c in components) == [['a', 'b', 'c'], ['d', 'e'], ['f'], ['g']]
+# components come after everything reachable from them
+assert components.index({'f'}) < components.index({'d', 'e'}) < components.index({'a', 'b', 'c'})
+assert list(g.strongly_connected_components()) == components
+
+cycle = find_cycle(g)
+assert cycle is not None
+for i in range(len(cycle)):
+    assert g.get_target(cycle[i]) == g.get_source(cycle[(i + 1) % len(cycle)])
+assert g.find_cycle("f", "g") is None
+assert sorted(find_cycle(g, "e")) == ["de", "ed"]
+
+try:
+    topological_sort(g)
+    assert False
+except Exception:
+    pass
+
+g.remove_edge("ca")
+g.remove_edge("ed")
+order = g.topological_sort()
+assert sorted(order) == sorted(g.iter_vertices())
+for e in g.iter_edges():
+    assert order.index(g.get_source(e)) < order.index(g.get_target(e))
+assert find_cycle(g) is None
+
+g.add_edge("ff", "f", "f")
+assert g.find_cycle() == ["ff"]
+
+# paths much longer than the recursion limit
+n = sys.getrecursionlimit() * 5
+g = Graph()
+for i in range(n):
+    g.add_edge(i, i, i + 1)
+assert g.topological_sort() == list(range(n + 1))
+assert len(list(g.strongly_connected_components())) == n + 1
+assert g.find_cycle() is None
+g.add_edge("back", n, 0)
+assert len(list(g.strongly_connected_components())) == 1
+assert len(g.find_cycle()) == n + 1
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+
+import io
+import os
+import shutil
+import tempfile
+
+from graphs.graph import Graph
+from graphs.edgelist import iter_edgelist, read_edgelist
+
+g = Graph()
+g.add_edge("ab", "a", "b", "x")
+g.add_edge("bc", "b", "c")
+g.add_edge("c,a", "c", "a", "quoted, value")
+g.add_edge("cc", "c", "c", "")
+
+directory = tempfile.mkdtemp()
+for fmt in ('csv', 'tsv', 'jsonl'):
+    path = os.path.join(directory, "edges." + fmt)
+    g.write_edgelist(path, fmt)
+    h = Graph()
+    assert h.read_edgelist(path, fmt, chunk_size=3) == 4
+    expected = g.to_tuple_set_tuple()
+    if fmt != 'jsonl':
+        # empty strings come back as None
+        expected = (expected[0], {(k, s, t, None if v == "" else v) for k, s, t, v in expected[1]})
+    assert h.to_tuple_set_tuple() == expected
+shutil.rmtree(directory)
+
+# typed keys and values survive jsonl
+g = Graph()
+g.add_edge(1, 2, 3, {"weight": 1.5})
+f = io.StringIO()
+g.write_edgelist(f, 'jsonl')
+f.seek(0)
+assert list(iter_edgelist(f, 'jsonl')) == [(1, 2, 3, {"weight": 1.5})]
+
+# three columns, blank lines, and reading into a graph with edges already
+f = io.StringIO("key,source,target\ne1,u,v\n\ne2,v,w\n")
+h = Graph()
+h.add_edge("e0", "t", "u")
+assert read_edgelist(h, f) == 2
+assert sorted(h.iter_edges()) == ["e0", "e1", "e2"]
+assert h.get_edge("e1") is None
+assert list(h.bfs_directed("t")) == ["t", "u", "v", "w"]
+try:
+    h.write_edgelist(io.StringIO(), 'xml')
+    assert False
+except ValueError:
+    pass
+
+# a row of the wrong length, such as a truncated last line, is named
+for text, line in (("key,source,target\ne1,u,v\n\ne2,v\n", 4), ("key,source,target\ne1,u,v,w,x\n", 2)):
+    try:
+        list(iter_edgelist(io.StringIO(text)))
+        assert False
+    except ValueError as e:
+        assert "line %d " % line in str(e)
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.flow import max_flow, min_cut
+
+# the network from Cormen et al., with the 12 capacity split over
+# parallel edges
+g = Graph()
+g.add_edge("s1", "s", 1, 16)
+g.add_edge("s2", "s", 2, 13)
+g.add_edge("12", 1, 2, 10)
+g.add_edge("21", 2, 1, 4)
+g.add_edge("13", 1, 3, 5)
+g.add_edge("13'", 1, 3, 7)
+g.add_edge("32", 3, 2, 9)
+g.add_edge("24", 2, 4, 14)
+g.add_edge("43", 4, 3, 7)
+g.add_edge("3t", 3, "t", 20)
+g.add_edge("4t", 4, "t", 4)
+g.add_edge("loop", 4, 4, 100)
+g.add_vertex("z")
+
+value, flows = max_flow(g, "s", "t")
+assert value == 23
+assert all(0 <= flows[e] <= g.get_edge(e) for e in g.iter_edges())
+for v in g.iter_vertices():
+    if v not in ("s", "t"):
+        assert sum(flows[e] for e in g.iter_incoming_edges(v)) == sum(flows[e] for e in g.iter_outgoing_edges(v))
+assert sum(flows[e] for e in g.iter_outgoing_edges("s")) == 23
+
+value, source_side, cut_edges = min_cut(g, "s", "t")
+assert value == 23
+assert "s" in source_side and "t" not in source_side
+assert sum(g.get_edge(e) for e in cut_edges) == 23
+assert all(g.get_source(e) in source_side and g.get_target(e) not in source_side for e in cut_edges)
+
+assert max_flow(g, "s", "z")[0] == 0
+assert max_flow(g, "s", "t", capacity=lambda value: 1)[0] == 2
+
+# a long chain is handled without recursion
+chain = Graph()
+for i in range(5000):
+    chain.add_edge(i, i, i + 1, 3)
+assert max_flow(chain, 0, 5000)[0] == 3
+try:
+    max_flow(g, "s", "s")
+    assert False
+except ValueError:
+    pass
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+
+from graphs.generators import erdos_renyi, barabasi_albert, grid, barabasi_albert_edges
+
+g = erdos_renyi(50, 200, seed=1)
+assert g.num_vertices() == 50
+assert g.num_edges() == 200
+assert erdos_renyi(50, 200, seed=1).to_tuple_set_tuple() == g.to_tuple_set_tuple()
+
+g = barabasi_albert(200, 3, seed=2)
+assert g.num_vertices() == 200
+assert g.num_edges() == 3 * (200 - 3)
+for v in range(3, 200):
+    assert g.outdegree(v) == 3
+    assert all(t < v for t in g.iter_target_vertices(v))
+# early vertices collect most of the edges
+assert max(g.indegree(v) for v in range(10)) > 3 * max(g.indegree(v) for v in range(150, 200))
+try:
+    barabasi_albert_edges(3, 3)
+    assert False
+except ValueError:
+    pass
+
+g = grid(3, 4)
+assert g.num_vertices() == 12
+assert g.num_edges() == 3 * 3 + 2 * 4
+assert set(g.iter_target_vertices(5)) == {6, 9}
+assert set(g.iter_target_vertices(11)) == set()
+assert list(g.bfs_directed(0))[-1] == 11
+assert grid(0, 0).num_vertices() == 0
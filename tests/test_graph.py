@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
 
+import pickle
+import random
+
 from graphs.graph import Graph
 
 
@@ -152,3 +155,315 @@ s = [x for x in g.dfs_directed("a")]
 assert s[0] == 'a'
 assert {s[1], s[3], s[5]} == {'b', 'c', 'd'}
 assert {s[2], s[4], s[6]} == {'e', 'f', 'g'}
+
+s = [x for x in g.bfs_directed("a", max_depth=1)]
+assert s[0] == 'a'
+assert set(s[1:]) == {'b', 'c', 'd'}
+assert [x for x in g.dfs_directed("a", max_depth=0)] == ['a']
+assert set(g.dfs_undirected("e", max_depth=2)) == {'e', 'b', 'a'}
+assert set(g.bfs_undirected("e")) == {'a', 'b', 'c', 'd', 'e', 'f', 'g'}
+
+# traversals keep no state on the graph, so they can be interleaved
+t1 = g.bfs_directed("a")
+t2 = g.dfs_directed("a")
+s1 = []
+s2 = []
+for x, y in zip(t1, t2):
+    s1.append(x)
+    s2.append(y)
+assert set(s1) == set(s2) == {'a', 'b', 'c', 'd', 'e', 'f', 'g'}
+
+# connected components index
+g = Graph()
+g.track_components()
+for i in range(0, 10):
+    g.add_edge(str(i)+"->"+str(i+1), i, i+1)
+g.add_edge("parallel", 5, 4)
+g.add_vertex("spam")
+assert g.same_component(0, 10)
+assert not g.same_component(0, "spam")
+assert g.component_of(3) == g.component_of(7)
+assert g.num_components() == 2
+g.remove_edge("4->5")
+assert g.same_component(0, 10)
+assert not g._components_stale
+g.remove_edge("parallel")
+assert not g.same_component(0, 10)
+assert g.same_component(0, 4)
+assert g.num_components() == 3
+g.remove_vertex("spam")
+assert g.num_components() == 2
+g.remove_vertex(2)
+assert g.num_components() == 3
+g.add_edge("bridge", 0, 10)
+assert g.same_component(1, 9)
+assert g.copy().num_components() == 2
+g.clear()
+assert g.num_components() == 0
+# removing an edge of a short cycle leaves the index as it was, while
+# on a long one it is rebuilt
+for size, stale in ((10, False), (1000, True)):
+    g = Graph()
+    g.track_components()
+    for i in range(size):
+        g.add_edge(i, i, (i + 1) % size)
+    g.add_edge("tail", 0, "t")
+    assert g.num_components() == 1
+    g.remove_edge(size // 2)
+    assert g._components_stale == stale
+    assert g.same_component(size // 2, size // 2 + 1) and g.num_components() == 1
+    g.remove_edge(0)
+    assert g.num_components() == 2 and g.same_component(0, "t")
+# removing a leaf splits nothing, and removing a middle vertex does
+g = Graph()
+g.track_components()
+for i in range(9):
+    g.add_edge(i, i, i + 1)
+assert g.num_components() == 1
+g.remove_vertex(9)
+assert not g._components_stale
+assert g.num_components() == 1 and g.same_component(0, 8) and not g.is_vertex(9)
+g.add_vertex(9)
+assert g.num_components() == 2 and not g.same_component(0, 9)
+g.remove_vertex(4)
+assert g.num_components() == 3 and not g.same_component(0, 8)
+# the index agrees with a search through random removals
+for seed in range(50):
+    random.seed(seed)
+    g = Graph()
+    g.track_components()
+    for e in range(40):
+        g.add_edge(e, random.randrange(20), random.randrange(20))
+    for step in range(15):
+        if random.random() < 0.5:
+            g.remove_vertex(random.randrange(20))
+        else:
+            g.remove_edge(random.randrange(40))
+        for v in g.iter_vertices():
+            assert {w for w in g.iter_vertices() if g.same_component(v, w)} == set(g.bfs_undirected(v))
+
+# bulk loading
+g = Graph()
+g.add_vertex("spam", "eggs")
+g.add_edges_from([("a", 1, 2), ("b", 2, 3, "value"), ("c", 1, 2, 7), ("d", 3, 3)])
+check_graph_validity(g)
+assert g.num_connections(1, 2) == 2
+assert g.get_edge("b") == "value"
+g.add_edges_from([("b", 2, 3, "new value")])
+assert g.get_edge("b") == "new value"
+try:
+    g.add_edges_from([("b", 3, 2)])
+    assert False
+except Exception:
+    pass
+assert g.get_source("b") == 2
+
+g = Graph.from_arrays([0, 1, 2, 2], [1, 2, 0, 0])
+check_graph_validity(g)
+assert sorted(g.iter_edges()) == [0, 1, 2, 3]
+assert g.num_connections(2, 0) == 2
+g = Graph.from_arrays(range(5), range(1, 6), keys="abcde", values=range(5))
+check_graph_validity(g)
+assert g.get_edge("c") == 2
+assert g.get_target("e") == 5
+assert list(g.bfs_directed(0)) == [0, 1, 2, 3, 4, 5]
+for lengths in ({'keys': ['a', 'b']}, {'values': [5]}, {'keys': 'abcd'}):
+    try:
+        Graph.from_arrays([0, 1, 2], [1, 2, 3], **lengths)
+        assert False
+    except ValueError:
+        pass
+
+# copies share nothing observable
+g = Graph()
+for i in range(0, 6):
+    g.add_edge(str(i)+"->"+str(i+1), i, i+1, i)
+g.add_edge("parallel", 2, 3)
+before = g.to_tuple_set_tuple()
+h = g.copy()
+assert h._outgoing_edges is g._outgoing_edges
+h.add_edge("new", 2, 3)
+h.remove_edge("3->4")
+h.add_vertex(0, "zero")
+h.remove_vertex(5)
+h.add_edge("0->1", 0, 1, "changed")
+check_graph_validity(g)
+check_graph_validity(h)
+assert g.to_tuple_set_tuple() == before
+assert g.num_connections(2, 3) == 2
+assert h.num_connections(2, 3) == 3
+assert not h.is_adjacent(3, 4)
+# the untouched vertices' sets are still shared
+assert h._outgoing_edges[1] is g._outgoing_edges[1]
+k = h.copy()
+g.remove_vertex(2)
+g.add_edge("2->3", 2, 3)
+h.clear()
+check_graph_validity(g)
+check_graph_validity(k)
+assert h.num_vertices() == 0
+assert k.num_connections(2, 3) == 3
+assert g.num_connections(2, 3) == 1
+assert k.get_vertex(0) == "zero"
+assert g.get_vertex(0) is None
+k.add_edges_from([("bulk", 0, 6)])
+check_graph_validity(k)
+assert not g.is_vertex(6) or not g.is_adjacent(0, 6)
+
+# a change after a copy shares the tables rather than copying them, and
+# snapshots taken between changes each keep their own state
+g = Graph()
+for i in range(60):
+    g.add_edge(i, i, i + 1, i)
+snapshots = []
+merged = False
+for i in range(40):
+    snapshots.append((g.copy(), g.to_tuple_set_tuple()))
+    g.add_edge(("extra", i), i, i + 2)
+    g.remove_edge(i)
+    g.add_vertex(i, "changed")
+    if i == 0:
+        assert g._edges.base is snapshots[0][0]._edges
+    merged = merged or type(g._edges) is dict
+check_graph_validity(g)
+assert merged #once the changes grew
+for snapshot, data in snapshots:
+    assert snapshot.to_tuple_set_tuple() == data
+check_graph_validity(snapshots[20][0])
+snapshot, data = snapshots[-1]
+assert pickle.loads(pickle.dumps(snapshot)).to_tuple_set_tuple() == data
+snapshot.add_edge("last", 0, 1)
+assert pickle.loads(pickle.dumps(snapshot)).to_tuple_set_tuple() == snapshot.to_tuple_set_tuple()
+# once merged, a changed copy shares no sets and bulk loads quickly again
+g = Graph()
+for i in range(60):
+    g.add_edge(i, i, i + 1)
+before = g.to_tuple_set_tuple()
+h = g.copy()
+for i in range(100):
+    h.add_vertex(i, "changed")
+assert type(h._edges) is dict and h._owned_vertices is None and not h._shared
+assert all(h._neighbors[v] is not g._neighbors[v] for v in g.iter_vertices())
+assert all(h._connections[pair] is not g._connections[pair] for pair in g._connections)
+h.add_edges_from([("bulk", 0, 2), ("bulk2", 5, 5)])
+h.remove_edge(3)
+check_graph_validity(h)
+assert g.to_tuple_set_tuple() == before
+
+# journal and subscriptions
+g = Graph()
+g.add_edge("ab", "a", "b")
+start = g.version()
+g.enable_journal()
+seen = []
+g.subscribe(seen.append)
+replica = g.copy()
+
+
+def replay(graph, change):
+    if change.operation == 'add_vertex':
+        graph.add_vertex(change.key, change.value)
+    elif change.operation == 'add_edge':
+        graph.add_edge(change.key, change.source, change.target, change.value)
+    elif change.operation == 'remove_edge':
+        graph.remove_edge(change.key)
+    elif change.operation == 'remove_vertex':
+        graph.remove_vertex(change.key)
+    elif change.operation == 'clear':
+        graph.clear()
+
+
+g.add_edge("bc", "b", "c", 1)
+g.add_edge("bc", "b", "c", 2)
+g.add_vertex("d", "dee")
+g.add_vertex("d")
+g.add_edges_from([("cd", "c", "d"), ("da", "d", "a")])
+g.remove_vertex("b")
+g.remove_edge("missing")
+changes = g.changes_since(start)
+assert [c.operation for c in changes] == ['add_vertex', 'add_edge', 'add_edge', 'add_vertex',
+                                          'add_edge', 'add_edge', 'remove_edge', 'remove_edge',
+                                          'remove_vertex']
+assert changes[2] == (start + 3, 'add_edge', 'bc', 'b', 'c', 2)
+assert [c.version for c in changes] == list(range(start + 1, g.version() + 1))
+assert seen == changes
+assert g.changes_since(g.version()) == []
+assert g.changes_since(changes[-2].version) == changes[-1:]
+for change in changes:
+    replay(replica, change)
+assert replica.to_tuple_set_tuple() == g.to_tuple_set_tuple()
+try:
+    g.changes_since(start - 1)
+    assert False
+except Exception:
+    pass
+
+g.unsubscribe(seen.append)
+g.enable_journal(maxlen=2)
+g.clear()
+g.add_vertex("x")
+g.add_vertex("y")
+assert len(seen) == len(changes)
+assert [c.operation for c in g.changes_since(g.version() - 2)] == ['add_vertex', 'add_vertex']
+try:
+    g.changes_since(g.version() - 3)
+    assert False
+except Exception:
+    pass
+g.disable_journal()
+g.add_vertex("z")
+
+# secondary indexes
+g = Graph()
+g.add_vertex("a", {"team": "red"})
+g.add_edge("ab", "a", "b", {"kind": "depends"})
+g.add_edge("ac", "a", "c", {"kind": "owns"})
+kind = g.create_index('edge', lambda value: value and value["kind"])
+team = g.create_index('vertex', lambda value: value and value["team"], name="team")
+assert team == "team"
+assert g.find_edges(kind, "depends") == {"ab"}
+assert g.find_vertices("team", "red") == {"a"}
+g.add_edge("bc", "b", "c", {"kind": "depends"})
+g.add_edge("xy", "x", "y")
+g.add_edges_from([("cd", "c", "d", {"kind": "depends"})])
+assert g.find_edges(kind, "depends") == {"ab", "bc", "cd"}
+g.add_edge("ab", "a", "b", {"kind": "owns"})
+assert g.find_edges(kind, "depends") == {"bc", "cd"}
+assert g.find_edges(kind, "owns") == {"ab", "ac"}
+g.add_vertex("b", {"team": "red"})
+g.add_vertex("a", {"team": "blue"})
+assert g.find_vertices("team", "red") == {"b"}
+g.remove_vertex("c")
+assert g.find_edges(kind, "depends") == set()
+assert g.find_edges(kind, "owns") == {"ab"}
+g.remove_vertex("b")
+assert g.find_vertices("team", "red") == set()
+assert g.find_vertices("team", "blue") == {"a"}
+try:
+    g.create_index('vertex', len, name="team")
+    assert False
+except Exception:
+    pass
+g.drop_index("team")
+try:
+    g.find_vertices("team", "blue")
+    assert False
+except KeyError:
+    pass
+g.clear()
+assert g.find_edges(kind, "owns") == set()
+
+# bulk loading counts each vertex and edge added as a change, as
+# add_edge does
+g2 = Graph()
+g2.add_edge("ab", "a", "b")
+start = g2.version()
+g2.add_edges_from([("bc", "b", "c"), ("cd", "c", "d", 1), ("ab", "a", "b", 2)])
+one_by_one = Graph()
+one_by_one.add_edge("ab", "a", "b")
+for edge in [("bc", "b", "c"), ("cd", "c", "d", 1), ("ab", "a", "b", 2)]:
+    one_by_one.add_edge(*edge)
+assert g2.version() == one_by_one.version() == start + 5
+g3 = Graph()
+g3.from_tuple_set_tuple(({("lonely", None)}, {("xy", "x", "y", None)}))
+assert g3.version() == 4
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import random
+from collections import Counter
+from itertools import permutations
+
+from graphs.graph import Graph
+from graphs.isomorphism import subgraph_matches, find_subgraph
+
+
+def brute_force(host, pattern, vertex_label=None, edge_label=None, induced=False):
+    # every injective mapping checked edge by edge
+    result = []
+    keys = list(pattern.iter_vertices())
+    edge_labels = lambda graph, s, t: Counter(
+        None if edge_label is None else edge_label(graph.get_edge(e))
+        for e in graph.iter_edges() if graph.get_source(e) == s and graph.get_target(e) == t)
+    for images in permutations(list(host.iter_vertices()), len(keys)):
+        f = dict(zip(keys, images))
+        if vertex_label is not None and any(
+                vertex_label(pattern.get_vertex(v)) != vertex_label(host.get_vertex(f[v])) for v in keys):
+            continue
+        good = True
+        for v in keys:
+            for w in keys:
+                wanted = edge_labels(pattern, v, w)
+                found = edge_labels(host, f[v], f[w])
+                if any(found[label] < count for label, count in wanted.items()):
+                    good = False
+                if induced and not wanted and found:
+                    good = False
+        if good:
+            result.append(f)
+    return result
+
+
+def as_set(matches):
+    return {tuple(sorted(m.items(), key=repr)) for m in matches}
+
+
+# a directed triangle in a host with two of them and a decoy
+host = Graph()
+for key, s, t in [(1, "a", "b"), (2, "b", "c"), (3, "c", "a"), (4, "c", "d"),
+                  (5, "d", "e"), (6, "e", "c"), (7, "x", "y"), (8, "y", "z"), (9, "x", "z")]:
+    host.add_edge(key, s, t)
+triangle = Graph()
+triangle.add_edge("pq", "p", "q")
+triangle.add_edge("qr", "q", "r")
+triangle.add_edge("rp", "r", "p")
+matches = list(subgraph_matches(host, triangle))
+assert len(matches) == 6
+assert {frozenset(m.values()) for m in matches} == {frozenset("abc"), frozenset("cde")}
+assert find_subgraph(host, triangle) in matches
+
+# labels prune the matches
+host.add_vertex("a", "router")
+triangle.add_vertex("p", "router")
+assert list(subgraph_matches(host, triangle, vertex_label=lambda value: value)) == [
+    {"p": "a", "q": "b", "r": "c"}]
+# induced matching rejects the extra edge of a host triangle with a chord
+path = Graph()
+path.add_edge("uv", "u", "v")
+path.add_edge("vw", "v", "w")
+assert {"u": "x", "v": "y", "w": "z"} in list(subgraph_matches(host, path))
+assert {"u": "x", "v": "y", "w": "z"} not in list(subgraph_matches(host, path, induced=True))
+assert find_subgraph(path, triangle) is None
+
+# the generator is lazy: the first match comes without finding the rest
+big = Graph()
+for i in range(100000):
+    big.add_edge(i, i, i + 1)
+assert next(subgraph_matches(big, path)) is not None
+
+random.seed(21)
+for trial in range(25):
+    host = Graph()
+    for i in range(7):
+        host.add_vertex(i, random.randrange(2))
+    for e in range(random.randrange(6, 16)):
+        host.add_edge(e, random.randrange(7), random.randrange(7), random.randrange(2))
+    pattern = Graph()
+    n = random.randrange(1, 4)
+    for i in range(n):
+        pattern.add_vertex("p%d" % i, random.randrange(2))
+    for e in range(random.randrange(4)):
+        pattern.add_edge(e, "p%d" % random.randrange(n), "p%d" % random.randrange(n), random.randrange(2))
+    label = lambda value: value
+    for options in ({}, {'induced': True}, {'vertex_label': label, 'edge_label': label}):
+        assert as_set(subgraph_matches(host, pattern, **options)) == as_set(brute_force(host, pattern, **options))
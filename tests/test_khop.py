@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import random
+
+from graphs.graph import Graph
+from graphs.khop import KHopCache
+
+
+def expected(graph, v, k, direction):
+    if direction == 'out':
+        return set(graph.bfs_directed(v, max_depth=k))
+    if direction == 'in':
+        reverse = Graph()
+        for key, source, target, value in graph.iter_edge_source_target_value_tuple():
+            reverse.add_edge(key, target, source)
+        reverse.add_vertex(v)
+        return set(reverse.bfs_directed(v, max_depth=k))
+    return set(graph.bfs_undirected(v, max_depth=k))
+
+
+g = Graph()
+for i in range(5):
+    g.add_edge(i, i, i + 1)
+g.add_edge("x", 0, 10)
+assert g.k_hop(0, 2) == {0, 1, 2, 10}
+assert g.k_hop(2, 2, 'in') == {0, 1, 2}
+assert g.k_hop(2, 1, 'both') == {1, 2, 3}
+assert g.k_hop(3, 0) == {3}
+cache = g._k_hop_cache
+assert cache.misses == 4 and cache.hits == 0
+g.k_hop(0, 2)
+assert cache.hits == 1
+
+# an edge from a vertex at the edge of a neighborhood keeps its entry
+g.add_edge("far", 2, 20)
+assert (0, 2, 'out') in cache._entries
+assert g.k_hop(0, 2) == {0, 1, 2, 10}
+assert cache.hits == 2
+# an edge from inside drops it
+g.add_edge("near", 1, 30)
+assert (0, 2, 'out') not in cache._entries
+assert g.k_hop(0, 2) == {0, 1, 2, 10, 30}
+g.remove_edge("near")
+assert g.k_hop(0, 2) == {0, 1, 2, 10}
+g.remove_vertex(3)
+assert g.k_hop(2, 1, 'both') == {1, 2, 20}
+try:
+    g.k_hop(3, 1)
+    assert False
+except KeyError:
+    pass
+try:
+    g.k_hop(0, 1, 'sideways')
+    assert False
+except ValueError:
+    pass
+g.clear()
+assert len(cache) == 0
+
+# the cache stays consistent with traversals under random changes
+random.seed(5)
+g = Graph()
+for i in range(40):
+    g.add_vertex(i)
+cache = KHopCache(g, maxsize=50)
+for step in range(400):
+    r = random.random()
+    if r < 0.4:
+        g.add_edge(step, random.randrange(40), random.randrange(40))
+    elif r < 0.55 and g.num_edges():
+        g.remove_edge(random.choice(list(g.iter_edges())))
+    else:
+        v = random.randrange(40)
+        if g.is_vertex(v):
+            k = random.randrange(4)
+            direction = random.choice(('out', 'in', 'both'))
+            assert cache.get(v, k, direction) == expected(g, v, k, direction)
+    if step == 300:
+        g.remove_vertex(7)
+    assert len(cache) <= 50
+assert cache.hits > 0
+cache.close()
+g.add_edge("after", 0, 1)
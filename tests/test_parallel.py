@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.parallel import betweenness_centrality, all_pairs_distances
+
+
+def close(a, b, tol=1e-9):
+    return set(a) == set(b) and all(abs(a[k] - b[k]) < tol for k in a)
+
+
+# a path a -> b -> c -> d, with two routes from d to e
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("bc", "b", "c")
+g.add_edge("cd", "c", "d")
+g.add_edge("dx", "d", "x")
+g.add_edge("dy", "d", "y")
+g.add_edge("xe", "x", "e")
+g.add_edge("ye", "y", "e")
+g.add_vertex("lonely")
+
+raw = betweenness_centrality(g, normalized=False, processes=1)
+assert close(raw, {"a": 0, "b": 5, "c": 8, "d": 9, "x": 2, "y": 2, "e": 0, "lonely": 0})
+normalized = betweenness_centrality(g, processes=1)
+assert close(normalized, {k: v / 42 for k, v in raw.items()})
+assert close(betweenness_centrality(g, normalized=False, processes=3), raw)
+
+distances = all_pairs_distances(g, processes=1)
+assert distances["a"] == {"a": 0, "b": 1, "c": 2, "d": 3, "x": 4, "y": 4, "e": 5}
+assert distances["e"] == {"e": 0}
+assert distances["lonely"] == {"lonely": 0}
+assert all_pairs_distances(g, processes=2) == distances
+
+big = Graph()
+for i in range(60):
+    big.add_edge((i, "next"), i, (i + 1) % 60)
+    big.add_edge((i, "skip"), i, (i + 7) % 60)
+assert close(betweenness_centrality(big, processes=4), betweenness_centrality(big.freeze(), processes=1))
+assert all_pairs_distances(big, processes=4) == all_pairs_distances(big, processes=1)
+assert betweenness_centrality(Graph()) == {}
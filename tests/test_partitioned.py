@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+import io
+import random
+
+from graphs.edgelist import iter_edgelist, write_edgelist
+from graphs.graph import Graph
+from graphs.partitioned import PartitionedGraph
+
+
+def levels(order, distances):
+    # the depths of the generated vertices never decrease
+    depths = [distances[v] for v in order]
+    return depths == sorted(depths)
+
+
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("bc", "b", "c")
+g.add_edge("cd", "c", "d")
+g.add_edge("ad", "a", "d")
+g.add_edge("xy", "x", "y")
+g.add_edge("zy", "z", "y")
+g.add_vertex("lonely")
+g.add_vertex(None)
+
+for scheme in ('hash', 'range'):
+    with PartitionedGraph(g, 3, scheme) as pg:
+        assert pg.num_partitions() == 3 and pg.num_vertices() == 9
+        assert pg.is_vertex(None) and not pg.is_vertex("q")
+        assert 0 <= pg.partition_of("a") < 3
+        order = list(pg.bfs_directed("a"))
+        assert set(order) == {"a", "b", "c", "d"}
+        assert levels(order, {"a": 0, "b": 1, "d": 1, "c": 2})
+        assert set(pg.bfs_directed("a", max_depth=1)) == {"a", "b", "d"}
+        assert set(pg.bfs_directed("x")) == {"x", "y"}
+        assert set(pg.bfs_undirected("x")) == {"x", "y", "z"}
+        assert set(pg.bfs_directed("x", "z")) == {"x", "y", "z"}
+        components = pg.connected_components()
+        assert sorted(map(len, components)) == [1, 1, 3, 4]
+        assert {"x", "y", "z"} in components and {None} in components
+    try:
+        list(pg.bfs_directed("a"))
+        assert False
+    except Exception:
+        pass
+
+try:
+    PartitionedGraph(g, 2, 'round robin')
+    assert False
+except ValueError:
+    pass
+
+# agree with Graph on a random graph, with more partitions than needed
+random.seed(4)
+g = Graph()
+for i in range(200):
+    g.add_vertex(i)
+for e in range(220):
+    g.add_edge(e, random.randrange(200), random.randrange(200))
+expected = {}
+for v in g.iter_vertices():
+    if v not in expected:
+        component = set(g.bfs_undirected(v))
+        for w in component:
+            expected[w] = component
+for scheme in ('hash', 'range'):
+    with PartitionedGraph(g, 4, scheme) as pg:
+        for v in (0, 17, 99):
+            assert set(pg.bfs_directed(v)) == set(g.bfs_directed(v))
+            assert set(pg.bfs_undirected(v, max_depth=2)) == set(g.bfs_undirected(v, max_depth=2))
+        components = pg.connected_components()
+        assert sum(map(len, components)) == 200
+        assert all(expected[next(iter(c))] == c for c in components)
+    # the same graph streamed from its edges, and from an edge list file
+    edges = g.iter_edge_source_target_value_tuple()
+    with PartitionedGraph.from_edges(edges, 4, scheme, vertices=g.iter_vertices()) as pg:
+        assert pg.num_vertices() == 200
+        for v in (0, 17, 99):
+            assert set(pg.bfs_directed(v)) == set(g.bfs_directed(v))
+            assert set(pg.bfs_undirected(v, max_depth=2)) == set(g.bfs_undirected(v, max_depth=2))
+        components = pg.connected_components()
+        assert sum(map(len, components)) == 200
+        assert all(expected[next(iter(c))] == c for c in components)
+with PartitionedGraph(Graph(), 2) as pg:
+    assert pg.connected_components() == []
+
+# an edge list with parallel edges and a self-loop
+h = Graph()
+for key, s, t in [("ab", "a", "b"), ("ab2", "a", "b"), ("bc", "b", "c"), ("cc", "c", "c"), ("dc", "d", "c")]:
+    h.add_edge(key, s, t)
+f = io.StringIO()
+write_edgelist(h, f)
+f.seek(0)
+for scheme in ('hash', 'range'):
+    with PartitionedGraph.from_edges(iter_edgelist(f), 3, scheme) as pg:
+        assert pg.num_vertices() == 4
+        assert set(pg.bfs_directed("a")) == {"a", "b", "c"}
+        assert set(pg.bfs_undirected("d")) == {"a", "b", "c", "d"}
+        assert len(pg.connected_components()) == 1
+    f.seek(0)
+with PartitionedGraph.from_edges([], 2) as pg:
+    assert pg.num_vertices() == 0 and pg.connected_components() == []
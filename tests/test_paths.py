@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.paths import (iter_dijkstra, dijkstra, astar, bidirectional_dijkstra,
+                          path_edges, path_vertices)
+
+g = Graph()
+g.add_edge("ab", "a", "b", 4)
+g.add_edge("ac", "a", "c", 1)
+g.add_edge("cb", "c", "b", 2)
+g.add_edge("bd", "b", "d", 1)
+g.add_edge("cd", "c", "d", 5)
+g.add_edge("cd2", "c", "d", 7)
+g.add_edge("de", "d", "e", 3)
+g.add_edge("ea", "e", "a", 1)
+g.add_vertex("z")
+
+distances, predecessors = dijkstra(g, "a")
+assert distances == {"a": 0, "c": 1, "b": 3, "d": 4, "e": 7}
+assert predecessors == {"c": "ac", "b": "cb", "d": "bd", "e": "de"}
+assert path_edges(g, predecessors, "e") == ["ac", "cb", "bd", "de"]
+assert path_vertices(g, predecessors, "e") == ["a", "c", "b", "d", "e"]
+assert path_vertices(g, predecessors, "a") == ["a"]
+
+# results stream in order of distance
+settled = [(v, d) for v, d, e in iter_dijkstra(g, "a")]
+assert settled == [("a", 0), ("c", 1), ("b", 3), ("d", 4), ("e", 7)]
+
+# early exit at the target
+distances, predecessors = dijkstra(g, "a", target="b")
+assert distances["b"] == 3
+assert "e" not in distances
+
+# weights from a key function over the edge values
+distances, predecessors = dijkstra(g, "a", weight=lambda value: 1)
+assert distances == {"a": 0, "c": 1, "b": 1, "d": 2, "e": 3}
+
+assert bidirectional_dijkstra(g, "a", "e") == (7, ["ac", "cb", "bd", "de"])
+assert bidirectional_dijkstra(g, "c", "a") == (7, ["cb", "bd", "de", "ea"])
+assert bidirectional_dijkstra(g, "a", "a") == (0, [])
+try:
+    bidirectional_dijkstra(g, "a", "z")
+    assert False
+except Exception:
+    pass
+
+distances, predecessors = astar(g, "a", "e", lambda v: 0)
+assert distances["e"] == 7
+assert path_edges(g, predecessors, "e") == ["ac", "cb", "bd", "de"]
+
+# A* on a grid with the Manhattan distance heuristic settles fewer vertices
+grid = Graph()
+for i in range(20):
+    for j in range(20):
+        if i < 19:
+            grid.add_edge(((i, j), (i+1, j)), (i, j), (i+1, j), 1)
+            grid.add_edge(((i+1, j), (i, j)), (i+1, j), (i, j), 1)
+        if j < 19:
+            grid.add_edge(((i, j), (i, j+1)), (i, j), (i, j+1), 1)
+            grid.add_edge(((i, j+1), (i, j)), (i, j+1), (i, j), 1)
+manhattan = lambda v: abs(v[0] - 10) + abs(v[1] - 12)
+distances, predecessors = astar(grid, (0, 0), (10, 12), manhattan)
+assert distances[(10, 12)] == 22
+assert len(path_edges(grid, predecessors, (10, 12))) == 22
+assert len(distances) < len(dijkstra(grid, (0, 0), target=(10, 12))[0])
+assert bidirectional_dijkstra(grid, (0, 0), (19, 19))[0] == 38
+
+g.add_edge("neg", "e", "z", -1)
+try:
+    dijkstra(g, "a")
+    assert False
+except ValueError:
+    pass
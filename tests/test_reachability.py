@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+
+import random
+
+from graphs.graph import Graph
+from graphs.reachability import ReachabilityIndex
+
+
+def check_index(graph, index):
+    for v in graph.iter_vertices():
+        reachable = set(graph.bfs_directed(v))
+        assert index.descendants(v) == reachable - {v}
+        for w in graph.iter_vertices():
+            assert index.reaches(v, w) == (w in reachable)
+
+
+g = Graph()
+g.add_edge("ab", "a", "b")
+g.add_edge("bc", "b", "c")
+g.add_edge("ca", "c", "a")
+g.add_edge("cd", "c", "d")
+g.add_edge("de", "d", "e")
+g.add_vertex("f")
+index = g.reachability_index()
+check_index(g, index)
+assert index.reaches("a", "e")
+assert not index.reaches("e", "a")
+assert index.reaches("f", "f")
+assert index.descendants("b") == {"a", "c", "d", "e"}
+
+# changes that cannot alter reachability keep the labels
+g.add_edge("ae", "a", "e")
+g.add_vertex("g")
+g.add_edge("ab2", "a", "b")
+g.remove_edge("ab2")
+assert not index._stale
+check_index(g, index)
+g.remove_vertex("f")
+assert not index._stale
+check_index(g, index)
+g.add_edge("eg", "e", "g")
+assert index._stale
+check_index(g, index)
+g.remove_edge("ca")
+check_index(g, index)
+assert not index.reaches("c", "a")
+# the graph keeps one index, until it is closed
+assert g.reachability_index() is index and g.reachability_index() is index
+assert len(g._subscribers) == 1
+index.close()
+index.close()
+assert not g._subscribers
+replacement = g.reachability_index()
+assert replacement is not index and len(g._subscribers) == 1
+check_index(g, replacement)
+replacement.close()
+
+random.seed(3)
+g = Graph()
+index = ReachabilityIndex(g)
+for step in range(300):
+    if random.random() < 0.75:
+        g.add_edge(step, random.randrange(30), random.randrange(30))
+    else:
+        g.remove_edge(random.choice(list(g.iter_edges())))
+    if step % 50 == 0:
+        check_index(g, index)
+check_index(g, index)
+check_index(g.freeze(), ReachabilityIndex(g.freeze()))
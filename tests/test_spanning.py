@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+
+import random
+
+from graphs.graph import Graph
+from graphs.spanning import kruskal, prim, minimum_spanning_tree
+
+g = Graph()
+g.add_edge("ab", "a", "b", 4)
+g.add_edge("ba", "b", "a", 1)
+g.add_edge("bc", "b", "c", 2)
+g.add_edge("ac", "a", "c", 3)
+g.add_edge("cd", "c", "d", -1)
+g.add_edge("xy", "x", "y", 7)
+g.add_vertex("z")
+
+assert sorted(kruskal(g)) == ["ba", "bc", "cd", "xy"]
+assert sorted(prim(g)) == ["ba", "bc", "cd", "xy"]
+assert sorted(minimum_spanning_tree(g, algorithm='prim')) == ["ba", "bc", "cd", "xy"]
+assert len(minimum_spanning_tree(g, weight=lambda value: 1)) == 4
+try:
+    minimum_spanning_tree(g, algorithm='boruvka')
+    assert False
+except ValueError:
+    pass
+
+random.seed(5)
+for trial in range(20):
+    g = Graph()
+    for i in range(60):
+        g.add_edge(i, random.randrange(15), random.randrange(15), random.randrange(-5, 20))
+    g.track_components()
+    k = kruskal(g)
+    p = prim(g)
+    assert len(k) == len(p) == g.num_vertices() - g.num_components()
+    assert sum(g.get_edge(e) for e in k) == sum(g.get_edge(e) for e in p)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import tempfile
+
+from graphs.graph import Graph
+from graphs.sqlite import SQLiteGraph
+
+
+def check_same_graph(graph, stored):
+    assert(stored.num_vertices() == graph.num_vertices())
+    assert(stored.num_edges() == graph.num_edges())
+    assert(stored.to_tuple_set_tuple() == graph.to_tuple_set_tuple())
+    for v in graph.iter_vertices():
+        assert(stored.is_vertex(v))
+        assert(stored.get_vertex(v) == graph.get_vertex(v))
+        assert(set(stored.iter_outgoing_edges(v)) == set(graph.iter_outgoing_edges(v)))
+        assert(set(stored.iter_incoming_edges(v)) == set(graph.iter_incoming_edges(v)))
+        assert(sorted(stored.iter_target_vertices(v)) == sorted(graph.iter_target_vertices(v)))
+        assert(sorted(stored.iter_source_vertices(v)) == sorted(graph.iter_source_vertices(v)))
+        assert(set(stored.iter_neighbors(v)) == set(graph.iter_neighbors(v)))
+        assert(stored.outdegree(v) == graph.outdegree(v))
+        assert(stored.indegree(v) == graph.indegree(v))
+        assert(stored.degree(v) == graph.degree(v))
+        assert(set(stored.bfs_directed(v)) == set(graph.bfs_directed(v)))
+        assert(set(stored.dfs_undirected(v, max_depth=2)) == set(graph.dfs_undirected(v, max_depth=2)))
+        for w in graph.iter_vertices():
+            assert(stored.is_adjacent(v, w) == graph.is_adjacent(v, w))
+            if graph.is_adjacent(v, w):
+                assert(set(stored.iter_connections(v, w)) == set(graph.iter_connections(v, w)))
+                assert(stored.num_connections(v, w) == graph.num_connections(v, w))
+    for e in graph.iter_edges():
+        assert(stored.get_edge(e) == graph.get_edge(e))
+        assert(stored.get_source(e) == graph.get_source(e))
+        assert(stored.get_target(e) == graph.get_target(e))
+
+
+g = Graph()
+s = SQLiteGraph(cache_size=8)
+assert(str(s) == "<SQLiteGraph with 0 vertices and 0 edges>")
+random.seed(14)
+for step in range(500):
+    op = random.random()
+    if op < 0.6:
+        key = random.randrange(120)
+        u = random.randrange(20)
+        v = random.randrange(20)
+        if g.is_edge(key):
+            u = g.get_source(key)
+            v = g.get_target(key)
+        value = random.choice([None, step, ("tuple", step)])
+        g.add_edge(key, u, v, value)
+        s.add_edge(key, u, v, value)
+    elif op < 0.8:
+        key = random.randrange(120)
+        assert(s.remove_edge(key) == g.remove_edge(key))
+    elif op < 0.9:
+        key = random.randrange(25)
+        assert(s.remove_vertex(key) == g.remove_vertex(key))
+    else:
+        key = random.randrange(25)
+        g.add_vertex(key, str(step))
+        s.add_vertex(key, str(step))
+    # read through the cache between changes, so stale entries would show
+    if g.num_vertices():
+        v = random.choice(list(g.iter_vertices()))
+        assert(sorted(s.iter_target_vertices(v)) == sorted(g.iter_target_vertices(v)))
+        assert(sorted(s.iter_source_vertices(v)) == sorted(g.iter_source_vertices(v)))
+    if step % 100 == 0:
+        check_same_graph(g, s)
+check_same_graph(g, s)
+assert(len(s._adjacency) <= 8)
+check_same_graph(g, s.freeze())
+
+try:
+    s.add_edge(0, "elsewhere", "else")
+    assert(False)
+except Exception:
+    pass
+for lookup in (s.get_vertex, s.get_edge, s.get_source, s.iter_outgoing_edges):
+    try:
+        lookup("missing")
+        assert(False)
+    except KeyError:
+        pass
+s.clear()
+assert(s.num_vertices() == 0 and s.num_edges() == 0)
+s.close()
+
+# the graph persists, and traversals read only the vertices they reach
+directory = tempfile.mkdtemp()
+path = os.path.join(directory, "graph.db")
+with SQLiteGraph(path) as s:
+    for i in range(100):
+        s.add_edge(("next", i), i, i + 1, i)
+    s.add_vertex("alone", {"a": 1})
+s = SQLiteGraph(path, cache_size=1000)
+assert(s.num_vertices() == 102 and s.num_edges() == 100)
+assert(s.get_vertex("alone") == {"a": 1})
+assert(list(s.bfs_directed(90)) == list(range(90, 101)))
+assert(s.cache_misses == 11 and s.cache_hits == 0)
+assert(list(s.bfs_directed(95)) == list(range(95, 101)))
+assert(s.cache_misses == 11 and s.cache_hits == 6)
+s.remove_vertex(100)
+assert(list(s.bfs_directed(95)) == list(range(95, 100)))
+s.close()
+os.remove(path)
+os.rmdir(directory)
+
+# equal keys are the same vertex or edge, however they were built
+s = SQLiteGraph()
+name = "node"
+s.add_vertex((name, name), "value")
+copy = ("node", "".join(["no", "de"]))
+assert(s.is_vertex(copy) and s.get_vertex(copy) == "value")
+s.add_edge((name, (name, 1)), copy, "other")
+assert(s.num_vertices() == 2)
+assert(s.is_edge(("node", ("".join(["no", "de"]), 1))))
+assert(list(s.iter_outgoing_edges(copy)) == [("node", ("node", 1))])
+s.close()
+
+# the cache holds a bounded number of edges, not of vertices
+s = SQLiteGraph(cache_size=10)
+for i in range(50):
+    s.add_edge(("hub", i), "hub", i)
+for i in range(8):
+    s.add_edge(("path", i), ("p", i), ("p", i + 1))
+assert(len(list(s.iter_target_vertices("hub"))) == 50)
+assert(len(list(s.iter_target_vertices("hub"))) == 50)
+assert(s.cache_misses == 2 and s.cache_hits == 0 and s._cached == 0)
+assert(len(list(s.bfs_directed(("p", 0)))) == 9)
+assert(s._cached <= 10 and sum(map(len, s._adjacency.values())) <= 10)
+s.remove_vertex(("p", 8))
+assert(list(s.bfs_directed(("p", 6))) == [("p", 6), ("p", 7)])
+assert(s._cached == sum(len(adjacent) or 1 for adjacent in s._adjacency.values()))
+s.close()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import random
+import tracemalloc
+
+from graphs.compact import CompactGraph
+from graphs.graph import Graph
+from graphs.sqlite import SQLiteGraph
+from graphs.undirected import UndirectedGraph
+from graphs.traversal import TraversalStats, bfs, dfs, instrumented
+
+# a star: the center has four leaves, one of which has a tail
+g = Graph()
+for leaf in "abcd":
+    g.add_edge(leaf, "center", leaf)
+g.add_edge("tail", "a", "z")
+
+stats = TraversalStats()
+assert list(g.bfs_directed("center", stats=stats))[0] == "center"
+assert stats.algorithm == 'bfs_directed'
+assert stats.vertices_visited == 6 and stats.edges_scanned == 5
+assert stats.peak_frontier == 4 and stats.finished
+assert stats.seconds > 0 and stats.peak_bytes is None
+
+stats = TraversalStats()
+assert set(g.dfs_undirected("z", max_depth=1, stats=stats)) == {"z", "a"}
+assert stats.vertices_visited == 2 and stats.edges_scanned == 1 and stats.peak_frontier == 1
+
+# abandoning a traversal leaves it unfinished
+stats = TraversalStats("mine", trace_memory=True)
+search = g.bfs_undirected("center", stats=stats)
+next(search)
+search.close()
+assert stats.algorithm == "mine" and not stats.finished
+assert stats.vertices_visited == 1 and stats.peak_bytes >= 0
+
+# a graph-wide callback gets the stats of every traversal
+reports = []
+g.instrument(reports.append)
+assert len(list(g.bfs_directed("a"))) == 2
+list(g.dfs_directed("center"))
+assert [s.algorithm for s in reports] == ['bfs_directed', 'dfs_directed']
+assert reports[1].vertices_visited == 6 and reports[1].peak_frontier == 4
+assert reports[0].as_dict()['edges_scanned'] == 1
+assert "bfs_directed" in repr(reports[0])
+assert g.copy()._traversal_callback is None
+g.instrument(None)
+list(g.bfs_directed("a"))
+assert len(reports) == 2
+
+# traversals traced at once keep their own peaks, and tracing stops
+# when the last of them ends
+first = TraversalStats(trace_memory=True)
+second = TraversalStats(trace_memory=True)
+one = g.bfs_undirected("center", stats=first)
+two = g.bfs_undirected("center", stats=second)
+next(one)
+next(two)
+one.close()
+assert tracemalloc.is_tracing()
+assert len(list(two)) == 5 and second.peak_bytes > 0 and second.finished
+assert not tracemalloc.is_tracing()
+
+# every graph class records stats
+sqlite = SQLiteGraph()
+sqlite.from_tuple_set_tuple(g.to_tuple_set_tuple())
+compact = CompactGraph()
+compact.from_tuple_set_tuple(g.to_tuple_set_tuple())
+for graph in [g.filtered(), g.freeze(), compact, sqlite, UndirectedGraph.from_graph(g)]:
+    for name in ['bfs_undirected', 'bfs_directed', 'dfs_undirected', 'dfs_directed']:
+        if not hasattr(graph, name):
+            continue #an UndirectedGraph has no directed traversals
+        stats = TraversalStats()
+        found = list(getattr(graph, name)("center", stats=stats))
+        assert stats.algorithm == name and stats.finished
+        assert stats.vertices_visited == len(found) and stats.edges_scanned > 0
+    stats = TraversalStats()
+    assert set(graph.dfs_undirected("a", max_depth=1, stats=stats)) == {"a", "center", "z"}
+    assert stats.vertices_visited == 3
+sqlite.close()
+
+# undirected traversals scan each edge from both ends, a self-loop once,
+# counting parallel edges
+g = Graph()
+for key, s, t in [("ab", "a", "b"), ("ab2", "a", "b"), ("ba", "b", "a"), ("bb", "b", "b"), ("bc", "b", "c")]:
+    g.add_edge(key, s, t)
+sqlite = SQLiteGraph()
+sqlite.from_tuple_set_tuple(g.to_tuple_set_tuple())
+compact = CompactGraph()
+compact.from_tuple_set_tuple(g.to_tuple_set_tuple())
+for graph in [g, g.filtered(), g.freeze(), compact, sqlite, UndirectedGraph.from_graph(g)]:
+    for name in ['bfs_undirected', 'dfs_undirected']:
+        stats = TraversalStats()
+        list(getattr(graph, name)("a", stats=stats))
+        assert stats.edges_scanned == 9
+    if hasattr(graph, 'bfs_directed'):
+        stats = TraversalStats()
+        list(graph.bfs_directed("a", stats=stats))
+        assert stats.edges_scanned == 5
+sqlite.close()
+
+# the module functions work over any successor function
+successors = {1: [2, 3], 2: [4], 3: [4], 4: []}.__getitem__
+stats = TraversalStats("plain bfs")
+assert list(instrumented(bfs, successors, [1], None, stats)) == [1, 2, 3, 4]
+assert stats.edges_scanned == 4 and stats.peak_frontier == 2
+stats = TraversalStats()
+assert list(instrumented(dfs, successors, [1], None, stats, reports.append)) == [1, 3, 4, 2]
+assert reports[-1] is stats
+
+# a depth-limited dfs finds every vertex within the limit, even one
+# first reached through a longer path
+g = Graph()
+for key, s, t in [(1, "a", "b"), (2, "b", "y"), (3, "y", "x"), (4, "a", "c"), (5, "c", "x"), (6, "x", "z")]:
+    g.add_edge(key, s, t)
+assert set(g.dfs_directed("a", max_depth=3)) == {"a", "b", "c", "x", "y", "z"}
+assert set(g.freeze().dfs_directed("a", max_depth=3)) == {"a", "b", "c", "x", "y", "z"}
+assert set(g.dfs_directed("a", max_depth=2)) == {"a", "b", "c", "x", "y"}
+for seed in range(300):
+    random.seed(seed)
+    g = Graph()
+    g.add_vertex(0)
+    for e in range(random.randrange(40)):
+        g.add_edge(e, random.randrange(15), random.randrange(15))
+    frozen = g.freeze()
+    compact = CompactGraph()
+    compact.from_tuple_set_tuple(g.to_tuple_set_tuple())
+    compact.add_vertex(0)
+    for d in range(5):
+        expected = set(g.bfs_directed(0, max_depth=d))
+        found = list(g.dfs_directed(0, max_depth=d))
+        assert len(found) == len(expected) and set(found) == expected
+        assert set(frozen.dfs_directed(0, max_depth=d)) == expected
+        assert set(compact.dfs_directed(0, max_depth=d)) == expected
+        assert set(g.filtered().dfs_undirected(0, max_depth=d)) == set(g.bfs_undirected(0, max_depth=d))
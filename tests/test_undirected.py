@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import random
+
+from graphs.graph import Graph
+from graphs.undirected import UndirectedGraph
+from graphs.traversal import TraversalStats
+from graphs.clustering import triangles
+
+g = UndirectedGraph()
+assert str(g) == "<UndirectedGraph with 0 vertices and 0 edges>"
+g.add_edge("ab", "a", "b", 1)
+g.add_edge("ba", "b", "a", 2)
+g.add_edge("bc", "b", "c")
+g.add_edge("cc", "c", "c")
+g.add_vertex("d", "lonely")
+assert g.num_vertices() == 4 and g.num_edges() == 4
+assert g.is_adjacent("a", "b") and g.is_adjacent("b", "a") and g.is_adjacent("c", "c")
+assert not g.is_adjacent("a", "c")
+assert g.num_connections("b", "a") == 2 and set(g.iter_connections("a", "b")) == {"ab", "ba"}
+assert g.degree("b") == 2 and g.num_incident_edges("b") == 3
+assert set(g.iter_incident_edges("c")) == {"bc", "cc"}
+assert set(g.iter_neighbors("c")) == {"b", "c"}
+assert g.get_ends("ba") == ("b", "a") and g.get_other_end("ba", "a") == "b"
+assert g.get_vertex("d") == "lonely" and g.get_edge("ba") == 2
+
+# the edge key may be repeated with its ends in either order
+g.add_edge("ab", "b", "a", 3)
+assert g.get_edge("ab") == 3
+try:
+    g.add_edge("ab", "a", "c")
+    assert False
+except Exception:
+    pass
+
+# removing one of two parallel edges keeps the vertices adjacent
+assert g.remove_edge("ab") == 3
+assert g.is_adjacent("a", "b") and g.degree("a") == 1
+assert g.remove_edge("ba") == 2
+assert not g.is_adjacent("a", "b") and g.degree("a") == 0
+assert g.remove_edge("ba") is None
+assert list(g.bfs_undirected("b")) == ["b", "c"]
+g.add_edge("ab", "a", "b")
+stats = TraversalStats()
+assert set(g.dfs_undirected("a", stats=stats)) == {"a", "b", "c"}
+assert stats.vertices_visited == 3 and stats.algorithm == 'dfs_undirected'
+
+copy = g.copy()
+assert g.remove_vertex("c") is None
+assert g.num_edges() == 1 and not g.is_vertex("c") and g.degree("b") == 1
+assert copy.num_edges() == 3 and copy.degree("b") == 2
+copy.remove_edge("bc")
+assert copy.degree("c") == 1 and copy.is_adjacent("c", "c")
+assert g.remove_vertex("d") == "lonely" and g.remove_vertex("d") is None
+g.clear()
+assert g.num_vertices() == 0
+
+# matches the undirected view of Graph under random changes
+random.seed(25)
+directed = Graph()
+g = UndirectedGraph()
+for step in range(800):
+    op = random.random()
+    if op < 0.6:
+        key = random.randrange(150)
+        u = random.randrange(25)
+        v = random.randrange(25)
+        if directed.is_edge(key):
+            u = directed.get_source(key)
+            v = directed.get_target(key)
+        directed.add_edge(key, u, v, step)
+        g.add_edge(key, u, v, step)
+    elif op < 0.85:
+        key = random.randrange(150)
+        assert g.remove_edge(key) == directed.remove_edge(key)
+    else:
+        key = random.randrange(25)
+        assert g.remove_vertex(key) == directed.remove_vertex(key)
+assert g.to_tuple_set_tuple() == directed.to_tuple_set_tuple()
+for v in directed.iter_vertices():
+    assert set(g.iter_neighbors(v)) == set(directed.iter_neighbors(v))
+    assert g.degree(v) == directed.degree(v)
+    assert set(g.bfs_undirected(v, max_depth=2)) == set(directed.bfs_undirected(v, max_depth=2))
+    assert g.num_incident_edges(v) == len(set(directed.iter_outgoing_edges(v)) | set(directed.iter_incoming_edges(v)))
+assert UndirectedGraph.from_graph(directed).to_tuple_set_tuple() == g.to_tuple_set_tuple()
+assert triangles(g) == triangles(directed) == triangles(g.freeze())
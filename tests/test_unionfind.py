@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+
+from graphs.unionfind import UnionFind
+
+u = UnionFind(range(10))
+assert len(u) == 10
+assert u.num_sets() == 10
+assert u.union(1, 2)
+assert u.union(3, 4)
+assert u.union(2, 4)
+assert not u.union(1, 3)
+assert u.same(1, 4)
+assert not u.same(1, 5)
+assert u.set_size(3) == 4
+assert u.num_sets() == 7
+u.discard(5)
+assert 5 not in u and len(u) == 9
+u.discard(5)
+u.add(5)
+assert u.num_sets() == 7
+# removing a key from a set leaves the rest of the set together
+u.discard(2)
+assert 2 not in u and len(u) == 9
+assert u.same(1, 4) and u.set_size(3) == 3 and u.num_sets() == 7
+u.add(2)
+assert not u.same(1, 2) and u.same(1, 3) and u.num_sets() == 8
+for key in (1, 3, 4):
+    u.discard(key)
+assert len(u) == 7 and u.num_sets() == 7
+u.clear()
+assert len(u) == 0
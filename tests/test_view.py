@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+from graphs.graph import Graph
+from graphs.view import GraphView
+from graphs.dag import topological_sort
+from graphs.paths import dijkstra
+
+
+def check_same_graph(graph, view):
+    assert(view.num_vertices() == graph.num_vertices())
+    assert(view.num_edges() == graph.num_edges())
+    assert(view.to_tuple_set_tuple() == graph.to_tuple_set_tuple())
+    for v in graph.iter_vertices():
+        assert(view.is_vertex(v))
+        assert(set(view.iter_outgoing_edges(v)) == set(graph.iter_outgoing_edges(v)))
+        assert(set(view.iter_incoming_edges(v)) == set(graph.iter_incoming_edges(v)))
+        assert(set(view.iter_neighbors(v)) == set(graph.iter_neighbors(v)))
+        assert(view.outdegree(v) == graph.outdegree(v))
+        assert(view.indegree(v) == graph.indegree(v))
+        assert(view.degree(v) == graph.degree(v))
+        for w in graph.iter_vertices():
+            assert(view.is_adjacent(v, w) == graph.is_adjacent(v, w))
+            assert(view.num_connections(v, w) == (graph.num_connections(v, w) if graph.is_adjacent(v, w) else 0))
+
+
+g = Graph()
+for i in range(0, 10):
+    g.add_vertex(i, i * i)
+    for j in range(0, 10):
+        if (i + 2 * j) % 5 == 1:
+            g.add_edge((i, j), i, j, i + j)
+g.add_edge("parallel", 1, 0, "p")
+
+check_same_graph(g, GraphView(g))
+check_same_graph(g, g.filtered())
+
+even = g.filtered(vertex_pred=lambda v: v % 2 == 0)
+small = g.subgraph(range(5))
+expected = Graph()
+for v in range(0, 10, 2):
+    expected.add_vertex(v, v * v)
+for e, s, t, value in g.iter_edge_source_target_value_tuple():
+    if s % 2 == 0 and t % 2 == 0:
+        expected.add_edge(e, s, t, value)
+check_same_graph(expected, even)
+assert(str(even) == "<GraphView with 5 vertices and %d edges>" % expected.num_edges())
+assert(not even.is_vertex(1))
+assert(set(small.iter_vertices()) == {0, 1, 2, 3, 4})
+assert(small.get_vertex(3) == 9)
+try:
+    small.get_vertex(7)
+    assert(False)
+except KeyError:
+    pass
+
+# edge predicates, and views of views
+cheap = g.filtered(edge_pred=lambda e: e == "parallel" or g.get_edge(e) < 8)
+assert(all(cheap.get_edge(e) == "p" or cheap.get_edge(e) < 8 for e in cheap.iter_edges()))
+assert(not cheap.is_edge((9, 1)))
+assert(cheap.num_connections(1, 0) == 2)
+nested = cheap.subgraph([0, 1, 2, 3, 4, 5])
+assert(set(nested.iter_neighbors(1)) == {v for v in cheap.iter_neighbors(1) if v <= 5})
+assert(set(nested.bfs_directed(1)) <= {0, 1, 2, 3, 4, 5})
+assert(list(small.bfs_directed(0, max_depth=0)) == [0])
+assert(set(small.bfs_undirected(0)) == set(small.dfs_undirected(0)))
+distances, predecessors = dijkstra(small, 0, weight=lambda value: 1)
+assert(set(distances) <= {0, 1, 2, 3, 4})
+
+# views reflect later changes to the graph
+g.remove_edge("parallel")
+assert(cheap.num_connections(1, 0) == 1)
+g.add_edge("new", 2, 4, 1)
+assert(even.is_edge("new"))
+frozen = even.freeze()
+assert(frozen.to_tuple_set_tuple() == even.to_tuple_set_tuple())
+
+dag = Graph()
+dag.add_edge("ab", "a", "b")
+dag.add_edge("ba", "b", "a")
+dag.add_edge("bc", "b", "c")
+order = topological_sort(dag.filtered(edge_pred=lambda e: e != "ba"))
+assert(order == ["a", "b", "c"])